@@ -0,0 +1,234 @@
+"""
+    Pattern occurrence index.
+
+    Hits of single and multi-candle patterns are precomputed into a sparse (pattern, ticker, date) table, so that
+    research and backtests look up candidate dates instead of scanning every bar. The hits of each ticker are kept and
+    saved apart, as {path}/pattern_index/{ticker}.parquet, and only merged and sorted by (pattern, ticker, date) when
+    the index is queried, so that building it over many tickers is linear and saving only rewrites changed tickers.
+
+    The last indexed date of each ticker and a version (hash) of its indexed bars are saved in {path}/coverage.json.
+    Updates only scan the bars after the last indexed date (plus the leading bars multi-candle patterns need), unless
+    the indexed bars were revised, in which case the ticker is indexed again.
+"""
+
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ta_candlestick.multi_pattern import MULTI_PATTERN_MASKS, scan_multi_candlesticks
+from ta_candlestick.scanner import PATTERN_MASKS, extract_candlesticks_df, scan_candlesticks
+from ta_stock_market_data.storage import get_storage
+
+INDEX_COLUMNS = ["pattern", "ticker", "date"]
+
+# The columns of the bars patterns are computed from.
+BAR_COLUMNS = ["date", "open", "high", "low", "close"]
+
+# Leading bars needed to match multi-candle patterns ending on the first new bar.
+LOOKBACK = max(mask.size for mask in MULTI_PATTERN_MASKS.values()) - 1
+
+
+def _empty_index_df():
+    return pd.DataFrame({"pattern": pd.Series(dtype=str), "ticker": pd.Series(dtype=str),
+                         "date": pd.Series(dtype="datetime64[ns]")})
+
+
+def bars_version(df):
+    """
+        A hash of the dates and prices of the bars of a price df.
+    """
+    hashes = pd.util.hash_pandas_object(df[BAR_COLUMNS], index=False).to_numpy()
+
+    return hashlib.sha1(hashes.tobytes()).hexdigest()[:16]
+
+
+def pattern_events(df, ticker, patterns=None, params=None):
+    """
+        The pattern hits of a price df sorted by date, as a (pattern, ticker, date) df.
+
+    :param df:                      price df: date, open, high, low, close
+    :param ticker:                  stock_code of df
+    :param patterns:                pattern names of PATTERN_MASKS and MULTI_PATTERN_MASKS, defaults to all patterns
+    :param params:                  {pattern: {param: value}} overriding the default thresholds
+    """
+    if patterns is None:
+        patterns = list(PATTERN_MASKS) + list(MULTI_PATTERN_MASKS)
+
+    single_patterns = [pattern for pattern in patterns if pattern in PATTERN_MASKS]
+    multi_patterns = [pattern for pattern in patterns if pattern in MULTI_PATTERN_MASKS]
+
+    candlesticks = extract_candlesticks_df(df)
+    masks = scan_candlesticks(candlesticks, single_patterns, params) if single_patterns else dict()
+    if multi_patterns:
+        masks.update(scan_multi_candlesticks(candlesticks, multi_patterns, params))
+
+    dates = pd.to_datetime(df["date"]).to_numpy(dtype="datetime64[ns]")
+    events = [pd.DataFrame({"pattern": pattern, "ticker": ticker, "date": dates[np.flatnonzero(masks[pattern])]})
+              for pattern in patterns if masks[pattern].any()]
+
+    return pd.concat(events, ignore_index=True) if events else _empty_index_df()
+
+
+class PatternIndex:
+    """
+        A (pattern, ticker, date) index of pattern hits.
+    """
+
+    def __init__(self, path, patterns=None, params=None):
+        self.path = path
+        self.patterns = patterns
+        self.params = params
+
+        self.index_path = os.path.join(path, "pattern_index")
+        self.coverage_path = os.path.join(path, "coverage.json")
+
+        # {ticker: hits df}, the tickers changed since the last save and the merged hits, also indexed by
+        # (pattern, ticker, date) (None until queried).
+        self.frames = dict()
+        self._changed = set()
+        self._df = None
+        self._by_key = None
+
+        for ticker_path in glob.glob(os.path.join(glob.escape(self.index_path), "*.parquet")):
+            ticker = os.path.basename(ticker_path)[:-len(".parquet")]
+            self.frames[ticker] = pd.read_parquet(ticker_path)
+
+        # {ticker: (last indexed date, version of the indexed bars)}
+        self.coverage = dict()
+        if os.path.exists(self.coverage_path):
+            with open(self.coverage_path) as f:
+                self.coverage = {ticker: (pd.Timestamp(coverage["last_date"]), coverage["version"])
+                                 for ticker, coverage in json.load(f).items()}
+
+    @property
+    def df(self):
+        """
+            All hits sorted by (pattern, ticker, date), merged once after the index changes.
+        """
+        if self._df is None:
+            frames = [frame for frame in self.frames.values() if len(frame)]
+            df = pd.concat(frames, ignore_index=True) if frames else _empty_index_df()
+            df = df.astype({"pattern": str, "ticker": str, "date": "datetime64[ns]"})
+            self._df = df.sort_values(by=INDEX_COLUMNS, kind="stable").reset_index(drop=True)
+            self._by_key = self._df.set_index(INDEX_COLUMNS).sort_index()
+
+        return self._df
+
+    def invalidate(self, ticker):
+        """
+            Drop the hits and coverage of a ticker, e.g., when its historical bars are revised.
+        """
+        if ticker in self.frames or ticker in self.coverage:
+            self.frames.pop(ticker, None)
+            self.coverage.pop(ticker, None)
+            self._changed.add(ticker)
+            self._df = None
+
+    def add(self, ticker, df):
+        """
+            Index the bars of a price df after the last indexed date of ticker, or all its bars if the indexed ones
+            were revised. Returns the number of new hits.
+        """
+        df = df.assign(date=pd.to_datetime(df["date"])).sort_values(by="date", kind="stable").reset_index(drop=True)
+        if df.empty:
+            return 0
+
+        last_date, version = self.coverage.get(ticker, (None, None))
+        new_df = df
+        if last_date is not None:
+            start = int(np.searchsorted(df["date"].to_numpy(), np.datetime64(last_date), side="right"))
+            if bars_version(df.iloc[:start]) != version:
+                self.invalidate(ticker)
+                last_date = None
+            elif start == len(df):
+                return 0
+            else:
+                new_df = df.iloc[max(0, start - LOOKBACK):]
+
+        events = pattern_events(new_df, ticker, patterns=self.patterns, params=self.params)
+        if last_date is not None:
+            events = events[events["date"] > last_date]
+
+        frame = self.frames.get(ticker)
+        self.frames[ticker] = pd.concat([frame, events], ignore_index=True) if frame is not None else events
+        self.coverage[ticker] = (df["date"].iloc[-1], bars_version(df))
+        self._changed.add(ticker)
+        self._df = None
+
+        return len(events)
+
+    def update(self, stock_codes, stock_market_data_path, backend="csv", loader=None):
+        """
+            Index new bars of stored price data of stock_codes and save the index. Returns the number of new hits.
+        """
+        storage = get_storage(backend, stock_market_data_path)
+
+        n = 0
+        for stock_code in stock_codes:
+            if loader is not None:
+                df = loader.read_df(stock_code, "price")
+            else:
+                df = storage.read(stock_code, "price", columns=["date", "open", "high", "low", "close"])
+
+            if df is not None:
+                n += self.add(stock_code, df)
+
+        self.save()
+
+        return n
+
+    def save(self):
+        """
+            Save the hits of the tickers changed since the last save and the coverage.
+        """
+        os.makedirs(self.index_path, exist_ok=True)
+
+        for ticker in self._changed:
+            ticker_path = os.path.join(self.index_path, "{ticker}.parquet".format(ticker=ticker))
+            if ticker in self.frames:
+                self.frames[ticker].to_parquet(ticker_path, index=False)
+            elif os.path.exists(ticker_path):
+                os.remove(ticker_path)
+        self._changed = set()
+
+        with open(self.coverage_path, "w") as f:
+            json.dump({ticker: {"last_date": last_date.strftime("%Y-%m-%d"), "version": version}
+                       for ticker, (last_date, version) in self.coverage.items()}, f)
+
+    def query(self, pattern=None, ticker=None, start_date=None, end_date=None):
+        """
+            Pattern hits by pattern(s), ticker(s) and date range, sorted by (pattern, ticker, date).
+        """
+        if self.df.empty:
+            return self.df
+
+        patterns = self._level_keys(pattern, 0)
+        tickers = self._level_keys(ticker, 1)
+        no_patterns = not isinstance(patterns, slice) and not patterns
+        no_tickers = not isinstance(tickers, slice) and not tickers
+        if no_patterns or no_tickers:
+            return self.df.iloc[:0]
+
+        dates = slice(None if start_date is None else pd.Timestamp(start_date),
+                      None if end_date is None else pd.Timestamp(end_date))
+        hits = self._by_key.loc[(patterns, tickers, dates), :]
+
+        return hits.reset_index()[INDEX_COLUMNS]
+
+    def _level_keys(self, keys, level):
+        if keys is None:
+            return slice(None)
+
+        values = self._by_key.index.levels[level]
+
+        return [key for key in ([keys] if isinstance(keys, str) else keys) if key in values]
+
+    def dates(self, pattern, ticker, start_date=None, end_date=None):
+        """
+            The dates ticker hit pattern between start_date and end_date.
+        """
+        return pd.DatetimeIndex(self.query(pattern, ticker, start_date, end_date)["date"])
@@ -0,0 +1,241 @@
+"""
+    Multi-candle patterns.
+
+    The single candlestick arrays of ta_candlestick.scanner (prices y1..y4, body and shadows d1, d2, d3) are viewed
+    through sliding windows of 2 or 3 bars along the date axis, without copying, and each pattern is evaluated as a
+    boolean mask for all windows (and all tickers of a panel) at once. A mask is aligned to the last bar of its pattern.
+
+    reference:
+        https://en.wikipedia.org/wiki/Candlestick_pattern
+        https://school.stockcharts.com/doku.php?id=chart_analysis:candlestick_pattern_dictionary
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ta_candlestick.scanner import Candlesticks, black_body_mask, body_percent, extract_candlesticks, \
+    extract_candlesticks_df, ratio, white_body_mask
+
+
+def candlestick_windows(c, size):
+    """
+        Sliding window views of Candlesticks, each array with a trailing window axis of size bars.
+    """
+    return Candlesticks._make(sliding_window_view(a, size, axis=-1) for a in c)
+
+
+def _bar(windows, i):
+    return Candlesticks._make(a[..., i] for a in windows)
+
+
+def _body_top(c):
+    return np.maximum(c.y1, c.y2)
+
+
+def _body_bottom(c):
+    return np.minimum(c.y1, c.y2)
+
+
+def _align(mask, size):
+    """
+        Align masks of windows to the last bar of each window, the first size - 1 bars are False.
+    """
+    padding = np.zeros(mask.shape[:-1] + (size - 1,), dtype=bool)
+
+    return np.concatenate([padding, mask], axis=-1)
+
+
+def pattern_size(size):
+    """
+        Record the number of bars of a multi-candle pattern as the size of its mask function.
+    """
+    def decorate(mask):
+        mask.size = size
+        return mask
+
+    return decorate
+
+
+# Two-candle patterns.
+@pattern_size(2)
+def bullish_engulfing_mask(c):
+    """
+        A black body followed by a larger white body which engulfs it. A bullish reversal in a downtrend.
+    """
+    w = candlestick_windows(c, 2)
+    b0, b1 = _bar(w, 0), _bar(w, 1)
+
+    mask = black_body_mask(b0) & white_body_mask(b1) & (b1.y1 <= b0.y2) & (b1.y2 >= b0.y1) & (b1.d2 > b0.d2)
+
+    return _align(mask, 2)
+
+
+@pattern_size(2)
+def bearish_engulfing_mask(c):
+    """
+        A white body followed by a larger black body which engulfs it. A bearish reversal in an uptrend.
+    """
+    w = candlestick_windows(c, 2)
+    b0, b1 = _bar(w, 0), _bar(w, 1)
+
+    mask = white_body_mask(b0) & black_body_mask(b1) & (b1.y1 >= b0.y2) & (b1.y2 <= b0.y1) & (b1.d2 > b0.d2)
+
+    return _align(mask, 2)
+
+
+@pattern_size(2)
+def bullish_harami_mask(c, long_body=0.03):
+    """
+        A long black body followed by a white body contained within it. A bullish reversal in a downtrend.
+    """
+    w = candlestick_windows(c, 2)
+    b0, b1 = _bar(w, 0), _bar(w, 1)
+
+    mask = black_body_mask(b0) & (body_percent(b0) > long_body) & white_body_mask(b1) & \
+        (b1.y1 > b0.y2) & (b1.y2 < b0.y1)
+
+    return _align(mask, 2)
+
+
+@pattern_size(2)
+def bearish_harami_mask(c, long_body=0.03):
+    """
+        A long white body followed by a black body contained within it. A bearish reversal in an uptrend.
+    """
+    w = candlestick_windows(c, 2)
+    b0, b1 = _bar(w, 0), _bar(w, 1)
+
+    mask = white_body_mask(b0) & (body_percent(b0) > long_body) & black_body_mask(b1) & \
+        (b1.y1 < b0.y2) & (b1.y2 > b0.y1)
+
+    return _align(mask, 2)
+
+
+# Three-candle patterns.
+@pattern_size(3)
+def morning_star_mask(c, long_body=0.03, small_body=0.01):
+    """
+        A long black body, a small body gapping below it, and a white body closing above the midpoint of the first
+        body. A bullish reversal.
+    """
+    w = candlestick_windows(c, 3)
+    b0, b1, b2 = _bar(w, 0), _bar(w, 1), _bar(w, 2)
+
+    mask = black_body_mask(b0) & (body_percent(b0) > long_body) & \
+        ~(body_percent(b1) > small_body) & (_body_top(b1) < b0.y2) & \
+        white_body_mask(b2) & (b2.y2 > (b0.y1 + b0.y2) / 2)
+
+    return _align(mask, 3)
+
+
+@pattern_size(3)
+def evening_star_mask(c, long_body=0.03, small_body=0.01):
+    """
+        A long white body, a small body gapping above it, and a black body closing below the midpoint of the first
+        body. A bearish reversal.
+    """
+    w = candlestick_windows(c, 3)
+    b0, b1, b2 = _bar(w, 0), _bar(w, 1), _bar(w, 2)
+
+    mask = white_body_mask(b0) & (body_percent(b0) > long_body) & \
+        ~(body_percent(b1) > small_body) & (_body_bottom(b1) > b0.y2) & \
+        black_body_mask(b2) & (b2.y2 < (b0.y1 + b0.y2) / 2)
+
+    return _align(mask, 3)
+
+
+@pattern_size(3)
+def three_white_soldiers_mask(c, t1=0.5):
+    """
+        Three white bodies, each closing higher and opening within the previous body, with short upper shadows
+        (d1 / d2 <= t1). A bullish reversal.
+    """
+    w = candlestick_windows(c, 3)
+    bars = [_bar(w, i) for i in range(3)]
+
+    mask = np.ones(w.y1.shape[:-1], dtype=bool)
+    for i, b in enumerate(bars):
+        mask &= white_body_mask(b) & (ratio(b.d1, b.d2) <= t1)
+        if i > 0:
+            p = bars[i - 1]
+            mask &= (b.y2 > p.y2) & (b.y1 > p.y1) & (b.y1 <= p.y2)
+
+    return _align(mask, 3)
+
+
+@pattern_size(3)
+def three_black_crows_mask(c, t3=0.5):
+    """
+        Three black bodies, each closing lower and opening within the previous body, with short lower shadows
+        (d3 / d2 <= t3). A bearish reversal.
+    """
+    w = candlestick_windows(c, 3)
+    bars = [_bar(w, i) for i in range(3)]
+
+    mask = np.ones(w.y1.shape[:-1], dtype=bool)
+    for i, b in enumerate(bars):
+        mask &= black_body_mask(b) & (ratio(b.d3, b.d2) <= t3)
+        if i > 0:
+            p = bars[i - 1]
+            mask &= (b.y2 < p.y2) & (b.y1 < p.y1) & (b.y1 >= p.y2)
+
+    return _align(mask, 3)
+
+
+MULTI_PATTERN_MASKS = {
+    "bullish_engulfing": bullish_engulfing_mask,
+    "bearish_engulfing": bearish_engulfing_mask,
+    "bullish_harami": bullish_harami_mask,
+    "bearish_harami": bearish_harami_mask,
+    "morning_star": morning_star_mask,
+    "evening_star": evening_star_mask,
+    "three_white_soldiers": three_white_soldiers_mask,
+    "three_black_crows": three_black_crows_mask,
+}
+
+
+def scan_multi_candlesticks(candlesticks, patterns=None, params=None):
+    """
+        Evaluate multi-candle patterns on extracted candlesticks, the last axis being dates.
+
+    :param candlesticks:            Candlesticks, see ta_candlestick.scanner.extract_candlesticks
+    :param patterns:                pattern names, defaults to all patterns of MULTI_PATTERN_MASKS
+    :param params:                  {pattern: {param: value}} overriding the default thresholds
+    :return:                        {pattern: mask}
+    """
+    params = params or dict()
+    n = candlesticks.y1.shape[-1]
+
+    masks = dict()
+    for pattern in patterns or MULTI_PATTERN_MASKS:
+        if n < MULTI_PATTERN_MASKS[pattern].size:
+            masks[pattern] = np.zeros(candlesticks.y1.shape, dtype=bool)
+        else:
+            masks[pattern] = MULTI_PATTERN_MASKS[pattern](candlesticks, **params.get(pattern, dict()))
+
+    return masks
+
+
+def scan_multi_candlestick_patterns(df, patterns=None, params=None):
+    """
+        Scan an OHLC df, sorted by date, for multi-candle patterns.
+
+    :return:                        df with one boolean column per pattern, aligned to df
+    """
+    masks = scan_multi_candlesticks(extract_candlesticks_df(df), patterns=patterns, params=params)
+
+    return pd.DataFrame(masks, index=df.index)
+
+
+def scan_price_panel_multi(panel, patterns=None, params=None):
+    """
+        Scan a PricePanel for multi-candle patterns, all tickers in one pass. Windows span the panel calendar, so a
+        pattern does not match across a missing bar.
+
+    :return:                        {pattern: (ticker x date) mask}
+    """
+    candlesticks = extract_candlesticks(panel.field("open"), panel.field("close"), panel.field("high"),
+                                        panel.field("low"))
+
+    return scan_multi_candlesticks(candlesticks, patterns=patterns, params=params)
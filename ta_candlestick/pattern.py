@@ -11,6 +11,10 @@
         https://stockcharts.com/
 """
 
+from ta_candlestick.scanner import black_body_mask, extract_candlesticks, long_legged_doji_mask, \
+    long_lower_shadow_mask, long_upper_shadow_mask, marubozu_mask, shaven_bottom_mask, shaven_head_mask, \
+    shooting_star_mask, spinning_top_mask, white_body_mask
+
 
 def extract_candlestick(candlestick):
     """
@@ -28,6 +32,14 @@ def extract_candlestick(candlestick):
     return y1, y2, y3, y4, d1, d2, d3
 
 
+def candlestick_array(candlestick):
+    """
+        A single ta_candlestick as Candlesticks arrays, to evaluate the vectorized pattern kernels of
+        ta_candlestick.scanner.
+    """
+    return extract_candlesticks(candlestick['open'], candlestick['close'], candlestick['high'], candlestick['low'])
+
+
 def is_bullish_or_bearish_candlestick(candlestick):
     if candlestick["close"] >= candlestick["open"]:
         return "bullish"
@@ -79,14 +91,14 @@ def is_black_body(candlestick):
     """
         Formed when the opening price is higher than the closing price. Considered to be a bearish signal.
     """
-    pass
+    return bool(black_body_mask(candlestick_array(candlestick)))
 
 
 def is_white_body(candlestick):
     """
         Formed when the closing price is higher than the opening price and considered a bullish signal.
     """
-    pass
+    return bool(white_body_mask(candlestick_array(candlestick)))
 
 
 def is_doji(candlestick):
@@ -101,12 +113,12 @@ def is_doji(candlestick):
     return False
 
 
-def is_long_legged_doji(candlestick):
+def is_long_legged_doji(candlestick, long_shadow=0.05):
     """
         Consists of a Doji with very long upper and lower shadows. Indicates strong forces balanced in
         opposition.
     """
-    pass
+    return bool(long_legged_doji_mask(candlestick_array(candlestick), long_shadow))
 
 
 def is_dragonfly_doji(candlestick, long_lower_shadow=0.05):
@@ -189,28 +201,28 @@ def is_hanging_man(candlestick, t1=10, small_body=0.01):
     return False
 
 
-def is_shooting_star(candlestick):
+def is_shooting_star(candlestick, t1=2, t3=0.1, small_body=0.05):
     """
         A black or a white ta_candlestick that has a small body, a long upper shadow and a little or no lower tail.
         Considered a bearish pattern in an uptrend.
     """
-    pass
+    return bool(shooting_star_mask(candlestick_array(candlestick), t1, t3, small_body))
 
 
-def is_long_upper_shadow(candlestick):
+def is_long_upper_shadow(candlestick, long_shadow=2 / 3):
     """
         A black or a white ta_candlestick with an upper shadow that has a length of 2/3 or more of the total range of
         the ta_candlestick. Normally considered a bearish signal when it appears around price resistance levels.
     """
-    pass
+    return bool(long_upper_shadow_mask(candlestick_array(candlestick), long_shadow))
 
 
-def is_long_lower_shadow(candlestick):
+def is_long_lower_shadow(candlestick, long_shadow=2 / 3):
     """
         A black or a white ta_candlestick is formed with a lower tail that has a length of 2/3 or more of the total
         range of the ta_candlestick. Normally considered a bullish signal when it appears around price support levels
     """
-    pass
+    return bool(long_lower_shadow_mask(candlestick_array(candlestick), long_shadow))
 
 
 def is_marubozu(candlestick):
@@ -218,26 +230,26 @@ def is_marubozu(candlestick):
         A long or a normal ta_candlestick (black or white) with no shadow or tail. The high and the lows represent the
         opening and the closing prices. Considered a continuation pattern.
     """
-    pass
+    return bool(marubozu_mask(candlestick_array(candlestick)))
 
 
-def is_spinning_top(candlestick):
+def is_spinning_top(candlestick, small_body=0.05):
     """
         A black or a white ta_candlestick with a small body. The size of shadows can vary. Interpreted as a neutral
         pattern but gains importance when it is part of other formations.
     """
-    pass
+    return bool(spinning_top_mask(candlestick_array(candlestick), small_body))
 
 
 def is_shaven_head(candlestick):
     """
         A black or a white ta_candlestick with no upper shadow. [Compared with hammer.]
     """
-    pass
+    return bool(shaven_head_mask(candlestick_array(candlestick)))
 
 
 def is_shaven_bottom(candlestick):
     """
         A black or a white ta_candlestick with no lower tail. [Compare with Inverted Hammer.]
     """
-    pass
+    return bool(shaven_bottom_mask(candlestick_array(candlestick)))
@@ -0,0 +1,199 @@
+"""
+    Vectorized candlestick pattern scanner.
+
+    Prices and price differences (see pattern.extract_candlestick) are computed once for a whole OHLC DataFrame or a
+    (ticker x date) panel, then each pattern is evaluated as a NumPy boolean mask with the same thresholds as its
+    single candlestick function in pattern.py. Patterns added since are implemented here only and their single
+    candlestick functions are thin wrappers of the masks.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+Candlesticks = namedtuple("Candlesticks", ["y1", "y2", "y3", "y4", "d1", "d2", "d3", "bullish"])
+
+
+def extract_candlesticks(open_, close, high, low):
+    """
+        Extract prices and price differences from arrays of bullish or bearish candlesticks (any shape).
+
+        y1, y2, y3, y4 = open, close, high, low
+        bullish: d1, d2, d3 = y3 - y2, y2 - y1, y1 - y4
+        bearish: d1, d2, d3 = y3 - y1, y1 - y2, y2 - y4
+    """
+    y1, y2, y3, y4 = (np.asarray(y, dtype=float) for y in (open_, close, high, low))
+
+    bullish = y2 >= y1
+    top = np.where(bullish, y2, y1)
+    bottom = np.where(bullish, y1, y2)
+
+    return Candlesticks(y1, y2, y3, y4, y3 - top, top - bottom, bottom - y4, bullish)
+
+
+def extract_candlesticks_df(df):
+    """
+        Extract candlesticks from a df with open, close, high and low columns.
+    """
+    return extract_candlesticks(df["open"].to_numpy(dtype=float), df["close"].to_numpy(dtype=float),
+                                df["high"].to_numpy(dtype=float), df["low"].to_numpy(dtype=float))
+
+
+def ratio(a, b):
+    """
+        a / b without warnings, inf or NaN where b is 0.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return a / b
+
+
+def body_percent(c):
+    """
+        The body relative to the mean of open and close.
+    """
+    return ratio(2 * c.d2, c.y1 + c.y2)
+
+
+def _positive(c):
+    return (c.d1 > 0) & (c.d2 > 0) & (c.d3 > 0)
+
+
+# Candlestick pattern masks.
+def big_black_candle_mask(c, t1=5, t3=5, long_body=0.05):
+    return ~c.bullish & ~(body_percent(c) <= long_body) & _positive(c) & \
+           (ratio(c.d2, c.d1) > t1) & (ratio(c.d2, c.d3) > t3)
+
+
+def big_white_candle_mask(c, t1=5, t3=5, long_body=0.05):
+    return c.bullish & ~(body_percent(c) <= long_body) & _positive(c) & \
+           (ratio(c.d2, c.d1) > t1) & (ratio(c.d2, c.d3) > t3)
+
+
+def doji_mask(c):
+    return (c.d1 > 0) & (c.d2 == 0) & (c.d3 > 0)
+
+
+def dragonfly_doji_mask(c, long_lower_shadow=0.05):
+    return (c.d1 == 0) & (c.d2 == 0) & (ratio(2 * c.d3, c.y1 + c.y2) > long_lower_shadow)
+
+
+def gravestone_doji_mask(c, long_upper_shadow=0.05):
+    return (c.d2 == 0) & (c.d3 == 0) & (ratio(2 * c.d1, c.y1 + c.y2) > long_upper_shadow)
+
+
+def hammer_mask(c, t1=10, t3=3, small_body=0.05):
+    return ~(body_percent(c) > small_body) & _positive(c) & (ratio(c.d2, c.d1) > t1) & (ratio(c.d3, c.d2) > t3)
+
+
+def inverted_hammer_mask(c, t1=3, t3=10, small_body=0.05):
+    return ~(body_percent(c) > small_body) & _positive(c) & (ratio(c.d1, c.d2) > t1) & (ratio(c.d2, c.d3) > t3)
+
+
+def hanging_man_mask(c, t1=10, small_body=0.01):
+    ratio3 = ratio(c.d3, c.d2)
+
+    return ~(body_percent(c) > small_body) & (c.d1 >= 0) & (c.d2 > 0) & (c.d3 > 0) & \
+        (ratio(c.d2, c.d1) > t1) & (2 <= ratio3) & (ratio3 <= 3)
+
+
+def black_body_mask(c):
+    return c.y1 > c.y2
+
+
+def white_body_mask(c):
+    return c.y2 > c.y1
+
+
+def long_legged_doji_mask(c, long_shadow=0.05):
+    return doji_mask(c) & (ratio(2 * c.d1, c.y1 + c.y2) > long_shadow) & \
+        (ratio(2 * c.d3, c.y1 + c.y2) > long_shadow)
+
+
+def shooting_star_mask(c, t1=2, t3=0.1, small_body=0.05):
+    return ~(body_percent(c) > small_body) & (c.d1 > 0) & (c.d2 > 0) & (ratio(c.d1, c.d2) > t1) & \
+        (ratio(c.d3, c.y3 - c.y4) <= t3)
+
+
+def long_upper_shadow_mask(c, long_shadow=2 / 3):
+    return (c.y3 > c.y4) & (ratio(c.d1, c.y3 - c.y4) >= long_shadow)
+
+
+def long_lower_shadow_mask(c, long_shadow=2 / 3):
+    return (c.y3 > c.y4) & (ratio(c.d3, c.y3 - c.y4) >= long_shadow)
+
+
+def marubozu_mask(c):
+    return (c.d1 == 0) & (c.d2 > 0) & (c.d3 == 0)
+
+
+def spinning_top_mask(c, small_body=0.05):
+    return ~(body_percent(c) > small_body) & (c.d2 > 0) & (c.d1 > c.d2) & (c.d3 > c.d2)
+
+
+def shaven_head_mask(c):
+    return c.d1 == 0
+
+
+def shaven_bottom_mask(c):
+    return c.d3 == 0
+
+
+PATTERN_MASKS = {
+    "big_black_candle": big_black_candle_mask,
+    "big_white_candle": big_white_candle_mask,
+    "doji": doji_mask,
+    "dragonfly_doji": dragonfly_doji_mask,
+    "gravestone_doji": gravestone_doji_mask,
+    "hammer": hammer_mask,
+    "inverted_hammer": inverted_hammer_mask,
+    "hanging_man": hanging_man_mask,
+    "black_body": black_body_mask,
+    "white_body": white_body_mask,
+    "long_legged_doji": long_legged_doji_mask,
+    "shooting_star": shooting_star_mask,
+    "long_upper_shadow": long_upper_shadow_mask,
+    "long_lower_shadow": long_lower_shadow_mask,
+    "marubozu": marubozu_mask,
+    "spinning_top": spinning_top_mask,
+    "shaven_head": shaven_head_mask,
+    "shaven_bottom": shaven_bottom_mask,
+}
+
+
+def scan_candlesticks(candlesticks, patterns=None, params=None):
+    """
+        Evaluate patterns on extracted candlesticks.
+
+    :param candlesticks:            Candlesticks, see extract_candlesticks
+    :param patterns:                pattern names, defaults to all patterns of PATTERN_MASKS
+    :param params:                  {pattern: {param: value}} overriding the default thresholds
+    :return:                        {pattern: mask}
+    """
+    params = params or dict()
+
+    return {pattern: PATTERN_MASKS[pattern](candlesticks, **params.get(pattern, dict()))
+            for pattern in patterns or PATTERN_MASKS}
+
+
+def scan_candlestick_patterns(df, patterns=None, params=None):
+    """
+        Scan an OHLC df for candlestick patterns.
+
+    :return:                        df with one boolean column per pattern, aligned to df
+    """
+    masks = scan_candlesticks(extract_candlesticks_df(df), patterns=patterns, params=params)
+
+    return pd.DataFrame(masks, index=df.index)
+
+
+def scan_price_panel(panel, patterns=None, params=None):
+    """
+        Scan a PricePanel for candlestick patterns.
+
+    :return:                        {pattern: (ticker x date) mask}
+    """
+    candlesticks = extract_candlesticks(panel.field("open"), panel.field("close"), panel.field("high"),
+                                        panel.field("low"))
+
+    return scan_candlesticks(candlesticks, patterns=patterns, params=params)
@@ -0,0 +1,27 @@
+"""
+    Test data shared by the unit tests.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_ohlc_df(n=2000, seed=0):
+    """
+        Random candlesticks on a 0.01 price grid, so that equal prices (doji, no shadow) occur.
+    """
+    rng = np.random.default_rng(seed)
+    open_ = 5 + rng.integers(-30, 30, n) / 100
+    close = np.where(rng.random(n) < 0.2, open_, 5 + rng.integers(-30, 30, n) / 100)
+    high = np.maximum(open_, close) + np.where(rng.random(n) < 0.2, 0, rng.integers(0, 100, n) / 100)
+    low = np.minimum(open_, close) - np.where(rng.random(n) < 0.2, 0, rng.integers(0, 100, n) / 100)
+    close[rng.random(n) < 0.01] = np.nan
+
+    return pd.DataFrame({"open": open_, "close": close, "high": high, "low": low})
+
+
+def make_price_df(n=300, seed=0):
+    df = make_ohlc_df(n=n, seed=seed)
+    df.insert(0, "date", pd.bdate_range("2020-01-01", periods=n))
+
+    return df
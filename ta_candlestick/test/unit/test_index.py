@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from ta_candlestick.index import PatternIndex, pattern_events
+from ta_candlestick.test.unit.fixtures import make_price_df
+from ta_stock_market_data.storage import get_storage
+
+
+
+class TestPatternIndex(unittest.TestCase):
+
+    def test_incremental_update(self):
+        price_dfs = {"tls.ax": make_price_df(seed=0), "car.ax": make_price_df(seed=1)}
+
+        with tempfile.TemporaryDirectory() as data_path, tempfile.TemporaryDirectory() as index_path, \
+                tempfile.TemporaryDirectory() as full_index_path:
+            storage = get_storage("csv", data_path)
+            for stock_code, df in price_dfs.items():
+                storage.write(stock_code, "price", df.iloc[:200])
+            PatternIndex(index_path).update(list(price_dfs), data_path)
+
+            for stock_code, df in price_dfs.items():
+                storage.write(stock_code, "price", df)
+            index = PatternIndex(index_path)
+            index.update(list(price_dfs), data_path)
+            self.assertEqual(index.update(list(price_dfs), data_path), 0)
+
+            full_index = PatternIndex(full_index_path)
+            for stock_code, df in price_dfs.items():
+                full_index.add(stock_code, storage.read(stock_code, "price"))
+
+            pd.testing.assert_frame_equal(PatternIndex(index_path).df, full_index.df)
+            self.assertGreater(index.df["pattern"].nunique(), 10)
+
+    def test_revised_bars(self):
+        df = make_price_df()
+        revised_df = df.copy()
+        revised_df.loc[100:110, ["open", "close"]] = revised_df.loc[100:110, ["close", "open"]].to_numpy()
+
+        with tempfile.TemporaryDirectory() as index_path:
+            index = PatternIndex(index_path)
+            index.add("tls.ax", df.iloc[:200])
+            index.add("car.ax", make_price_df(seed=1))
+            index.save()
+
+            # Revised bars before the last indexed date index the ticker again.
+            index = PatternIndex(index_path)
+            index.add("tls.ax", revised_df)
+            expected = pattern_events(revised_df, "tls.ax")
+            self.assertEqual(index.query(ticker="tls.ax").to_dict("list"),
+                             expected.sort_values(by=["pattern", "date"], kind="stable").reset_index(drop=True)
+                             .to_dict("list"))
+
+            # Only the changed ticker is saved again.
+            car_path = os.path.join(index_path, "pattern_index", "car.ax.parquet")
+            os.remove(car_path)
+            index.save()
+            self.assertFalse(os.path.exists(car_path))
+            self.assertEqual(len(PatternIndex(index_path).query(ticker="tls.ax")), len(expected))
+
+            index.invalidate("tls.ax")
+            index.save()
+            self.assertTrue(PatternIndex(index_path).query(ticker="tls.ax").empty)
+
+    def test_query(self):
+        df = make_price_df()
+        events = pattern_events(df, "tls.ax")
+
+        with tempfile.TemporaryDirectory() as index_path:
+            index = PatternIndex(index_path)
+            index.add("tls.ax", df)
+            index.add("car.ax", make_price_df(seed=1))
+
+        hits = index.query("doji", "tls.ax", "2020-03-01", "2020-06-30")
+        expected = events[(events["pattern"] == "doji") & (events["date"] >= "2020-03-01") &
+                          (events["date"] <= "2020-06-30")]
+        self.assertEqual(hits["date"].to_list(), expected["date"].to_list())
+        self.assertGreater(len(hits), 0)
+
+        self.assertEqual(set(index.query(["doji", "hammer"])["ticker"]), {"tls.ax", "car.ax"})
+        self.assertEqual(set(index.query(ticker="car.ax")["ticker"]), {"car.ax"})
+        self.assertTrue(index.query("doji", "unknown.ax").empty)
+        self.assertTrue(index.query("unknown").empty)
+        self.assertEqual(list(index.dates("doji", "tls.ax", "2020-03-01", "2020-06-30")), expected["date"].to_list())
+
+
+if __name__ == "__main__":
+    unittest.main()
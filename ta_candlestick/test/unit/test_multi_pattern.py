@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_candlestick.multi_pattern import MULTI_PATTERN_MASKS, scan_multi_candlestick_patterns, \
+    scan_multi_candlesticks
+from ta_candlestick.scanner import extract_candlesticks
+from ta_candlestick.test.unit.fixtures import make_ohlc_df
+
+
+def ohlc_df(bars):
+    return pd.DataFrame(bars, columns=["open", "close", "high", "low"])
+
+
+class TestMultiPattern(unittest.TestCase):
+
+    def assert_last_bar(self, bars, expected_pattern):
+        # Lead the pattern with a flat bar, so that masks are aligned to the last bar.
+        df = ohlc_df([(10, 10, 10, 10)] + bars)
+        masks = scan_multi_candlestick_patterns(df)
+
+        for name in MULTI_PATTERN_MASKS:
+            self.assertEqual(masks[name].iloc[-1], name == expected_pattern, name)
+            self.assertFalse(masks[name].iloc[:-1].any(), name)
+
+    def test_engulfing(self):
+        self.assert_last_bar([(10.2, 10.0, 10.3, 9.9), (9.9, 10.4, 10.5, 9.8)], "bullish_engulfing")
+        self.assert_last_bar([(10.0, 10.2, 10.3, 9.9), (10.3, 9.8, 10.4, 9.7)], "bearish_engulfing")
+
+    def test_harami(self):
+        self.assert_last_bar([(10.6, 10.0, 10.7, 9.9), (10.1, 10.3, 10.4, 10.0)], "bullish_harami")
+        self.assert_last_bar([(10.0, 10.6, 10.7, 9.9), (10.4, 10.2, 10.5, 10.1)], "bearish_harami")
+
+    def test_star(self):
+        self.assert_last_bar([(10.6, 10.0, 10.7, 9.9), (9.85, 9.86, 9.9, 9.8), (9.9, 10.5, 10.6, 9.9)],
+                             "morning_star")
+        self.assert_last_bar([(10.0, 10.6, 10.7, 9.9), (10.75, 10.74, 10.8, 10.7), (10.7, 10.1, 10.7, 10.0)],
+                             "evening_star")
+
+    def test_three_soldiers_or_crows(self):
+        self.assert_last_bar([(10.0, 10.4, 10.45, 9.9), (10.2, 10.6, 10.65, 10.1), (10.4, 10.8, 10.85, 10.3)],
+                             "three_white_soldiers")
+        self.assert_last_bar([(10.8, 10.4, 10.9, 10.35), (10.6, 10.2, 10.7, 10.15), (10.4, 10.0, 10.5, 9.95)],
+                             "three_black_crows")
+
+    def test_scan_multi_candlesticks_panel(self):
+        dfs = [make_ohlc_df(n=500, seed=seed) for seed in range(3)]
+        panel = {field: np.stack([df[field].to_numpy() for df in dfs]) for field in ["open", "close", "high", "low"]}
+
+        masks = scan_multi_candlesticks(extract_candlesticks(panel["open"], panel["close"], panel["high"],
+                                                             panel["low"]))
+
+        for name in MULTI_PATTERN_MASKS:
+            self.assertEqual(masks[name].shape, (3, 500))
+            for i, df in enumerate(dfs):
+                np.testing.assert_array_equal(masks[name][i], scan_multi_candlestick_patterns(df)[name].to_numpy())
+
+    def test_short_df(self):
+        masks = scan_multi_candlestick_patterns(ohlc_df([(10.0, 10.4, 10.45, 9.9), (10.2, 10.6, 10.65, 10.1)]))
+
+        self.assertFalse(masks["three_white_soldiers"].any())
+        self.assertEqual(len(masks), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 import unittest
 
 from ta_candlestick.pattern import is_big_black_candle, is_big_white_candle, is_doji, is_dragonfly_doji, \
-    is_gravestone_doji, is_hammer, is_inverted_hammer, is_hanging_man
+    is_gravestone_doji, is_hammer, is_inverted_hammer, is_hanging_man, is_black_body, is_white_body, \
+    is_long_legged_doji, is_shooting_star, is_long_upper_shadow, is_long_lower_shadow, is_marubozu, is_spinning_top, \
+    is_shaven_head, is_shaven_bottom
 
 
 class TestCandlestickPattern(unittest.TestCase):
@@ -56,6 +58,40 @@ class TestCandlestickPattern(unittest.TestCase):
 
         self.assertEqual(is_hanging_man(candlestick, t1=10, small_body=0.05), True)
 
+    def test_is_black_or_white_body(self):
+        candlestick = {'open': 5.3, 'close': 5.1, 'high': 5.35, 'low': 4.3}
+
+        self.assertEqual(is_black_body(candlestick), True)
+        self.assertEqual(is_white_body(candlestick), False)
+
+    def test_is_long_legged_doji(self):
+        candlestick = {'open': 5, 'close': 5, 'high': 5.5, 'low': 4.5}
+
+        self.assertEqual(is_long_legged_doji(candlestick, long_shadow=0.05), True)
+
+    def test_is_shooting_star(self):
+        candlestick = {'open': 5.1, 'close': 5.0, 'high': 5.6, 'low': 4.99}
+
+        self.assertEqual(is_shooting_star(candlestick, t1=2, t3=0.1, small_body=0.05), True)
+
+    def test_is_long_upper_or_lower_shadow(self):
+        candlestick = {'open': 5.1, 'close': 5.0, 'high': 5.6, 'low': 4.99}
+
+        self.assertEqual(is_long_upper_shadow(candlestick), True)
+        self.assertEqual(is_long_lower_shadow(candlestick), False)
+
+    def test_is_marubozu(self):
+        candlestick = {'open': 5, 'close': 5.5, 'high': 5.5, 'low': 5}
+
+        self.assertEqual(is_marubozu(candlestick), True)
+        self.assertEqual(is_shaven_head(candlestick), True)
+        self.assertEqual(is_shaven_bottom(candlestick), True)
+
+    def test_is_spinning_top(self):
+        candlestick = {'open': 5, 'close': 5.05, 'high': 5.3, 'low': 4.7}
+
+        self.assertEqual(is_spinning_top(candlestick, small_body=0.05), True)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+import numpy as np
+
+from ta_candlestick import pattern
+from ta_candlestick.scanner import PATTERN_MASKS, scan_candlestick_patterns
+from ta_candlestick.test.unit.fixtures import make_ohlc_df
+
+
+
+class TestScanner(unittest.TestCase):
+
+    def test_scan_candlestick_patterns(self):
+        df = make_ohlc_df()
+        params = {"big_black_candle": {"t1": 2, "t3": 2, "long_body": 0.02},
+                  "big_white_candle": {"t1": 2, "t3": 2, "long_body": 0.02},
+                  "hammer": {"t1": 1, "t3": 2, "small_body": 0.1},
+                  "inverted_hammer": {"t1": 2, "t3": 1, "small_body": 0.1},
+                  "hanging_man": {"t1": 2, "small_body": 0.05}}
+
+        masks = scan_candlestick_patterns(df, params=params)
+
+        self.assertEqual(masks.columns.to_list(), list(PATTERN_MASKS))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for name in PATTERN_MASKS:
+                func = getattr(pattern, "is_" + name)
+                expected = [func(candlestick, **params.get(name, dict())) for _, candlestick in df.iterrows()]
+
+                self.assertEqual(masks[name].to_list(), expected, name)
+                self.assertTrue(masks[name].any(), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
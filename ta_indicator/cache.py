@@ -0,0 +1,172 @@
+"""
+    Indicator cache.
+
+    Indicator series are cached by (ticker, indicator, params, data version), where the data version is a hash of the
+    price data they are computed from, so that strategies, evaluations and parameter sweeps share them instead of
+    recomputing them. Series are kept in a memory LRU cache (see ta_stock_market_data.loader.LRUCache) and on disk as
+    {path}/{ticker}/{indicator}_{params}_{data_version}.parquet. A new data version replaces the series of older ones.
+
+    Hashing a price df costs about as much as computing a cheap indicator, so callers reading many indicators of one df
+    compute its data version once and pass it in, e.g., signals_s01.
+"""
+
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+from ta_candlestick.scanner import PATTERN_MASKS, extract_candlesticks_df
+from ta_indicator.indicator import atr, bbands, ema, macd, rsi, sma, windowed_rsi
+from ta_indicator.trend import rolling_trend
+from ta_stock_market_data.loader import LRUCache, df_nbytes
+
+DATA_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+
+
+def _column(df, column):
+    return df[column].to_numpy(dtype=float)
+
+
+def _bbands(df, length=5, std=2, ddof=0):
+    return dict(zip(["lower", "mid", "upper"], bbands(_column(df, "close"), length=length, std=std, ddof=ddof)))
+
+
+def _macd(df, fast=12, slow=26, signal=9):
+    return dict(zip(["macd", "histogram", "signal"], macd(_column(df, "close"), fast=fast, slow=slow, signal=signal)))
+
+
+def _trend(df, window, column="close"):
+    upward_or_downward, degree = rolling_trend(_column(df, column), window)
+
+    return {"upward_or_downward": upward_or_downward, "degree": degree}
+
+
+def _candlestick(df, pattern, **params):
+    return {pattern: PATTERN_MASKS[pattern](extract_candlesticks_df(df), **params)}
+
+
+# Indicators computed from a price df, returning {output: array aligned to df}.
+INDICATORS = {
+    "sma": lambda df, length=10: {"sma": sma(_column(df, "close"), length)},
+    "ema": lambda df, length=10: {"ema": ema(_column(df, "close"), length)},
+    "rsi": lambda df, length=14: {"rsi": rsi(_column(df, "close"), length)},
+    "windowed_rsi": lambda df, length=14, window=60: {"rsi": windowed_rsi(_column(df, "close"), length, window)},
+    "bbands": _bbands,
+    "atr": lambda df, length=14: {"atr": atr(_column(df, "high"), _column(df, "low"), _column(df, "close"), length)},
+    "macd": _macd,
+    "trend": _trend,
+    "candlestick": _candlestick,
+}
+
+
+def data_version(df):
+    """
+        A hash of the dates and prices of a price df.
+    """
+    columns = [column for column in DATA_COLUMNS if column in df.columns]
+    hashes = pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+    return hashlib.sha1(hashes.tobytes()).hexdigest()[:16]
+
+
+def params_key(params):
+    """
+        A canonical string of params, e.g., {"window": 60, "length": 14} -> length=14,window=60.
+    """
+    return ",".join("{name}={value}".format(name=name, value=params[name]) for name in sorted(params))
+
+
+class IndicatorCache:
+    """
+        A two-tier (memory and disk) cache of indicator series, e.g.,
+
+            cache = IndicatorCache("data/indicator_cache")
+            rsi = cache.get("TLS.AX", df, "rsi", length=14)["rsi"]
+
+        Cached dfs are shared between callers and must not be modified in place. Without a path, the cache is
+        memory-only.
+    """
+
+    def __init__(self, path=None, max_bytes=256 * 1024 ** 2):
+        self.path = path
+        self.memory = LRUCache(max_bytes, sizeof=df_nbytes)
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._versions = dict()
+
+    def _disk_path(self, ticker, indicator, key, version):
+        return os.path.join(self.path, ticker, "{indicator}_{key}_{version}.parquet".format(
+            indicator=indicator, key=key, version=version))
+
+    def get(self, ticker, df, indicator, version=None, **params):
+        """
+            The indicator series of a price df (sorted by date) as a df aligned to it, computed on a miss. version is
+            data_version(df), computed if not given.
+        """
+        key = params_key(params)
+        if version is None:
+            version = data_version(df)
+        cache_key = (ticker, indicator, key, version)
+
+        values = self.memory.get(cache_key)
+        if values is not None:
+            self.hits += 1
+            return values.set_axis(df.index)
+
+        # A new data version invalidates the series of the previous one.
+        previous_version = self._versions.get((ticker, indicator, key))
+        if previous_version is not None and previous_version != version:
+            self.memory.pop((ticker, indicator, key, previous_version))
+        self._versions[(ticker, indicator, key)] = version
+
+        disk_path = self._disk_path(ticker, indicator, key, version) if self.path is not None else None
+        if disk_path is not None and os.path.exists(disk_path):
+            self.disk_hits += 1
+            values = pd.read_parquet(disk_path)
+        else:
+            self.misses += 1
+            values = pd.DataFrame(INDICATORS[indicator](df, **params))
+            if disk_path is not None:
+                self._write(disk_path, values)
+
+        self.memory.put(cache_key, values)
+
+        return values.set_axis(df.index)
+
+    def _write(self, disk_path, values):
+        os.makedirs(os.path.dirname(disk_path), exist_ok=True)
+
+        prefix = disk_path[:disk_path.rindex("_") + 1]
+        for stale_path in glob.glob(glob.escape(prefix) + "*.parquet"):
+            os.remove(stale_path)
+
+        values.to_parquet(disk_path, index=False)
+
+    def invalidate(self, ticker):
+        """
+            Drop all cached series of a ticker.
+        """
+        for ticker_, indicator, key in [k for k in self._versions if k[0] == ticker]:
+            self.memory.pop((ticker_, indicator, key, self._versions.pop((ticker_, indicator, key))))
+
+        if self.path is not None:
+            for disk_path in glob.glob(os.path.join(glob.escape(self.path), glob.escape(ticker), "*.parquet")):
+                os.remove(disk_path)
+
+
+def get_indicator(df, indicator, cache=None, ticker=None, version=None, **params):
+    """
+        The indicator series of a price df as a df aligned to it, from an IndicatorCache if one is given. ticker
+        defaults to the ticker column of df and version to data_version(df).
+    """
+    if cache is None:
+        return pd.DataFrame(INDICATORS[indicator](df, **params), index=df.index)
+
+    if ticker is None:
+        ticker = str(df["ticker"].iloc[0])
+
+    return cache.get(ticker, df, indicator, version=version, **params)
@@ -0,0 +1,242 @@
+"""
+    Incremental indicators.
+
+    Each indicator keeps the state of one series and is updated with one value per bar in O(1), giving the same values
+    as its ta_indicator.indicator counterpart at the latest bar. Running sums are recomputed from the window now and
+    then, so that rounding errors do not build up. States are JSON-serializable dicts (to_dict/from_dict).
+
+    The rolling trend of ta_indicator.trend.RollingTrend is the incremental counterpart of rolling_trend.
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+class EwmMean:
+    """
+        pandas ewm(alpha=alpha, adjust=adjust, min_periods=min_periods).mean(), see indicator.ewm_mean.
+    """
+
+    def __init__(self, alpha, adjust=True, min_periods=0):
+        self.alpha = alpha
+        self.adjust = adjust
+        self.min_periods = min_periods
+
+        self.weighted = np.nan
+        self.old_wt = 1.0
+        self.nobs = 0
+
+    def update(self, value):
+        value = float(value)
+        is_observation = not np.isnan(value)
+        self.nobs += is_observation
+
+        if not np.isnan(self.weighted):
+            self.old_wt *= 1 - self.alpha
+            if is_observation:
+                new_wt = 1.0 if self.adjust else self.alpha
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + new_wt * value) / (self.old_wt + new_wt)
+                self.old_wt = self.old_wt + new_wt if self.adjust else 1.0
+        elif is_observation:
+            self.weighted = value
+
+        return self.value()
+
+    def value(self):
+        return self.weighted if self.nobs >= max(self.min_periods, 1) else np.nan
+
+    def to_dict(self):
+        return {"alpha": self.alpha, "adjust": self.adjust, "min_periods": self.min_periods,
+                "weighted": self.weighted, "old_wt": self.old_wt, "nobs": self.nobs}
+
+    @classmethod
+    def from_dict(cls, state):
+        ewm = cls(state["alpha"], adjust=state["adjust"], min_periods=state["min_periods"])
+        ewm.weighted, ewm.old_wt, ewm.nobs = state["weighted"], state["old_wt"], state["nobs"]
+
+        return ewm
+
+
+class WilderRSI:
+    """
+        Wilder's relative strength index carrying the rma state of gains and losses, see indicator.rsi.
+    """
+
+    def __init__(self, length=14):
+        self.length = length
+
+        self.previous = None
+        self.gain = EwmMean(1 / length, min_periods=length)
+        self.loss = EwmMean(1 / length, min_periods=length)
+
+    def update(self, close):
+        close = float(close)
+        d = np.nan if self.previous is None else close - self.previous
+        self.previous = close
+
+        gain_avg = np.float64(self.gain.update(0 if d < 0 else d))
+        loss_avg = np.float64(self.loss.update(0 if d > 0 else -d))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 100 * gain_avg / (gain_avg + loss_avg)
+
+    def to_dict(self):
+        return {"length": self.length, "previous": self.previous, "gain": self.gain.to_dict(),
+                "loss": self.loss.to_dict()}
+
+    @classmethod
+    def from_dict(cls, state):
+        rsi = cls(state["length"])
+        rsi.previous = state["previous"]
+        rsi.gain = EwmMean.from_dict(state["gain"])
+        rsi.loss = EwmMean.from_dict(state["loss"])
+
+        return rsi
+
+
+class WindowedRSI:
+    """
+        The relative strength index of the last window bars, see indicator.windowed_rsi. The exponentially weighted
+        sums of gains and changes over the last window - 1 diffs are carried: each bar ages them by 1 - 1 / length, adds
+        the new diff and drops the diff leaving the window.
+    """
+
+    def __init__(self, length=14, window=60):
+        self.length = length
+        self.window = window
+
+        self.n = 0
+        self.previous = np.nan
+        self._diffs = deque()
+        self._count = 0
+        self._gain = 0.0
+        self._change = 0.0
+
+    def _resum(self):
+        weights = (1 - 1 / self.length) ** np.arange(len(self._diffs) - 1, -1, -1)
+        diffs = np.array(self._diffs, dtype=float)
+        is_valid = ~np.isnan(diffs)
+
+        self._count = int(is_valid.sum())
+        self._gain = float(weights @ np.where(is_valid & (diffs > 0), diffs, 0))
+        self._change = float(weights @ np.where(is_valid, np.abs(diffs), 0))
+
+    def update(self, close):
+        close = float(close)
+        d = close - self.previous
+        self.previous = close
+        self.n += 1
+
+        r = 1 - 1 / self.length
+        self._diffs.append(d)
+        self._count += not np.isnan(d)
+        self._gain = r * self._gain + (d if d > 0 else 0)
+        self._change = r * self._change + (abs(d) if not np.isnan(d) else 0)
+        if len(self._diffs) > self.window - 1:
+            old = self._diffs.popleft()
+            if not np.isnan(old):
+                self._count -= 1
+                self._gain -= r ** (self.window - 1) * (old if old > 0 else 0)
+                self._change -= r ** (self.window - 1) * abs(old)
+
+        if self.n % (self.window - 1) == 0:
+            self._resum()
+
+        return self.value()
+
+    def value(self):
+        if self.n < self.window or self._count < self.length or self._change == 0:
+            return np.nan
+
+        return 100 * self._gain / self._change
+
+    def to_dict(self):
+        return {"length": self.length, "window": self.window, "n": self.n, "previous": self.previous,
+                "diffs": list(self._diffs)}
+
+    @classmethod
+    def from_dict(cls, state):
+        rsi = cls(state["length"], state["window"])
+        rsi.n, rsi.previous = state["n"], state["previous"]
+        rsi._diffs = deque(state["diffs"])
+        rsi._resum()
+
+        return rsi
+
+
+class RollingBbands:
+    """
+        Bollinger bands of the last length values, see indicator.bbands, from running sums of the values and their
+        squares (shifted by a value of the window to keep precision).
+    """
+
+    def __init__(self, length=5, std=2, ddof=0):
+        self.length = length
+        self.std = std
+        self.ddof = ddof
+
+        self.n = 0
+        self._values = deque()
+        self._shift = np.nan
+        self._nans = 0
+        self._sum = 0.0
+        self._sum2 = 0.0
+
+    def _resum(self):
+        values = np.array(self._values, dtype=float)
+        valid = values[~np.isnan(values)]
+
+        self._shift = valid[0] if len(valid) else np.nan
+        self._nans = len(values) - len(valid)
+        self._sum = float((valid - self._shift).sum()) if len(valid) else 0.0
+        self._sum2 = float(((valid - self._shift) ** 2).sum()) if len(valid) else 0.0
+
+    def _add(self, value, sign):
+        if np.isnan(value):
+            self._nans += sign
+        else:
+            self._sum += sign * (value - self._shift)
+            self._sum2 += sign * (value - self._shift) ** 2
+
+    def update(self, value):
+        value = float(value)
+        if np.isnan(self._shift) and not np.isnan(value):
+            self._shift = value
+
+        self._values.append(value)
+        self._add(value, 1)
+        if len(self._values) > self.length:
+            self._add(self._values.popleft(), -1)
+        self.n += 1
+
+        if self.n % self.length == 0:
+            self._resum()
+
+        return self.value()
+
+    def value(self):
+        """
+            lower, mid, upper, NaN if the window has fewer than length values or a NaN value.
+        """
+        if len(self._values) < self.length or self._nans:
+            return np.nan, np.nan, np.nan
+
+        mean = self._sum / self.length
+        stdev = np.sqrt(max(self._sum2 / self.length - mean * mean, 0) * self.length / (self.length - self.ddof))
+        mid = self._shift + mean
+
+        return mid - self.std * stdev, mid, mid + self.std * stdev
+
+    def to_dict(self):
+        return {"length": self.length, "std": self.std, "ddof": self.ddof, "n": self.n, "values": list(self._values)}
+
+    @classmethod
+    def from_dict(cls, state):
+        bbands = cls(state["length"], std=state["std"], ddof=state["ddof"])
+        bbands.n = state["n"]
+        bbands._values = deque(state["values"])
+        bbands._resum()
+
+        return bbands
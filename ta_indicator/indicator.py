@@ -0,0 +1,221 @@
+"""
+    Technical indicators.
+
+    Indicators are computed for every bar along the last axis of NumPy arrays, so a series or a (ticker x date) panel is
+    computed at once, with the same formulas and NaN handling as pandas_ta (and pandas ewm). float32 values give float32
+    indicators, other values float64.
+
+    reference:
+        https://github.com/twopirllc/pandas-ta
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _as_float(y):
+    y = np.asarray(y)
+    if y.dtype == np.float32:
+        return y
+
+    return y.astype(float)
+
+
+def _rolling(y, length, func):
+    """
+        func of each window of length values along the last axis, NaN for the first length - 1 values.
+    """
+    y = _as_float(y)
+
+    values = np.full(y.shape, np.nan, dtype=y.dtype)
+    if y.shape[-1] >= length:
+        values[..., length - 1:] = func(sliding_window_view(y, length, axis=-1))
+
+    return values
+
+
+def diff(y):
+    """
+        y[i] - y[i - 1] along the last axis, NaN for the first value.
+    """
+    y = _as_float(y)
+
+    d = np.full(y.shape, np.nan, dtype=y.dtype)
+    d[..., 1:] = y[..., 1:] - y[..., :-1]
+
+    return d
+
+
+def ewm_mean(y, alpha, adjust=True, min_periods=0):
+    """
+        pandas y.ewm(alpha=alpha, adjust=adjust, min_periods=min_periods).mean() along the last axis.
+
+        The recursion of pandas is run over dates and vectorized over the leading axes: NaN values age the weight of
+        the running mean (ignore_na=False) without updating it.
+    """
+    y = _as_float(y)
+    min_periods = max(min_periods, 1)
+    old_wt_factor = 1 - alpha
+    new_wt = 1.0 if adjust else alpha
+
+    values = np.empty(y.shape, dtype=y.dtype)
+    if y.shape[-1] == 0:
+        return values
+
+    weighted = y[..., 0].astype(float)
+    nobs = (~np.isnan(weighted)).astype(int)
+    old_wt = np.ones(y.shape[:-1])
+    values[..., 0] = np.where(nobs >= min_periods, weighted, np.nan)
+
+    for i in range(1, y.shape[-1]):
+        cur = y[..., i].astype(float)
+        is_observation = ~np.isnan(cur)
+        nobs = nobs + is_observation
+
+        has_weighted = ~np.isnan(weighted)
+        old_wt = np.where(has_weighted, old_wt * old_wt_factor, old_wt)
+
+        update = has_weighted & is_observation
+        with np.errstate(invalid="ignore"):
+            updated = np.where(weighted != cur, (old_wt * weighted + new_wt * cur) / (old_wt + new_wt), weighted)
+        weighted = np.where(update, updated, np.where(~has_weighted & is_observation, cur, weighted))
+        old_wt = np.where(update, old_wt + new_wt if adjust else 1.0, old_wt)
+
+        values[..., i] = np.where(nobs >= min_periods, weighted, np.nan)
+
+    return values
+
+
+def sma(y, length=10):
+    """
+        Simple moving average, NaN if a window has a NaN value.
+    """
+    return _rolling(y, length, lambda windows: windows.mean(axis=-1))
+
+
+def rma(y, length=10):
+    """
+        Wilder's moving average, ewm(alpha=1 / length, min_periods=length).
+    """
+    return ewm_mean(y, 1 / length, adjust=True, min_periods=length)
+
+
+def ema(y, length=10, start=None):
+    """
+        Exponential moving average, ewm(span=length, adjust=False) seeded with the mean of the first length values as
+        pandas_ta does. start (an index, or an index per series) is where the series start, e.g., their first valid
+        values.
+    """
+    y = _as_float(y).copy()
+    n = y.shape[-1]
+    if n < length:
+        return np.full(y.shape, np.nan, dtype=y.dtype)
+
+    start = np.zeros(y.shape[:-1], dtype=int) if start is None else np.broadcast_to(start, y.shape[:-1])
+    j = np.arange(n)
+    end = start[..., np.newaxis] + length
+
+    # The seed is the mean of the non-NaN values of the first length values.
+    is_seed = (j >= start[..., np.newaxis]) & (j < end) & ~np.isnan(y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        seed = np.where(is_seed, y, 0).sum(axis=-1) / is_seed.sum(axis=-1)
+
+    y[j < end - 1] = np.nan
+    np.put_along_axis(y, np.minimum(end - 1, n - 1), np.where(end[..., 0] <= n, seed, np.nan)[..., np.newaxis],
+                      axis=-1)
+
+    return ewm_mean(y, 2 / (length + 1), adjust=False)
+
+
+def bbands(close, length=5, std=2, ddof=0):
+    """
+        Bollinger bands: the simple moving average of close (mid) +/- std standard deviations of the same window.
+
+    :return:                        lower, mid, upper
+    """
+    mid = sma(close, length)
+    stdev = _rolling(close, length, lambda windows: windows.std(axis=-1, ddof=ddof))
+
+    return mid - std * stdev, mid, mid + std * stdev
+
+
+def rsi(close, length=14):
+    """
+        Wilder's relative strength index, 100 * rma(gain) / (rma(gain) + rma(loss)).
+    """
+    d = diff(close)
+    gain = np.where(d < 0, 0, d)
+    loss = np.where(d > 0, 0, -d)
+
+    gain_avg = rma(gain, length)
+    loss_avg = rma(loss, length)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 * gain_avg / (gain_avg + loss_avg)
+
+
+def windowed_rsi(close, length=14, window=60):
+    """
+        Relative strength index of the last window bars as of each bar, i.e., rsi(close[i - window + 1:i + 1], length)
+        at bar i, as strategies compute RSI on a slice of recent bars.
+
+        rsi averages gains and losses with ewm(alpha=1 / length, adjust=True), so the RSI of a slice is
+        100 * sum(w * gain) / sum(w * |diff|) over the window - 1 diffs of the slice, with weights w = (1 - alpha) ^ k
+        for the k-th latest diff. NaN diffs carry no weight but age the older ones, and at least length non-NaN diffs
+        are required.
+    """
+    d = diff(close)
+    is_valid = ~np.isnan(d)
+    gain = np.where(is_valid & (d > 0), d, 0)
+    change = np.where(is_valid, np.abs(d), 0)
+
+    weights = (1 - 1 / length) ** np.arange(window - 2, -1, -1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100 * _rolling(gain, window - 1, lambda windows: windows @ weights) / \
+            _rolling(change, window - 1, lambda windows: windows @ weights)
+    count = _rolling(is_valid, window - 1, lambda windows: windows.sum(axis=-1))
+
+    # A slice of window bars starts at bar i - window + 1, before which the window - 1 diffs are not defined.
+    values[..., :window - 1] = np.nan
+
+    return np.where(count >= length, values, np.nan).astype(d.dtype)
+
+
+def true_range(high, low, close):
+    """
+        max(high - low, |high - previous close|, |low - previous close|) ignoring NaN, NaN for the first bar.
+    """
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+
+    previous_close = np.full(close.shape, np.nan, dtype=close.dtype)
+    previous_close[..., 1:] = close[..., :-1]
+    ranges = np.stack([high - low, np.abs(high - previous_close), np.abs(low - previous_close)])
+
+    with np.errstate(invalid="ignore"):
+        tr = np.fmax(np.fmax(ranges[0], ranges[1]), ranges[2])
+    tr[..., :1] = np.nan
+
+    return tr
+
+
+def atr(high, low, close, length=14):
+    """
+        Average true range, rma of the true range.
+    """
+    return rma(true_range(high, low, close), length)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """
+        Moving average convergence divergence: ema(fast) - ema(slow), its signal line (ema(signal) of macd from its
+        first valid value) and histogram (macd - signal).
+
+    :return:                        macd, histogram, signal
+    """
+    values = ema(close, fast) - ema(close, slow)
+
+    is_valid = ~np.isnan(values)
+    first_valid = np.where(is_valid.any(axis=-1), is_valid.argmax(axis=-1), values.shape[-1])
+    signal_values = ema(values, signal, start=first_valid)
+
+    return values, values - signal_values, signal_values
@@ -0,0 +1,13 @@
+"""
+    Test data shared by the unit tests.
+"""
+
+import numpy as np
+
+
+def make_close(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 5 + np.cumsum(rng.normal(0, 0.1, n))
+    close[rng.random(n) < 0.05] = np.nan
+
+    return close
@@ -0,0 +1,62 @@
+import glob
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_indicator.cache import IndicatorCache, data_version, get_indicator, params_key
+from ta_indicator.indicator import rsi
+from ta_strategy.test.unit.fixtures import make_price_df
+
+
+class TestIndicatorCache(unittest.TestCase):
+
+    def test_get(self):
+        df = make_price_df()
+
+        with tempfile.TemporaryDirectory() as path:
+            cache = IndicatorCache(path)
+
+            values = cache.get("TLS.AX", df, "rsi", length=14)
+            np.testing.assert_allclose(values["rsi"], rsi(df["close"].to_numpy(), 14))
+            cache.get("TLS.AX", df, "rsi", length=14)
+            cache.get("TLS.AX", df, "rsi", length=7)
+            # A data version computed by the caller.
+            cache.get("TLS.AX", df, "rsi", version=data_version(df), length=7)
+            self.assertEqual((cache.hits, cache.disk_hits, cache.misses), (2, 0, 2))
+
+            # Another run reads the series from disk.
+            other_cache = IndicatorCache(path)
+            pd.testing.assert_frame_equal(other_cache.get("TLS.AX", df, "rsi", length=14), values)
+            self.assertEqual((other_cache.hits, other_cache.disk_hits, other_cache.misses), (0, 1, 0))
+
+            # A new bar is a new data version, which replaces the series of the previous one.
+            new_df = make_price_df(n=301)
+            self.assertNotEqual(data_version(new_df), data_version(df))
+            self.assertEqual(len(cache.get("TLS.AX", new_df, "rsi", length=14)), 301)
+            self.assertEqual(cache.misses, 3)
+            self.assertEqual(len(glob.glob(os.path.join(path, "TLS.AX", "rsi_length=14_*.parquet"))), 1)
+            self.assertEqual(len(cache.memory), 2)
+
+            cache.invalidate("TLS.AX")
+            self.assertEqual(len(cache.memory), 0)
+            self.assertEqual(glob.glob(os.path.join(path, "TLS.AX", "*.parquet")), [])
+
+    def test_get_indicator(self):
+        df = make_price_df()
+        cache = IndicatorCache()
+
+        for indicator, params in [("bbands", {"length": 20, "std": 2}), ("macd", {}), ("trend", {"window": 60}),
+                                  ("candlestick", {"pattern": "doji"}), ("atr", {"length": 14})]:
+            expected = get_indicator(df, indicator, **params)
+            pd.testing.assert_frame_equal(get_indicator(df, indicator, cache, **params), expected)
+            pd.testing.assert_frame_equal(get_indicator(df, indicator, cache, **params), expected)
+
+        self.assertEqual((cache.hits, cache.misses), (5, 5))
+        self.assertEqual(params_key({"window": 60, "length": 14}), "length=14,window=60")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import unittest
+
+import numpy as np
+
+from ta_indicator.incremental import EwmMean, RollingBbands, WilderRSI, WindowedRSI
+from ta_indicator.indicator import bbands, ewm_mean, rsi, windowed_rsi
+from ta_indicator.test.unit.fixtures import make_close
+from ta_indicator.trend import RollingTrend, rolling_slope
+
+
+def run(indicator, values, checkpoint_at=None):
+    """
+        Update an indicator with values, round-tripping its state through JSON at checkpoint_at.
+    """
+    results = []
+    for i, value in enumerate(values):
+        if i == checkpoint_at:
+            indicator = type(indicator).from_dict(json.loads(json.dumps(indicator.to_dict())))
+        results.append(indicator.update(value))
+
+    return results
+
+
+class TestIncremental(unittest.TestCase):
+
+    def test_ewm_mean(self):
+        close = make_close(n=500)
+
+        for adjust, min_periods in [(True, 14), (False, 0)]:
+            values = run(EwmMean(0.1, adjust=adjust, min_periods=min_periods), close, checkpoint_at=250)
+            np.testing.assert_allclose(values, ewm_mean(close, 0.1, adjust=adjust, min_periods=min_periods))
+
+    def test_rsi(self):
+        close = make_close(n=500)
+        close[300:330] = np.nan
+
+        np.testing.assert_allclose(run(WilderRSI(14), close, checkpoint_at=250), rsi(close, 14))
+        np.testing.assert_allclose(run(WindowedRSI(14, 60), close, checkpoint_at=250), windowed_rsi(close, 14, 60))
+
+    def test_rolling_bbands(self):
+        close = make_close(n=500)
+
+        values = np.array(run(RollingBbands(20, 2), close, checkpoint_at=250))
+
+        for values, expected in zip(values.T, bbands(close, 20, 2)):
+            np.testing.assert_allclose(values, expected)
+
+    def test_rolling_trend_checkpoint(self):
+        close = make_close(n=500)
+
+        rolling_trend_ = RollingTrend(60)
+        slopes = []
+        for i, value in enumerate(close):
+            if i == 250:
+                rolling_trend_ = RollingTrend.from_dict(json.loads(json.dumps(rolling_trend_.to_dict())))
+            rolling_trend_.push(value)
+            slopes.append(rolling_trend_.slope())
+
+        np.testing.assert_allclose(slopes, rolling_slope(close, 60), rtol=1e-9, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
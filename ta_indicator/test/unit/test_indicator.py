@@ -0,0 +1,148 @@
+import importlib.util
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_indicator.indicator import atr, bbands, ema, ewm_mean, macd, rsi, sma, windowed_rsi
+from ta_indicator.test.unit.fixtures import make_close
+
+
+def pandas_ta_rsi(close, length=14):
+    """
+        pandas_ta rsi: gains and losses averaged with rma, i.e., ewm(alpha=1 / length, min_periods=length).
+    """
+    negative = close.diff()
+    positive = negative.copy()
+    positive[positive < 0] = 0
+    negative[negative > 0] = 0
+
+    positive_avg = positive.ewm(alpha=1 / length, min_periods=length).mean()
+    negative_avg = negative.ewm(alpha=1 / length, min_periods=length).mean()
+
+    return 100 * positive_avg / (positive_avg + negative_avg.abs())
+
+
+def pandas_ta_ema(close, length=10):
+    """
+        pandas_ta ema: ewm(span=length, adjust=False) seeded with the mean of the first length values.
+    """
+    close = close.copy()
+    sma_nth = close[0:length].mean()
+    close[:length - 1] = np.nan
+    close.iloc[length - 1] = sma_nth
+
+    return close.ewm(span=length, adjust=False).mean()
+
+
+def pandas_ta_macd(close, fast=12, slow=26, signal=9):
+    values = pandas_ta_ema(close, fast) - pandas_ta_ema(close, slow)
+    signal_values = pandas_ta_ema(values.loc[values.first_valid_index():], signal).reindex(values.index)
+
+    return values, values - signal_values, signal_values
+
+
+def pandas_ta_atr(high, low, close, length=14):
+    previous_close = close.shift(1)
+    tr = pd.concat([high - low, (high - previous_close).abs(), (low - previous_close).abs()], axis=1).max(axis=1)
+    tr.iloc[:1] = np.nan
+
+    return tr.ewm(alpha=1 / length, min_periods=length).mean()
+
+
+class TestIndicator(unittest.TestCase):
+
+    def test_sma_bbands(self):
+        close = make_close()
+        series = pd.Series(close)
+
+        np.testing.assert_allclose(sma(close, 10), series.rolling(10).mean())
+
+        lower, mid, upper = bbands(close, length=20, std=2)
+        stdev = series.rolling(20).std(ddof=0)
+        np.testing.assert_allclose(mid, series.rolling(20).mean())
+        np.testing.assert_allclose(lower, series.rolling(20).mean() - 2 * stdev)
+        np.testing.assert_allclose(upper, series.rolling(20).mean() + 2 * stdev)
+
+        self.assertTrue(np.isnan(sma(close[:5], 10)).all())
+
+    def test_windowed_rsi(self):
+        close = make_close()
+        close[150:200] = np.nan
+
+        rsi = windowed_rsi(close, length=14, window=60)
+
+        expected = [np.nan] * 59 + [pandas_ta_rsi(pd.Series(close[i - 59:i + 1])).iloc[-1] for i in range(59, 300)]
+        np.testing.assert_allclose(rsi, expected)
+        self.assertTrue(np.isnan(rsi[200:220]).any())
+
+    def test_panel(self):
+        panel = np.stack([make_close(seed=seed) for seed in range(3)])
+
+        rsi = windowed_rsi(panel)
+        lower, _, _ = bbands(panel, length=20)
+
+        for i in range(3):
+            np.testing.assert_allclose(rsi[i], windowed_rsi(panel[i]))
+            np.testing.assert_allclose(lower[i], bbands(panel[i], length=20)[0])
+
+    def test_ewm_mean(self):
+        series = pd.Series(make_close())
+
+        for adjust, min_periods in [(True, 0), (False, 0), (True, 14), (False, 5)]:
+            np.testing.assert_allclose(ewm_mean(series.to_numpy(), 0.2, adjust=adjust, min_periods=min_periods),
+                                       series.ewm(alpha=0.2, adjust=adjust, min_periods=min_periods).mean())
+
+    def test_ema_rsi_macd_atr(self):
+        rng = np.random.default_rng(1)
+        close = make_close(seed=1)
+        high = close + rng.random(300) / 10
+        low = close - rng.random(300) / 10
+        series = pd.Series(close)
+
+        np.testing.assert_allclose(ema(close, 10), pandas_ta_ema(series, 10))
+        np.testing.assert_allclose(rsi(close, 14), pandas_ta_rsi(series, 14))
+        for values, expected in zip(macd(close), pandas_ta_macd(series)):
+            np.testing.assert_allclose(values, expected)
+        np.testing.assert_allclose(atr(high, low, close, 14), pandas_ta_atr(pd.Series(high), pd.Series(low), series))
+
+        # rsi of a slice is windowed_rsi.
+        self.assertAlmostEqual(rsi(close[200:260])[-1], windowed_rsi(close)[259])
+
+    def test_panel_float32(self):
+        closes = np.stack([make_close(seed=seed) for seed in range(3)])
+        # The third ticker starts later.
+        closes[2, :50] = np.nan
+
+        for func in [lambda y: ema(y, 10), rsi, lambda y: macd(y)[2], lambda y: bbands(y, 20)[0]]:
+            values = func(closes)
+            for i in range(3):
+                np.testing.assert_allclose(values[i], func(closes[i]))
+
+            values32 = func(closes.astype(np.float32))
+            self.assertEqual(values32.dtype, np.float32)
+            np.testing.assert_allclose(values32, values, rtol=1e-4, atol=1e-4)
+
+
+@unittest.skipUnless(importlib.util.find_spec("pandas_ta"), "pandas_ta is not installed")
+class TestPandasTaIndicator(unittest.TestCase):
+
+    def test_pandas_ta(self):
+        import pandas_ta as ta
+
+        rng = np.random.default_rng(2)
+        close = make_close(seed=2)
+        high = close + rng.random(300) / 10
+        low = close - rng.random(300) / 10
+        series = pd.Series(close)
+
+        np.testing.assert_allclose(ema(close, 10), ta.ema(series, length=10))
+        np.testing.assert_allclose(rsi(close, 14), ta.rsi(series, length=14))
+        np.testing.assert_allclose(atr(high, low, close, 14), ta.atr(pd.Series(high), pd.Series(low), series, 14))
+        np.testing.assert_allclose(np.stack(macd(close), axis=-1), ta.macd(series).to_numpy())
+        np.testing.assert_allclose(np.stack(bbands(close, 20), axis=-1),
+                                   ta.bbands(series, length=20, std=2).iloc[:, :3].to_numpy())
+
+
+if __name__ == "__main__":
+    unittest.main()
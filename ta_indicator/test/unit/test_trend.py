@@ -1,6 +1,28 @@
 import unittest
 
-from ta_indicator.trend import is_upward_or_downward_trend, is_market_top_or_bottom
+import numpy as np
+
+from ta_indicator.trend import MonotonicDeque, RollingTrend, StreamingMarketTopOrBottom, \
+    batch_market_top_or_bottom, batch_upward_or_downward_trend, is_market_top_or_bottom, \
+    is_upward_or_downward_trend, rolling_market_top_or_bottom, rolling_slope, rolling_trend
+
+
+def trends(y, window):
+    """
+        The trends of each window as the callers of is_upward_or_downward_trend compute them.
+    """
+    upward_or_downwards, degrees = [], []
+    for i in range(len(y)):
+        values = [value for value in y[max(0, i - window + 1):i + 1] if not np.isnan(value)]
+        if i + 1 < window or len(values) < 2:
+            upward_or_downwards.append(None)
+            degrees.append(np.nan)
+        else:
+            upward_or_downward, degree = is_upward_or_downward_trend(values)
+            upward_or_downwards.append(upward_or_downward)
+            degrees.append(degree)
+
+    return upward_or_downwards, np.array(degrees)
 
 
 class TestCandlestickPattern(unittest.TestCase):
@@ -27,6 +49,111 @@ class TestCandlestickPattern(unittest.TestCase):
 
         self.assertEqual(top_or_bottom, "bottom")
 
+    def test_rolling_trend(self):
+        rng = np.random.default_rng(0)
+        closes = 5 + np.cumsum(rng.normal(0, 0.1, 500))
+        closes[rng.random(500) < 0.1] = np.nan
+        closes[100:110] = np.nan
+        volumes = rng.integers(10 ** 5, 10 ** 7, 500).astype(float)
+
+        for y, window in [(closes, 60), (closes, 7), (volumes, 7)]:
+            upward_or_downward, degree = rolling_trend(y, window)
+            expected_upward_or_downward, expected_degree = trends(y, window)
+
+            np.testing.assert_allclose(degree, expected_degree, rtol=1e-7, atol=1e-9)
+            self.assertEqual(upward_or_downward.tolist(), expected_upward_or_downward)
+
+    def test_rolling_slope_panel(self):
+        rng = np.random.default_rng(1)
+        panel = 5 + np.cumsum(rng.normal(0, 0.1, (3, 200)), axis=-1)
+        panel[rng.random((3, 200)) < 0.1] = np.nan
+        panel[2] = np.nan
+
+        slopes = rolling_slope(panel, 20, min_periods=2)
+
+        self.assertEqual(slopes.shape, (3, 200))
+        for i in range(3):
+            np.testing.assert_allclose(slopes[i], rolling_slope(panel[i], 20, min_periods=2))
+        self.assertTrue(np.isnan(slopes[2]).all())
+        self.assertFalse(np.isnan(slopes[0, 1:]).any())
+
+    def test_batch_upward_or_downward_trend(self):
+        rng = np.random.default_rng(2)
+        closes = 5 + np.cumsum(rng.normal(0, 0.1, (2000, 60)), axis=-1)
+
+        upward_or_downward, degree = batch_upward_or_downward_trend(closes)
+
+        for i in range(0, 2000, 50):
+            expected_upward_or_downward, expected_degree = is_upward_or_downward_trend(closes[i])
+            self.assertEqual(upward_or_downward[i], expected_upward_or_downward)
+            self.assertAlmostEqual(degree[i], expected_degree)
+
+        ragged = [[1.0, 2.0, np.nan, 4.0], [3.0, 2.5, 2.0], [1.0], []]
+        upward_or_downward, degree = batch_upward_or_downward_trend(ragged)
+        self.assertEqual(upward_or_downward.tolist(), ["upward", "downward", None, None])
+        self.assertAlmostEqual(degree[0], is_upward_or_downward_trend([1.0, 2.0, 4.0])[1])
+
+    def test_batch_market_top_or_bottom(self):
+        rng = np.random.default_rng(3)
+        closes = 5 + np.cumsum(rng.normal(0, 0.1, (500, 7)), axis=-1)
+        lows = closes - rng.random((500, 7)) / 10
+
+        top_or_bottom = batch_market_top_or_bottom(closes, lows)
+
+        expected = [is_market_top_or_bottom(close, low) for close, low in zip(closes, lows)]
+        self.assertEqual(top_or_bottom.tolist(), expected)
+        self.assertEqual(set(expected), {"top", "bottom", None})
+
+        ragged = batch_market_top_or_bottom([[1, 2, 3], [3, 2, 1], [1]], [[1, 2, 3], [3, 2, 1, np.nan], [1]])
+        self.assertEqual(ragged.tolist(), ["top", "bottom", None])
+
+    def test_monotonic_deque(self):
+        rng = np.random.default_rng(4)
+        values = rng.normal(size=300)
+        values[rng.random(300) < 0.2] = np.nan
+
+        maxima, minima = MonotonicDeque(5, mode="max"), MonotonicDeque(5, mode="min")
+        for i, value in enumerate(values):
+            maxima.push(value)
+            minima.push(value)
+            window = values[max(0, i - 4):i + 1]
+            if np.isnan(window).all():
+                self.assertTrue(np.isnan(maxima.value()))
+            else:
+                self.assertEqual(maxima.value(), np.nanmax(window))
+                self.assertEqual(minima.value(), np.nanmin(window))
+
+    def test_rolling_trend_streaming(self):
+        rng = np.random.default_rng(5)
+        closes = 5 + np.cumsum(rng.normal(0, 0.1, 1000))
+        closes[rng.random(1000) < 0.1] = np.nan
+
+        expected = rolling_slope(closes, 60)
+        rolling_trend_ = RollingTrend(60)
+        slopes = []
+        for close in closes:
+            rolling_trend_.push(close)
+            slopes.append(rolling_trend_.slope())
+
+        np.testing.assert_allclose(slopes, expected, rtol=1e-9, atol=1e-12)
+
+    def test_rolling_market_top_or_bottom(self):
+        rng = np.random.default_rng(6)
+        closes = 5 + np.cumsum(rng.normal(0, 0.1, 400))
+        lows = closes - rng.random(400) / 10
+
+        top_or_bottom = rolling_market_top_or_bottom(closes, lows, 7)
+
+        expected = [None] * 6 + [is_market_top_or_bottom(closes[i - 6:i + 1], lows[i - 6:i + 1])
+                                 for i in range(6, 400)]
+        self.assertEqual(top_or_bottom.tolist(), expected)
+
+        streaming = StreamingMarketTopOrBottom(7)
+        self.assertEqual([streaming.push(close, low) for close, low in zip(closes, lows)], expected)
+
+        panel = rolling_market_top_or_bottom(np.stack([closes, closes[::-1]]), np.stack([lows, lows[::-1]]), 7)
+        self.assertEqual(panel[0].tolist(), expected)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+
+import numpy as np
+
+from ta_indicator.trendln import break_masks, line_values, pivots, rolling_trendlines, trendlines, trendlines_panel
+
+
+def make_high_low(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 5 + np.cumsum(rng.normal(0, 0.1, n))
+
+    return close + rng.random(n) / 10, close - rng.random(n) / 10, close
+
+
+class TestTrendln(unittest.TestCase):
+
+    def test_pivots(self):
+        high, low, _ = make_high_low()
+
+        pivot_highs = pivots(high, order=5, mode="high")
+        pivot_lows = pivots(low, order=5, mode="low")
+
+        expected_highs = [5 <= i < 295 and high[i] == high[i - 5:i + 6].max() for i in range(300)]
+        expected_lows = [5 <= i < 295 and low[i] == low[i - 5:i + 6].min() for i in range(300)]
+        self.assertEqual(pivot_highs.tolist(), expected_highs)
+        self.assertEqual(pivot_lows.tolist(), expected_lows)
+        self.assertTrue(pivot_highs.any())
+
+        panel = pivots(np.stack([high, high[::-1]]), order=5)
+        self.assertEqual(panel[0].tolist(), expected_highs)
+
+    def test_trendlines(self):
+        high, low, _ = make_high_low()
+
+        lines = trendlines(high, low, order=5)
+
+        for name, y, mode, sign in [("support", low, "low", 1), ("resistance", high, "high", -1)]:
+            x = np.flatnonzero(pivots(y, order=5, mode=mode))
+            slope, intercept = lines[name]
+
+            # The line passes through the last pivot and all pivots lie on one side of it.
+            self.assertAlmostEqual(slope * x[-1] + intercept, y[x[-1]])
+            self.assertTrue((sign * (y[x] - (slope * x + intercept)) >= -1e-9).all())
+
+            # It is the steepest (flattest) such line through the last pivot, i.e., it touches another pivot.
+            slopes = (y[x[-1]] - y[x[:-1]]) / (x[-1] - x[:-1])
+            self.assertAlmostEqual(slope, slopes.max() if name == "support" else slopes.min())
+
+    def test_trendlines_window(self):
+        high, low, _ = make_high_low()
+
+        lines = trendlines(high, low, order=5, window=50)
+        expected = trendlines(high[-50:], low[-50:], order=5)
+
+        self.assertAlmostEqual(lines["support"][0], expected["support"][0])
+        self.assertAlmostEqual(lines["support"][1] + 250 * lines["support"][0], expected["support"][1])
+        self.assertEqual(trendlines(high[:5], low[:5]), {"support": None, "resistance": None})
+
+    def test_rolling_trendlines(self):
+        high, low, _ = make_high_low()
+
+        for window in [None, 50]:
+            lines = rolling_trendlines(high, low, order=5, window=window)
+
+            for i in range(300):
+                expected = trendlines(high[:i + 1], low[:i + 1], order=5, window=window)
+                for name in ["support", "resistance"]:
+                    if expected[name] is None:
+                        self.assertTrue(np.isnan(lines[name][i]).all())
+                    else:
+                        np.testing.assert_allclose(lines[name][i], expected[name])
+
+        # No line before two pivots are confirmed, order bars after them.
+        first_pivots = np.flatnonzero(pivots(low, order=5, mode="low"))[:2]
+        lines = rolling_trendlines(high, low, order=5)
+        self.assertTrue(np.isnan(lines["support"][:first_pivots[1] + 5]).all())
+        self.assertFalse(np.isnan(lines["support"][first_pivots[1] + 5]).any())
+
+    def test_break_masks(self):
+        close = np.array([1.0, 1.5, 2.5, 2.0, 0.5])
+        support = np.tile([0.0, 1.0], (5, 1))
+        resistance = np.tile([0.0, 2.0], (5, 1))
+        resistance[:2] = np.nan
+
+        breaks_support, breaks_resistance = break_masks(close, support, resistance)
+
+        self.assertEqual(breaks_support.tolist(), [False, False, False, False, True])
+        self.assertEqual(breaks_resistance.tolist(), [False, False, True, False, False])
+
+        # A bar crosses the line as of itself, even if the line changes.
+        support[4] = [1.0, -4.0]
+        self.assertEqual(break_masks(close, support, resistance)[0].tolist(), [False] * 5)
+
+    def test_break_masks_look_ahead(self):
+        high, low, close = make_high_low()
+
+        lines = rolling_trendlines(high, low, order=5)
+        breaks_support, breaks_resistance = break_masks(close, lines["support"], lines["resistance"])
+        self.assertTrue(breaks_support.any() and breaks_resistance.any())
+
+        # The masks of a bar do not change with later bars.
+        for m in [50, 150, 250]:
+            lines_m = rolling_trendlines(high[:m], low[:m], order=5)
+            masks_m = break_masks(close[:m], lines_m["support"], lines_m["resistance"])
+            self.assertEqual(masks_m[0].tolist(), breaks_support[:m].tolist())
+            self.assertEqual(masks_m[1].tolist(), breaks_resistance[:m].tolist())
+
+    def test_trendlines_panel(self):
+        highs, lows, closes = zip(*(make_high_low(seed=seed) for seed in range(3)))
+        highs, lows, closes = np.stack(highs), np.stack(lows), np.stack(closes)
+        highs[2], lows[2] = np.nan, np.nan
+
+        lines = trendlines_panel(highs, lows, order=5, window=100)
+        rolling_lines = rolling_trendlines(highs, lows, order=5, window=100)
+        breaks_support, breaks_resistance = break_masks(closes, rolling_lines["support"], rolling_lines["resistance"])
+
+        for i in range(2):
+            expected = trendlines(highs[i], lows[i], order=5, window=100)
+            np.testing.assert_allclose(lines["support"][i], expected["support"])
+            np.testing.assert_allclose(rolling_lines["support"][i, -1], expected["support"])
+            expected_lines = rolling_trendlines(highs[i], lows[i], order=5, window=100)
+            expected_masks = break_masks(closes[i], expected_lines["support"], expected_lines["resistance"])
+            self.assertEqual(breaks_support[i].tolist(), expected_masks[0].tolist())
+            self.assertEqual(breaks_resistance[i].tolist(), expected_masks[1].tolist())
+
+        self.assertTrue(np.isnan(lines["support"][2]).all())
+        self.assertFalse(breaks_support[2].any())
+        self.assertEqual(line_values(lines["support"], 300).shape, (3, 300))
+
+
+if __name__ == "__main__":
+    unittest.main()
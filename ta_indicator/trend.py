@@ -2,6 +2,8 @@
     Trend lines.
 """
 
+from collections import deque
+
 import numpy as np
 
 
@@ -50,3 +52,299 @@ def is_market_top_or_bottom(trend_y, y):
         top_or_bottom = "bottom"
 
     return top_or_bottom
+
+
+def _prefix_sum(a):
+    return np.concatenate([np.zeros(a.shape[:-1] + (1,)), np.cumsum(a, axis=-1)], axis=-1)
+
+
+def rolling_slope(y, window, min_periods=None):
+    """
+        Rolling slopes of a 1st order linear model y = ax + b fitted to each window of values along the last axis
+        (prices or volumes of a series, or of a ticker x date panel), the same slopes as is_upward_or_downward_trend
+        of the window.
+
+        NaN values are dropped as the callers of is_upward_or_downward_trend do, i.e., x counts the non-NaN values only.
+        The slopes are computed in closed form from running sums of x, x^2, y and xy, in O(n) for all windows.
+
+    :param y:                       values, the last axis being dates
+    :param window:                  number of values of a window
+    :param min_periods:             minimal number of values (NaN or not) of a window at the start, defaults to window
+    :return:                        slopes, NaN if a window has fewer than min_periods values or 2 non-NaN values
+    """
+    if min_periods is None:
+        min_periods = window
+
+    y = np.asarray(y, dtype=float)
+    valid = ~np.isnan(y)
+    n = y.shape[-1]
+
+    # Centre x and y before summing, as slopes are invariant to shifts and centred sums lose less precision.
+    x = np.cumsum(valid, axis=-1) - (n + 1) / 2
+    y = np.where(valid, y, 0)
+    y0 = y.sum(axis=-1, keepdims=True) / np.maximum(valid.sum(axis=-1, keepdims=True), 1)
+    x = np.where(valid, x, 0)
+    y = np.where(valid, y - y0, 0)
+
+    ends = np.arange(1, n + 1)
+    starts = np.maximum(0, ends - window)
+
+    def window_sum(a):
+        prefix_sum = _prefix_sum(a)
+        return prefix_sum[..., ends] - prefix_sum[..., starts]
+
+    m = window_sum(valid.astype(float))
+    sx, sxx, sy, sxy = window_sum(x), window_sum(x * x), window_sum(y), window_sum(x * y)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (m * sxy - sx * sy) / (m * sxx - sx * sx)
+
+    return np.where((m >= 2) & (ends - starts >= min_periods), slope, np.nan)
+
+
+def rolling_trend(y, window, min_periods=None):
+    """
+        Rolling trends of each window of values along the last axis, see rolling_slope.
+
+    :return:                        "upward"/"downward" (None if the slope is NaN) and degree arrays
+    """
+    degree = np.degrees(np.arctan(rolling_slope(y, window, min_periods=min_periods)))
+
+    upward_or_downward = np.where(degree > 0, "upward", "downward").astype(object)
+    upward_or_downward[np.isnan(degree)] = None
+
+    return upward_or_downward, degree
+
+
+def batch_array(ys):
+    """
+        A (batch x n) float array of a 2-D array or a ragged batch of lists, NaN-padded at the end.
+    """
+    if isinstance(ys, np.ndarray):
+        return np.atleast_2d(ys.astype(float))
+
+    ys = [np.asarray(y, dtype=float) for y in ys]
+    batch = np.full((len(ys), max((len(y) for y in ys), default=0)), np.nan)
+    for i, y in enumerate(ys):
+        batch[i, :len(y)] = y
+
+    return batch
+
+
+def batch_upward_or_downward_trend(ys):
+    """
+        is_upward_or_downward_trend of a batch of value lists (a 2-D array or a ragged batch), all slopes fitted in one
+        pass. NaN values are dropped, i.e., x counts the non-NaN values of each list only.
+
+    :return:                        "upward"/"downward" (None if a list has fewer than 2 non-NaN values) and degree
+                                    arrays
+    """
+    y = batch_array(ys)
+    valid = ~np.isnan(y)
+    m = valid.sum(axis=-1, keepdims=True)
+
+    x = np.where(valid, np.cumsum(valid, axis=-1), 0)
+    y = np.where(valid, y, 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx = np.where(valid, x - x.sum(axis=-1, keepdims=True) / m, 0)
+        dy = np.where(valid, y - y.sum(axis=-1, keepdims=True) / m, 0)
+        slope = (dx * dy).sum(axis=-1) / (dx * dx).sum(axis=-1)
+
+    slope[m[:, 0] < 2] = np.nan
+    degree = np.degrees(np.arctan(slope))
+
+    upward_or_downward = np.where(degree > 0, "upward", "downward").astype(object)
+    upward_or_downward[np.isnan(degree)] = None
+
+    return upward_or_downward, degree
+
+
+def batch_market_top_or_bottom(trend_ys, ys):
+    """
+        is_market_top_or_bottom of a batch of value lists (2-D arrays or ragged batches), where the last value of a list
+        is its last non-NaN value.
+
+    :return:                        "top"/"bottom"/None array
+    """
+    upward_or_downward, _ = batch_upward_or_downward_trend(trend_ys)
+
+    y = batch_array(ys)
+    valid = ~np.isnan(y)
+    n = y.shape[-1]
+
+    last = n - 1 - valid[:, ::-1].argmax(axis=-1)
+    last_y = y[np.arange(len(y)), last]
+    previous = valid & (np.arange(n) < last[:, np.newaxis])
+    has_previous = previous.any(axis=-1)
+
+    is_top = (upward_or_downward == "upward") & has_previous & \
+        (last_y >= np.where(previous, y, -np.inf).max(axis=-1, initial=-np.inf))
+    is_bottom = (upward_or_downward == "downward") & has_previous & \
+        (last_y <= np.where(previous, y, np.inf).min(axis=-1, initial=np.inf))
+
+    top_or_bottom = np.full(len(y), None, dtype=object)
+    top_or_bottom[is_top] = "top"
+    top_or_bottom[is_bottom] = "bottom"
+
+    return top_or_bottom
+
+
+class MonotonicDeque:
+    """
+        The maximum (or minimum) of the last size values pushed, in amortized O(1) per value. NaN values are skipped.
+    """
+
+    def __init__(self, size, mode="max"):
+        self.size = size
+        self.mode = mode
+
+        self.i = 0
+        self._deque = deque()
+
+    def _dominates(self, a, b):
+        return a >= b if self.mode == "max" else a <= b
+
+    def push(self, value):
+        if not np.isnan(value):
+            while self._deque and self._dominates(value, self._deque[-1][1]):
+                self._deque.pop()
+            self._deque.append((self.i, value))
+        self.i += 1
+
+        while self._deque and self._deque[0][0] <= self.i - 1 - self.size:
+            self._deque.popleft()
+
+    def value(self):
+        """
+            The maximum (or minimum) of the window, NaN if the window holds no values.
+        """
+        return self._deque[0][1] if self._deque else np.nan
+
+
+class RollingTrend:
+    """
+        The trend of the last window values pushed, see rolling_trend, updated with running sums in O(1) per value.
+    """
+
+    def __init__(self, window):
+        self.window = window
+
+        self.n = 0
+        self._values = deque()
+        self._x = 0
+        self._sums = np.zeros(5)
+
+    def _terms(self, x, y):
+        return np.array([1.0, x, x * x, y, x * y])
+
+    def push(self, value):
+        value = float(value)
+        if not np.isnan(value):
+            self._x += 1
+            self._sums += self._terms(self._x, value)
+        self._values.append((self._x, value))
+        self.n += 1
+
+        if len(self._values) > self.window:
+            x, y = self._values.popleft()
+            if not np.isnan(y):
+                self._sums -= self._terms(x, y)
+
+        # Recompute the sums from the window now and then, so that rounding errors do not build up.
+        if self.n % self.window == 0:
+            x0 = self._values[0][0]
+            self._values = deque((x - x0, y) for x, y in self._values)
+            self._x -= x0
+            self._sums = sum((self._terms(x, y) for x, y in self._values if not np.isnan(y)), np.zeros(5))
+
+    def slope(self):
+        """
+            The slope of the window, NaN if it has fewer than window values or 2 non-NaN values.
+        """
+        m, sx, sxx, sy, sxy = self._sums
+        if len(self._values) < self.window or m < 2:
+            return np.nan
+
+        return (m * sxy - sx * sy) / (m * sxx - sx * sx)
+
+    def trend(self):
+        """
+            "upward"/"downward" (None if the slope is NaN) and degree of the window.
+        """
+        degree = np.degrees(np.arctan(self.slope()))
+        if np.isnan(degree):
+            return None, degree
+
+        return "upward" if degree > 0 else "downward", degree
+
+    def to_dict(self):
+        return {"window": self.window, "n": self.n, "x": self._x, "values": [list(value) for value in self._values]}
+
+    @classmethod
+    def from_dict(cls, state):
+        rolling_trend_ = cls(state["window"])
+        rolling_trend_.n = state["n"]
+        rolling_trend_._x = state["x"]
+        rolling_trend_._values = deque((x, y) for x, y in state["values"])
+        rolling_trend_._sums = sum((rolling_trend_._terms(x, y) for x, y in rolling_trend_._values if not np.isnan(y)),
+                                   np.zeros(5))
+
+        return rolling_trend_
+
+
+class StreamingMarketTopOrBottom:
+    """
+        is_market_top_or_bottom of the last window bars, updated one bar at a time for live use.
+    """
+
+    def __init__(self, window):
+        self.window = window
+
+        self.trend = RollingTrend(window)
+        self._max = MonotonicDeque(window - 1, mode="max")
+        self._min = MonotonicDeque(window - 1, mode="min")
+
+    def push(self, trend_value, value):
+        """
+            Push a new bar and return whether it is a market "top", "bottom" or None.
+        """
+        self.trend.push(trend_value)
+        upward_or_downward, _ = self.trend.trend()
+        previous_max, previous_min = self._max.value(), self._min.value()
+
+        self._max.push(value)
+        self._min.push(value)
+
+        if upward_or_downward == "upward" and value >= previous_max:
+            return "top"
+        if upward_or_downward == "downward" and value <= previous_min:
+            return "bottom"
+
+        return None
+
+
+def rolling_market_top_or_bottom(trend_y, y, window):
+    """
+        is_market_top_or_bottom of each window of bars along the last axis, in O(n): trends come from rolling_trend and
+        the extremes of the previous window - 1 values from monotonic deques. NaN values are dropped.
+
+    :return:                        "top"/"bottom"/None array
+    """
+    upward_or_downward, _ = rolling_trend(trend_y, window)
+    y = np.asarray(y, dtype=float)
+
+    top_or_bottom = np.full(y.shape, None, dtype=object)
+    for index in np.ndindex(y.shape[:-1]):
+        maxima, minima = MonotonicDeque(window - 1, mode="max"), MonotonicDeque(window - 1, mode="min")
+        for i, value in enumerate(y[index]):
+            previous_max, previous_min = maxima.value(), minima.value()
+            maxima.push(value)
+            minima.push(value)
+
+            if upward_or_downward[index + (i,)] == "upward" and value >= previous_max:
+                top_or_bottom[index + (i,)] = "top"
+            elif upward_or_downward[index + (i,)] == "downward" and value <= previous_min:
+                top_or_bottom[index + (i,)] = "bottom"
+
+    return top_or_bottom
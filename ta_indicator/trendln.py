@@ -0,0 +1,178 @@
+"""
+    Support and resistance trend lines.
+
+    Pivot highs (lows) are bars whose high (low) is the maximum (minimum) of the order bars on each side. The resistance
+    line is the last edge of the upper convex hull of pivot highs and the support line the last edge of the lower convex
+    hull of pivot lows, i.e., the lines through the most recent pivot that all pivots lie below (above). The hulls are
+    built with Andrew's monotone chain in O(k) for k pivots sorted by bar, instead of checking all pivot pairs.
+
+    A line is (slope, intercept) over bar indices, its value at bar i is slope * i + intercept.
+
+    A pivot is only known order bars after it, so lines fitted on the pivots of a whole history (trendlines) are not
+    known at its earlier bars. Signals use the lines as of each bar (rolling_trendlines), fitted on the pivots
+    confirmed by that bar only.
+
+    reference:
+        https://github.com/GregoryMorse/trendln
+        https://en.wikibooks.org/wiki/Algorithm_Implementation/Geometry/Convex_hull/Monotone_chain
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def pivots(y, order=5, mode="high"):
+    """
+        Pivot highs (mode="high") or lows (mode="low") along the last axis: y[i] is the maximum (minimum) of
+        y[i - order:i + order + 1]. The first and last order bars cannot be pivots.
+
+    :return:                        boolean mask of y's shape
+    """
+    y = np.asarray(y, dtype=float)
+    mask = np.zeros(y.shape, dtype=bool)
+    if y.shape[-1] < 2 * order + 1:
+        return mask
+
+    windows = sliding_window_view(y, 2 * order + 1, axis=-1)
+    with np.errstate(invalid="ignore"):
+        extremum = windows.max(axis=-1) if mode == "high" else windows.min(axis=-1)
+    mask[..., order:y.shape[-1] - order] = y[..., order:y.shape[-1] - order] == extremum
+
+    return mask
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def hull_line(x, y, mode="support"):
+    """
+        The last edge of the lower (support) or upper (resistance) convex hull of points sorted by x.
+
+    :return:                        (slope, intercept), or None if there are fewer than 2 points
+    """
+    hull = []
+    for point in zip(x, y):
+        # The lower hull turns counter-clockwise, the upper hull clockwise.
+        while len(hull) >= 2 and (_cross(hull[-2], hull[-1], point) <= 0 if mode == "support"
+                                  else _cross(hull[-2], hull[-1], point) >= 0):
+            hull.pop()
+        hull.append(point)
+
+    if len(hull) < 2:
+        return None
+
+    (x0, y0), (x1, y1) = hull[-2], hull[-1]
+    slope = (y1 - y0) / (x1 - x0)
+
+    return slope, y1 - slope * x1
+
+
+def trendlines(high, low, order=5, window=None):
+    """
+        Support and resistance lines of a stock from the pivots of its last window bars (all bars by default), as of
+        its last bar. They are not known at earlier bars, see rolling_trendlines.
+
+    :param high:                    high prices
+    :param low:                     low prices
+    :param order:                   number of bars on each side of a pivot
+    :param window:                  number of recent bars to find pivots in
+    :return:                        {"support": line, "resistance": line}, a line being (slope, intercept) or None
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    start = 0 if window is None else max(0, len(high) - window)
+
+    x_high = start + np.flatnonzero(pivots(high[start:], order=order, mode="high"))
+    x_low = start + np.flatnonzero(pivots(low[start:], order=order, mode="low"))
+
+    return {"support": hull_line(x_low, low[x_low], mode="support"),
+            "resistance": hull_line(x_high, high[x_high], mode="resistance")}
+
+
+def trendlines_panel(high, low, order=5, window=None):
+    """
+        trendlines of each ticker of (ticker x date) high and low arrays, e.g., PricePanel fields.
+
+    :return:                        {"support": (ticker x 2) array, "resistance": (ticker x 2) array} of slopes and
+                                    intercepts, NaN where a ticker has no line
+    """
+    lines = {"support": np.full((len(high), 2), np.nan), "resistance": np.full((len(high), 2), np.nan)}
+    for i in range(len(high)):
+        for name, line in trendlines(high[i], low[i], order=order, window=window).items():
+            if line is not None:
+                lines[name][i] = line
+
+    return lines
+
+
+def line_values(line, n):
+    """
+        Values of a line at bars 0 .. n - 1 (NaN if line is None), or of (ticker x 2) lines as a (ticker x n) array.
+    """
+    if line is None:
+        return np.full(n, np.nan)
+
+    line = np.asarray(line, dtype=float)
+
+    return line[..., 0, np.newaxis] * np.arange(n) + line[..., 1, np.newaxis]
+
+
+def rolling_trendlines(high, low, order=5, window=None):
+    """
+        Support and resistance lines as of each bar along the last axis, i.e., trendlines(high[:i + 1], low[:i + 1],
+        order, window) at bar i, fitted on the pivots confirmed by bar i only. Hulls are rebuilt only when the pivots
+        change: a new pivot is confirmed or the oldest one leaves the window.
+
+    :return:                        {"support": lines, "resistance": lines}, lines being a (... x n x 2) array of the
+                                    slopes and intercepts as of each bar, NaN where there is no line
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    n = high.shape[-1]
+    bars = np.arange(n)
+    # The pivots of the bars [start, i] are the pivots in [start + order, i - order].
+    starts = np.zeros(n, dtype=int) if window is None else np.maximum(0, bars - window + 1)
+    first = starts + order
+    last = bars - order
+
+    lines = {"support": np.full(high.shape + (2,), np.nan), "resistance": np.full(high.shape + (2,), np.nan)}
+    for name, y, mode in [("support", low, "low"), ("resistance", high, "high")]:
+        for index in np.ndindex(y.shape[:-1]):
+            x = np.flatnonzero(pivots(y[index], order=order, mode=mode))
+            lo = np.searchsorted(x, first, side="left")
+            hi = np.searchsorted(x, last, side="right")
+
+            line, previous = None, None
+            for i in range(n):
+                if (lo[i], hi[i]) != previous:
+                    previous = (lo[i], hi[i])
+                    line = hull_line(x[lo[i]:hi[i]], y[index][x[lo[i]:hi[i]]], mode=name)
+                if line is not None:
+                    lines[name][index + (i,)] = line
+
+    return lines
+
+
+def break_masks(close, support, resistance):
+    """
+        Bars where the close breaks below the support line or above the resistance line as of the bar, i.e., crosses it
+        from the previous bar. Lines are those of rolling_trendlines, so that a bar only uses pivots confirmed by it.
+
+    :return:                        breaks_support, breaks_resistance boolean masks of close's shape
+    """
+    close = np.asarray(close, dtype=float)
+    bars = np.arange(close.shape[-1])
+
+    def values(lines, x):
+        return lines[..., 0] * x + lines[..., 1]
+
+    breaks_support = np.zeros(close.shape, dtype=bool)
+    breaks_resistance = np.zeros(close.shape, dtype=bool)
+    with np.errstate(invalid="ignore"):
+        breaks_support[..., 1:] = (close[..., 1:] < values(support, bars)[..., 1:]) & \
+            (close[..., :-1] >= values(support, bars - 1)[..., 1:])
+        breaks_resistance[..., 1:] = (close[..., 1:] > values(resistance, bars)[..., 1:]) & \
+            (close[..., :-1] <= values(resistance, bars - 1)[..., 1:])
+
+    return breaks_support, breaks_resistance
@@ -0,0 +1,175 @@
+"""
+    Split and dividend adjustment.
+
+    Cumulative adjustment factors are built from the split and dividend data downloaded by get_stock_data, for all
+    stocks of a long panel in one vectorized pass:
+
+        - a split with ratio r = numerator / denominator (splitRatio "2:1") on date d divides prices before d by r and
+          multiplies volumes before d by r;
+        - a dividend D with ex-date d multiplies prices before d by 1 - D / close, where close is the last close
+          before d.
+
+    The factor of a bar is the product of the factors of all corporate actions after it.
+"""
+
+import numpy as np
+import pandas as pd
+
+ADJUSTED_COLUMNS = ["open", "high", "low", "close"]
+
+
+def split_ratios(splits_df):
+    """
+        Split ratios from splitRatio, e.g., "2:1" -> 2.0, or from numeric ratios.
+    """
+    ratio = splits_df["splitRatio"]
+    if not pd.api.types.is_numeric_dtype(ratio):
+        ratio = ratio.str.split(":", expand=True).astype(float)
+        ratio = ratio[0] / ratio[1]
+
+    return ratio.astype(float)
+
+
+def _group_keys(df):
+    if "ticker" in df.columns:
+        return df["ticker"].astype(str).str.upper()
+
+    return pd.Series("", index=df.index)
+
+
+def _check_group_keys(price_df, *action_dfs):
+    """
+        Raise a ValueError unless the price df and the corporate action frames all have a ticker column or none has:
+        otherwise no corporate action matches a bar and the adjustment would be skipped silently.
+    """
+    has_ticker = "ticker" in price_df.columns
+    for action_df in action_dfs:
+        if action_df is not None and not action_df.empty and ("ticker" in action_df.columns) != has_ticker:
+            raise ValueError("The price df and the corporate action frames must all have a ticker column or none.")
+
+
+def _actions_df(dividend_df, splits_df):
+    """
+        Corporate actions: ticker, date, split (price factor of a split) and dividend.
+    """
+    actions = list()
+    if splits_df is not None and not splits_df.empty:
+        actions.append(pd.DataFrame({"ticker": _group_keys(splits_df).values,
+                                     "date": pd.to_datetime(splits_df["date"]).values,
+                                     "split": 1 / split_ratios(splits_df).values,
+                                     "dividend": 0.0}))
+    if dividend_df is not None and not dividend_df.empty:
+        actions.append(pd.DataFrame({"ticker": _group_keys(dividend_df).values,
+                                     "date": pd.to_datetime(dividend_df["date"]).values,
+                                     "split": 1.0,
+                                     "dividend": dividend_df["dividend"].astype(float).values}))
+
+    if not actions:
+        return pd.DataFrame({"ticker": pd.Series(dtype=str),
+                             "date": pd.Series(dtype="datetime64[ns]"),
+                             "split": pd.Series(dtype=float),
+                             "dividend": pd.Series(dtype=float)})
+
+    return pd.concat(actions, ignore_index=True).sort_values(by="date", kind="stable").reset_index(drop=True)
+
+
+def adjustment_factors(price_df, dividend_df=None, splits_df=None):
+    """
+        Cumulative adjustment factors of every bar of a price df (one stock or a long panel with a ticker column).
+
+    :return:                        (price_factor, split_factor) Series aligned to price_df. Adjusted prices are
+                                    prices * price_factor, adjusted volumes are volume / split_factor.
+    """
+    _check_group_keys(price_df, dividend_df, splits_df)
+
+    bars = pd.DataFrame({"ticker": _group_keys(price_df).values,
+                         "date": pd.to_datetime(price_df["date"]).values,
+                         "close": price_df["close"].astype(float).values,
+                         "row": np.arange(len(price_df))})
+    bars = bars.sort_values(by="date", kind="stable")
+
+    # The bar each corporate action applies to: the last bar before the action date.
+    actions = pd.merge_asof(_actions_df(dividend_df, splits_df), bars, on="date", by="ticker",
+                            direction="backward", allow_exact_matches=False)
+    actions = actions.dropna(subset=["row"])
+
+    dividend_factor = 1 - actions["dividend"] / actions["close"]
+    actions = actions.assign(price=actions["split"] * dividend_factor.where(actions["dividend"] > 0, 1.0))
+    events = actions.groupby(actions["row"].astype(int))[["price", "split"]].prod()
+
+    factors = pd.DataFrame({"price": 1.0, "split": 1.0}, index=np.arange(len(price_df)))
+    factors.loc[events.index, ["price", "split"]] = events.values
+
+    # The factor of a bar applies to the bar and all earlier bars: a reversed cumulative product within each stock.
+    bars = bars.sort_values(by=["ticker", "date"], kind="stable")
+    ordered = factors.loc[bars["row"].values].iloc[::-1]
+    cumulative = ordered.groupby(bars["ticker"].values[::-1]).cumprod().sort_index()
+
+    return cumulative["price"].set_axis(price_df.index), cumulative["split"].set_axis(price_df.index)
+
+
+def adjust_price_df(price_df, dividend_df=None, splits_df=None):
+    """
+        Adjust open, high, low, close for splits and dividends and volume for splits, for one stock or a long panel.
+        A total_return column is added: the adjusted close relative to the first adjusted close of the stock.
+    """
+    price_factor, split_factor = adjustment_factors(price_df, dividend_df, splits_df)
+
+    df = price_df.copy()
+    for column in ADJUSTED_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column] * price_factor
+    if "volume" in df.columns:
+        df["volume"] = df["volume"] / split_factor
+
+    df["factor"] = price_factor
+    df["total_return"] = df["close"] / df["close"].groupby(_group_keys(df)).transform("first")
+
+    return df
+
+
+def actions_version(dividend_df=None, splits_df=None):
+    """
+        A version of the corporate actions of a stock, which changes when a corporate action lands.
+    """
+    actions = _actions_df(dividend_df, splits_df)
+
+    return int(pd.util.hash_pandas_object(actions, index=False).sum()), actions["date"].max()
+
+
+class AdjustmentCache:
+    """
+        Adjusted price dfs per stock, recomputed only when a new corporate action lands. New bars after the cached ones
+        are appended with a factor of 1, as no corporate action follows them.
+    """
+
+    def __init__(self):
+        self._cache = dict()
+
+    def adjust(self, stock_code, price_df, dividend_df=None, splits_df=None):
+        version, last_action_date = actions_version(dividend_df, splits_df)
+
+        cached = self._cache.get(stock_code)
+        if cached is not None and cached[0] == version:
+            adjusted_df = cached[1]
+            last_date = pd.to_datetime(adjusted_df["date"]).max()
+
+            if pd.isnull(last_action_date) or last_action_date <= last_date:
+                # The last cached bar is adjusted again, as it may have been revised.
+                dates = pd.to_datetime(price_df["date"])
+                adjusted_df = adjusted_df[pd.to_datetime(adjusted_df["date"]) < last_date]
+                new_df = price_df[dates >= last_date].copy()
+
+                first_close = pd.concat([adjusted_df["close"], new_df["close"]]).dropna().iloc[0]
+                new_df["factor"] = 1.0
+                new_df["total_return"] = new_df["close"] / first_close
+
+                adjusted_df = pd.concat([adjusted_df, new_df], ignore_index=True)
+                self._cache[stock_code] = (version, adjusted_df)
+
+                return adjusted_df
+
+        adjusted_df = adjust_price_df(price_df, dividend_df, splits_df)
+        self._cache[stock_code] = (version, adjusted_df)
+
+        return adjusted_df
@@ -2,12 +2,22 @@
     Download asx short sell data from https://www.asx.com.au/data/shortsell.txt.
 """
 
+import argparse
+import glob
+import io
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime
 
+import numpy as np
 import pandas as pd
 import requests
 
+from ta_stock_market_data.short_interest import ShortInterestStore
+
+COLUMNS = ["asx_code", "company_name", "product_class", "reported_gross_short_sells", "issued_capital", "percentage"]
+
 
 def get_asx_short_sell(url="https://www.asx.com.au/data/shortsell.txt"):
     """
@@ -24,55 +34,104 @@ def get_asx_short_sell(url="https://www.asx.com.au/data/shortsell.txt"):
     return resp.status_code
 
 
-def transform_asx_short_sell(short_sell_date):
+def parse_asx_short_sell(content):
     """
-            Transform the ASX short sell data of the given day from txt to csv.
+        Parse the content (bytes) of an ASX short sell txt file into its date (yyyymmdd) and a df.
+
+        The fixed-width columns are split in bulk: rows are decoded into a NumPy string array and sliced at the
+        beginning and the end of "product_class" by characters, so that non-ASCII company names do not shift the
+        columns, then the numeric columns are parsed by pandas in one pass.
     """
-    txt_filename = 'data/asx_short_sell/txt/asx_short_sell_{date}.txt'.format(date=short_sell_date)
+    lines = content.splitlines()
 
-    columns = ["asx_code", "company_name", "product_class", "reported_gross_short_sells", "issued_capital",
-               "percentage"]
+    # Read first row and extract date, re-formatted.
+    short_sell_date = datetime.strptime(re.search(r"\d{2}-\w{3}-\d{4}", lines[0].decode("utf-8")).group(),
+                                        "%d-%b-%Y").strftime("%Y%m%d")
 
-    with open(txt_filename, 'rb') as f:
-        # Read first row and extract date.
-        row = f.readline().decode("utf-8")
-        # Re-format the date.
-        today = datetime.strptime(re.search(r"\d{2}-\w{3}-\d{4}", row).group(), "%d-%b-%Y").strftime("%Y%m%d")
+    # Skip next 7 rows and blank rows.
+    rows = np.char.decode(np.array(lines[8:], dtype=bytes), "utf-8") if len(lines) > 8 else np.array([], dtype=str)
+    rows = rows[np.char.strip(rows) != ""]
 
-        # Skip next 7 rows.
-        for _ in range(7):
-            next(f)
+    if len(rows) == 0:
+        return short_sell_date, pd.DataFrame(columns=COLUMNS)
 
-        df = list()
-        for row in f:
-            row = row.decode("utf-8")
-            # Each row is split at the beginning and the end of "product_class".
-            left_row = row[:42]
-            mid_row = row[42:53]
-            right_row = row[53:]
+    # Pad rows to a common width and view them as a (row x character) array.
+    width = max(rows.dtype.itemsize // np.dtype("U1").itemsize, 54)
+    chars = rows.astype("U{width}".format(width=width)).view("U1").reshape(len(rows), width)
 
-            asx_code, company_name = left_row.split(" ", 1)
-            company_name = company_name.strip()
-            product_class = mid_row.strip()
+    def column(start, stop):
+        return np.ascontiguousarray(chars[:, start:stop]).view("U{n}".format(n=stop - start)).ravel()
 
-            reported_gross_short_sells, issued_capital, percentage = right_row.split()
-            reported_gross_short_sells = int(reported_gross_short_sells.replace(",", ""))
-            issued_capital = int(issued_capital.replace(",", ""))
-            percentage = float(percentage)
+    left_rows = column(0, 42)
+    mid_rows = column(42, 53)
+    right_rows = column(53, width)
 
-            values = [asx_code, company_name, product_class, reported_gross_short_sells, issued_capital, percentage]
+    asx_code, _, company_name = np.char.partition(left_rows, " ").T
+    numbers = pd.read_csv(io.StringIO("\n".join(np.char.replace(right_rows, ",", ""))),
+                          sep=r"\s+",
+                          header=None,
+                          names=COLUMNS[3:],
+                          dtype={"reported_gross_short_sells": "int64", "issued_capital": "int64",
+                                 "percentage": "float64"})
 
-            df.append(dict(zip(columns, values)))
+    df = pd.DataFrame({
+        "asx_code": asx_code,
+        "company_name": np.char.strip(company_name),
+        "product_class": np.char.strip(mid_rows),
+    })
+    df = pd.concat([df, numbers], axis="columns")
 
-        df = pd.DataFrame(df)
+    return short_sell_date, df
 
-        csv_filename = 'data/asx_short_sell/csv/asx_short_sell_{date}.csv'.format(date=today)
-        df.to_csv(csv_filename, header=True, index=False)
 
+def transform_asx_short_sell(short_sell_date, txt_path="data/asx_short_sell/txt", csv_path="data/asx_short_sell/csv"):
+    """
+            Transform the ASX short sell data of the given day from txt to csv.
+    """
+    txt_filename = os.path.join(txt_path, "asx_short_sell_{date}.txt".format(date=short_sell_date))
 
-if __name__ == "__main__":
-    # Get today's daily short sell data.
-    get_asx_short_sell()
+    with open(txt_filename, 'rb') as f:
+        today, df = parse_asx_short_sell(f.read())
 
-    # Transform today's daily short sell data, from txt to csv.
-    transform_asx_short_sell(date.today().strftime("%Y%m%d"))
+    csv_filename = os.path.join(csv_path, "asx_short_sell_{date}.csv".format(date=today))
+    df.to_csv(csv_filename, header=True, index=False)
+
+    return csv_filename
+
+
+def backfill_asx_short_sell(txt_path="data/asx_short_sell/txt", csv_path="data/asx_short_sell/csv",
+                            max_workers=None):
+    """
+        Transform all ASX short sell txt files in txt_path to csv in parallel, e.g., to rebuild the history after a
+        format fix.
+    """
+    short_sell_dates = sorted(re.search(r"asx_short_sell_(\d{8})\.txt$", txt_filename).group(1)
+                              for txt_filename in glob.glob(os.path.join(txt_path, "asx_short_sell_*.txt")))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        csv_filenames = list(executor.map(transform_asx_short_sell,
+                                          short_sell_dates,
+                                          [txt_path] * len(short_sell_dates),
+                                          [csv_path] * len(short_sell_dates)))
+
+    return csv_filenames
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download and transform ASX short sell data.")
+    parser.add_argument("command", nargs="?", default="daily", choices=["daily", "backfill"])
+    parser.add_argument("--max-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.command == "backfill":
+        # Re-transform all downloaded daily short sell data, from txt to csv.
+        backfill_asx_short_sell(max_workers=args.max_workers)
+    else:
+        # Get today's daily short sell data.
+        get_asx_short_sell()
+
+        # Transform today's daily short sell data, from txt to csv.
+        csv_filename = transform_asx_short_sell(date.today().strftime("%Y%m%d"))
+
+        # Append today's daily short sell data to the short interest store.
+        ShortInterestStore().ingest(csv_filename)
@@ -0,0 +1,117 @@
+"""
+    Exchange holiday calendars.
+
+    asx:    ASX holidays from rules: New Year's Day, Australia Day, Good Friday, Easter Monday, Anzac Day, King's
+            (Queen's) Birthday, Christmas Day and Boxing Day, moved to the next weekday when they fall on a weekend
+            (except Anzac Day).
+    hs:     Shanghai and Shenzhen holidays. Spring Festival, Qingming, Dragon Boat, Mid-Autumn and Golden Week follow
+            the lunar calendar and the closures announced by the exchanges each December, so they are listed by
+            year; HS_HOLIDAYS must be extended with each announcement.
+
+    The exchange of a stock is given by the suffix of its ticker, e.g., TLS.AX -> asx, 600000.SS -> hs.
+"""
+
+import pandas as pd
+from pandas.tseries.holiday import (AbstractHolidayCalendar, DateOffset, EasterMonday, GoodFriday, Holiday, MO,
+                                    next_monday, next_monday_or_tuesday)
+
+
+class AsxHolidayCalendar(AbstractHolidayCalendar):
+    """
+        ASX holidays.
+    """
+
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=next_monday),
+        Holiday("Australia Day", month=1, day=26, observance=next_monday),
+        GoodFriday,
+        EasterMonday,
+        Holiday("Anzac Day", month=4, day=25),
+        Holiday("King's Birthday", month=6, day=8, offset=DateOffset(weekday=MO(1))),
+        Holiday("Christmas Day", month=12, day=25, observance=next_monday),
+        Holiday("Boxing Day", month=12, day=26, observance=next_monday_or_tuesday),
+    ]
+
+
+# Weekdays on which the Shanghai and Shenzhen stock exchanges are closed.
+HS_HOLIDAYS = {
+    2020: ["2020-01-01", "2020-01-24", "2020-01-27", "2020-01-28", "2020-01-29", "2020-01-30", "2020-01-31",
+           "2020-04-06", "2020-05-01", "2020-05-04", "2020-05-05", "2020-06-25", "2020-06-26", "2020-10-01",
+           "2020-10-02", "2020-10-05", "2020-10-06", "2020-10-07", "2020-10-08"],
+    2021: ["2021-01-01", "2021-02-11", "2021-02-12", "2021-02-15", "2021-02-16", "2021-02-17", "2021-04-05",
+           "2021-05-03", "2021-05-04", "2021-05-05", "2021-06-14", "2021-09-20", "2021-09-21", "2021-10-01",
+           "2021-10-04", "2021-10-05", "2021-10-06", "2021-10-07"],
+    2022: ["2022-01-03", "2022-01-31", "2022-02-01", "2022-02-02", "2022-02-03", "2022-02-04", "2022-04-04",
+           "2022-04-05", "2022-05-02", "2022-05-03", "2022-05-04", "2022-06-03", "2022-09-12", "2022-10-03",
+           "2022-10-04", "2022-10-05", "2022-10-06", "2022-10-07"],
+    2023: ["2023-01-02", "2023-01-23", "2023-01-24", "2023-01-25", "2023-01-26", "2023-01-27", "2023-04-05",
+           "2023-05-01", "2023-05-02", "2023-05-03", "2023-06-22", "2023-06-23", "2023-09-29", "2023-10-02",
+           "2023-10-03", "2023-10-04", "2023-10-05", "2023-10-06"],
+    2024: ["2024-01-01", "2024-02-09", "2024-02-12", "2024-02-13", "2024-02-14", "2024-02-15", "2024-02-16",
+           "2024-04-04", "2024-04-05", "2024-05-01", "2024-05-02", "2024-05-03", "2024-06-10", "2024-09-16",
+           "2024-09-17", "2024-10-01", "2024-10-02", "2024-10-03", "2024-10-04", "2024-10-07"],
+    2025: ["2025-01-01", "2025-01-28", "2025-01-29", "2025-01-30", "2025-01-31", "2025-02-03", "2025-02-04",
+           "2025-04-04", "2025-05-01", "2025-05-02", "2025-05-05", "2025-06-02", "2025-10-01", "2025-10-02",
+           "2025-10-03", "2025-10-06", "2025-10-07", "2025-10-08"],
+}
+
+# Ticker suffix: exchange.
+TICKER_MARKETS = {
+    "ax": "asx",
+    "ss": "hs",
+    "sz": "hs",
+}
+
+
+def exchange_holidays(market, start_date, end_date):
+    """
+        The holidays of an exchange ("asx" or "hs") between start_date and end_date. Raises a ValueError for years
+        HS_HOLIDAYS does not list, rather than treating them as having no holidays.
+    """
+    if market == "asx":
+        return AsxHolidayCalendar().holidays(start=pd.Timestamp(start_date), end=pd.Timestamp(end_date))
+
+    if market == "hs":
+        years = range(pd.Timestamp(start_date).year, pd.Timestamp(end_date).year + 1)
+        missing_years = [year for year in years if year not in HS_HOLIDAYS]
+        if missing_years:
+            raise ValueError("HS holidays are not listed for {years}, extend HS_HOLIDAYS or give the holidays.".format(
+                years=", ".join(str(year) for year in missing_years)))
+
+        holidays = pd.DatetimeIndex([holiday for year in years for holiday in HS_HOLIDAYS[year]])
+
+        return holidays[(holidays >= pd.Timestamp(start_date)) & (holidays <= pd.Timestamp(end_date))]
+
+    raise ValueError("Unknown market {market}, expected one of {markets}.".format(
+        market=market, markets=", ".join(sorted(set(TICKER_MARKETS.values())))))
+
+
+def ticker_markets(tickers):
+    """
+        The exchange of each ticker from its suffix, e.g., TLS.AX -> asx, or NaN if unknown.
+    """
+    tickers = pd.Series(tickers)
+
+    return tickers.astype(str).str.rsplit(".", n=1).str[-1].str.lower().map(TICKER_MARKETS)
+
+
+def is_exchange_holiday(dates, tickers):
+    """
+        Whether each date is a holiday of the exchange of its ticker. Dates of tickers of unknown exchanges are not.
+
+    :param dates:                   dates, a Series
+    :param tickers:                 ticker of each date, e.g., TLS.AX
+    :return:                        boolean Series, indexed as dates
+    """
+    dates = pd.to_datetime(pd.Series(dates))
+    markets = ticker_markets(tickers).set_axis(dates.index)
+
+    is_holiday = pd.Series(False, index=dates.index)
+    if dates.empty:
+        return is_holiday
+
+    for market in markets.dropna().unique():
+        holidays = exchange_holidays(market, dates.min(), dates.max())
+        is_holiday |= (markets == market) & dates.isin(holidays)
+
+    return is_holiday
@@ -0,0 +1,187 @@
+"""
+    Download stock market data concurrently.
+
+    A bounded thread pool fetches (stock_code, data_type) jobs. All requests to the same host share one token-bucket
+    rate limiter, transient failures are retried with exponential backoff, and per-ticker errors are collected instead
+    of being printed.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.error import URLError
+
+from requests.exceptions import RequestException
+
+from ta_stock_market_data.yahoo import STOCK_DATA_FUNCS, get_stock_data
+
+YAHOO_HOST = "query1.finance.yahoo.com"
+
+# Transient network and HTTP errors worth retrying. Other errors, e.g., a parsing bug, fail on the first attempt.
+NETWORK_EXCEPTIONS = (ConnectionError, TimeoutError, URLError, RequestException)
+
+
+class RateLimiter:
+    """
+        A thread-safe token bucket allowing at most `rate` requests per `per` seconds on average, with bursts up to
+        `burst` requests.
+    """
+
+    def __init__(self, rate, per=1.0, burst=None, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("The rate must be positive.")
+
+        self.rate = rate
+        self.per = per
+        self.burst = burst if burst else max(1, int(rate))
+        self.clock = clock
+        self.sleep = sleep
+
+        self._tokens = float(self.burst)
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+            Block until a token is available and consume it.
+        """
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate / self.per)
+                self._last = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) * self.per / self.rate
+
+            self.sleep(wait)
+
+
+class HostRateLimiters:
+    """
+        One RateLimiter per host, created lazily with the same settings.
+    """
+
+    def __init__(self, rate, per=1.0, burst=None):
+        self.rate = rate
+        self.per = per
+        self.burst = burst
+
+        self._limiters = dict()
+        self._lock = threading.Lock()
+
+    def __getitem__(self, host):
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = RateLimiter(self.rate, per=self.per, burst=self.burst)
+
+            return self._limiters[host]
+
+
+def retry_with_backoff(func, retries=3, backoff=1.0, max_backoff=30.0, retry_exceptions=NETWORK_EXCEPTIONS,
+                       giveup_exceptions=(KeyError, AssertionError), sleep=time.sleep):
+    """
+        Call func() and retry it on retry_exceptions, sleeping backoff * 2 ** attempt (capped by max_backoff) between
+        attempts. giveup_exceptions (data not available) are raised immediately.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except giveup_exceptions:
+            raise
+        except retry_exceptions:
+            if attempt >= retries:
+                raise
+
+            sleep(min(max_backoff, backoff * 2 ** attempt))
+            attempt += 1
+
+
+def download_stock_market_data(stock_codes, data_types, start_date=None, end_date=None, interval="1d",
+                               max_workers=8, rate=5, per=1.0, retries=3, backoff=1.0, stock_data_funcs=None,
+                               host=YAHOO_HOST, rate_limiters=None, on_stock_data=None, start_dates=None):
+    """
+        Download historical data for many stocks with a bounded thread pool.
+
+    :param stock_codes:             stock codes, e.g., ["car.ax", "tls.ax"]
+    :param data_types:              ["price", "dividend", "splits"]
+    :param start_date:              start date, datetime
+    :param end_date:                end date, datetime
+    :param interval:                "1d", "1wk" or "1mo"
+    :param max_workers:             number of worker threads
+    :param rate:                    requests allowed per `per` seconds for the host
+    :param per:                     rate limiting period in seconds
+    :param retries:                 number of retries for a failed request
+    :param backoff:                 initial backoff in seconds, doubled on each retry
+    :param stock_data_funcs:        {data_type: func}, defaults to yahoo_fin get_data, get_dividends and get_splits
+    :param host:                    host all requests are sent to, used to pick the rate limiter
+    :param rate_limiters:           HostRateLimiters shared with other downloads
+    :param on_stock_data:           callback(stock_code, stock_data_dfs) called from the main thread as each stock
+                                    completes, e.g., to export it straight away; the dfs are then not kept
+    :param start_dates:             {(stock_code, data_type): start date} overriding start_date, e.g., for
+                                    incremental updates
+    :return:                        stock_market_data: {stock_code: stock_data_dfs, ...}, empty with on_stock_data,
+                                    errors: {stock_code: [message, ...], ...}
+    """
+    if start_dates is None:
+        start_dates = dict()
+
+    if rate_limiters is None:
+        rate_limiters = HostRateLimiters(rate, per=per)
+    rate_limiter = rate_limiters[host]
+
+    def wrap(func):
+        def rate_limited_func(**kwargs):
+            def attempt():
+                rate_limiter.acquire()
+                return func(**kwargs)
+
+            return retry_with_backoff(attempt, retries=retries, backoff=backoff)
+
+        return rate_limited_func
+
+    funcs = {data_type: wrap(func) for data_type, func in (stock_data_funcs or STOCK_DATA_FUNCS).items()}
+
+    def download(stock_code):
+        errors = list()
+        stock_data_dfs = dict()
+        for data_type in data_types:
+            try:
+                stock_data_dfs.update(get_stock_data(stock_code=stock_code,
+                                                     data_types=[data_type],
+                                                     start_date=start_dates.get((stock_code, data_type),
+                                                                                start_date),
+                                                     end_date=end_date,
+                                                     interval=interval,
+                                                     stock_data_funcs=funcs,
+                                                     errors=errors))
+            except Exception as e:
+                errors.append("Historical {data_type} data failed to download for {stock_code}: {error!r}".
+                              format(stock_code=stock_code, data_type=data_type, error=e))
+
+        return stock_data_dfs, errors
+
+    stock_market_data = dict()
+    stock_market_errors = dict()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(download, stock_code): stock_code for stock_code in stock_codes}
+
+        for future in as_completed(futures):
+            stock_code = futures[future]
+            stock_data_dfs, errors = future.result()
+
+            if errors:
+                stock_market_errors[stock_code] = errors
+
+            # With a callback, each stock's dfs are released once handled rather than held until all stocks complete.
+            if on_stock_data:
+                on_stock_data(stock_code, stock_data_dfs)
+            else:
+                stock_market_data[stock_code] = stock_data_dfs
+
+    return stock_market_data, stock_market_errors
+
@@ -0,0 +1,139 @@
+"""
+    Lazy stock data loader.
+
+    A stock's data are parsed on first access, converted to compact dtypes and kept in an LRU cache bounded by memory
+    size. A cached df is re-parsed when its file's mtime changes.
+
+    Prices stay float64 by default, the dtype of CSVs parsed by pandas, as strategies compare them with thresholds
+    (e.g., candlestick ratios and Bollinger bands) that float32 rounding can flip. float32 prices halve their memory for
+    research that does not need the same signals.
+"""
+
+import os
+from collections import OrderedDict
+
+from ta_stock_market_data.storage import DATA_TYPES, cast_stock_data_df, get_storage
+
+
+def compact_stock_data_df(df, price_dtype="float64"):
+    """
+        Compact dtypes: parsed dates, categorical ticker, float64 (by default) prices. Volume is float64 so that missing
+        volumes stay NaN, as in CSVs parsed by pandas.
+    """
+    df = cast_stock_data_df(df, volume_dtype="float64", price_dtype=price_dtype)
+
+    if "ticker" in df.columns:
+        df["ticker"] = df["ticker"].astype("category")
+
+    return df
+
+
+def df_nbytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class LRUCache:
+    """
+        A least recently used cache bounded by the total size of its values in bytes.
+    """
+
+    def __init__(self, max_bytes, sizeof=df_nbytes):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+
+        self._items = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        if key not in self._items:
+            return default
+
+        self._items.move_to_end(key)
+
+        return self._items[key][0]
+
+    def put(self, key, value):
+        self.pop(key)
+
+        size = self.sizeof(value)
+        self._items[key] = (value, size)
+        self.nbytes += size
+
+        # Evict least recently used values, but always keep the newest one.
+        while self.nbytes > self.max_bytes and len(self._items) > 1:
+            _, (_, evicted_size) = self._items.popitem(last=False)
+            self.nbytes -= evicted_size
+
+    def pop(self, key):
+        if key in self._items:
+            value, size = self._items.pop(key)
+            self.nbytes -= size
+            return value
+
+        return None
+
+
+class StockDataLoader:
+    """
+        Read stock_data_dfs lazily, e.g.,
+
+            loader = StockDataLoader("data/asx_1d")
+            df = loader.read("tls.ax")["price"]
+
+        Cached dfs are shared between callers and must not be modified in place.
+    """
+
+    def __init__(self, stock_market_data_path, backend="csv", max_bytes=512 * 1024 ** 2, compact=True,
+                 price_dtype="float64"):
+        self.storage = get_storage(backend, stock_market_data_path)
+        self.compact = compact
+        self.price_dtype = price_dtype
+        self.cache = LRUCache(max_bytes, sizeof=lambda item: df_nbytes(item[1]))
+
+        self.hits = 0
+        self.misses = 0
+
+    def read_df(self, stock_code, data_type="price"):
+        """
+            Read the df of a stock and data type, or None if nothing is stored.
+        """
+        key = (stock_code, data_type)
+        stock_data_path = self.storage.stock_data_path(stock_code, data_type)
+
+        try:
+            mtime = os.stat(stock_data_path).st_mtime_ns
+        except FileNotFoundError:
+            self.cache.pop(key)
+            return None
+
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        df = self.storage.read(stock_code, data_type)
+        if self.compact:
+            df = compact_stock_data_df(df, price_dtype=self.price_dtype)
+
+        self.cache.put(key, (mtime, df))
+
+        return df
+
+    def read(self, stock_code, data_types=None):
+        """
+            Read stock_data_dfs: {data_type: df, ...}, like stock_data_dfs_read_csv.
+        """
+        stock_data_dfs = dict()
+        for data_type in data_types or DATA_TYPES:
+            df = self.read_df(stock_code, data_type)
+            if df is not None:
+                stock_data_dfs[data_type] = df
+
+        return stock_data_dfs
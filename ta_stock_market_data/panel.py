@@ -0,0 +1,136 @@
+"""
+    Memory-mapped price panel.
+
+    The price history of a universe is laid out as one contiguous (ticker x date x field) NumPy array saved as
+    {panel_path}/panel.npy, aligned to a shared trading calendar {panel_path}/dates.npy (the union of all trading dates)
+    with NaN for missing bars. Tickers and fields are saved in {panel_path}/meta.json.
+
+    Opening a panel memory-maps the array read-only, so processes share one on-disk copy through the page cache and
+    window lookups return views without copying.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ta_stock_market_data.storage import get_storage
+
+FIELDS = ["open", "high", "low", "close", "adjclose", "volume"]
+
+
+def build_price_panel(stock_codes, stock_market_data_path, panel_path, backend="csv", fields=None, dtype="float64"):
+    """
+        Build a price panel from stored price data of stock_codes and save it into panel_path. Stocks without price
+        data are left out.
+    """
+    if fields is None:
+        fields = FIELDS
+
+    storage = get_storage(backend, stock_market_data_path)
+
+    dfs = dict()
+    for stock_code in stock_codes:
+        df = storage.read(stock_code, "price")
+        if df is not None and not df.empty:
+            # Missing fields are NaN.
+            dfs[stock_code] = df.reindex(columns=["date"] + fields)
+
+    tickers = list(dfs)
+    stock_dates = {stock_code: pd.to_datetime(df["date"]).values.astype("datetime64[D]")
+                   for stock_code, df in dfs.items()}
+    dates = np.unique(np.concatenate(list(stock_dates.values()))) if dfs else np.array([], dtype="datetime64[D]")
+
+    os.makedirs(panel_path, exist_ok=True)
+    data = np.lib.format.open_memmap(os.path.join(panel_path, "panel.npy"), mode="w+", dtype=dtype,
+                                     shape=(len(tickers), len(dates), len(fields)))
+    data[:] = np.nan
+
+    for i, stock_code in enumerate(tickers):
+        j = np.searchsorted(dates, stock_dates[stock_code])
+        data[i, j, :] = dfs[stock_code][fields].to_numpy(dtype=dtype, na_value=np.nan)
+
+    data.flush()
+    del data
+
+    np.save(os.path.join(panel_path, "dates.npy"), dates)
+    with open(os.path.join(panel_path, "meta.json"), "w") as f:
+        json.dump({"tickers": tickers, "fields": fields}, f)
+
+    return PricePanel.open(panel_path)
+
+
+class PricePanel:
+    """
+        A (ticker x date x field) price panel with ticker, date and field lookup tables.
+    """
+
+    def __init__(self, data, tickers, dates, fields):
+        self.data = data
+        self.tickers = list(tickers)
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.fields = list(fields)
+
+        self.ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.field_index = {field: k for k, field in enumerate(self.fields)}
+
+    @classmethod
+    def open(cls, panel_path, mode="r"):
+        """
+            Memory-map a saved panel, read-only by default.
+        """
+        data = np.load(os.path.join(panel_path, "panel.npy"), mmap_mode=mode)
+        dates = np.load(os.path.join(panel_path, "dates.npy"))
+        with open(os.path.join(panel_path, "meta.json")) as f:
+            meta = json.load(f)
+
+        return cls(data, meta["tickers"], dates, meta["fields"])
+
+    def date_index(self, date):
+        """
+            Index of a trading date in the calendar, or None if it is not a trading date.
+        """
+        date = np.datetime64(pd.Timestamp(date).date(), "D")
+        j = np.searchsorted(self.dates, date)
+        if j < len(self.dates) and self.dates[j] == date:
+            return int(j)
+
+        return None
+
+    def as_of_index(self, date):
+        """
+            Index of the last trading date on or before date, or -1 if date is before the calendar.
+        """
+        date = np.datetime64(pd.Timestamp(date).date(), "D")
+
+        return int(np.searchsorted(self.dates, date, side="right")) - 1
+
+    def field(self, field):
+        """
+            A (ticker x date) view of one field.
+        """
+        return self.data[:, :, self.field_index[field]]
+
+    def window(self, stock_code, as_of_date, size, field=None):
+        """
+            A view of the last size bars of a stock as of as_of_date, (size x field) or (size,) if field is given.
+            Fewer bars are returned at the start of the calendar.
+        """
+        i = self.ticker_index[stock_code]
+        j = self.as_of_index(as_of_date) + 1
+
+        window = self.data[i, max(0, j - size):j]
+        if field is not None:
+            window = window[:, self.field_index[field]]
+
+        return window
+
+    def to_df(self, stock_code):
+        """
+            The bars of a stock as a df, without the calendar dates it has no data for.
+        """
+        df = pd.DataFrame(self.data[self.ticker_index[stock_code]], columns=self.fields)
+        df.insert(0, "date", self.dates.astype("datetime64[ns]"))
+
+        return df.dropna(how="all", subset=self.fields).reset_index(drop=True)
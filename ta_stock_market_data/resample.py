@@ -0,0 +1,107 @@
+"""
+    Resample daily price data to weekly or monthly bars.
+
+    Bars are built locally from stored 1d price data instead of downloading each interval separately. A weekly bar
+    covers a Monday to Friday week and is labelled with its Monday, a monthly bar is labelled with the first day of the
+    month, as yahoo labels 1wk and 1mo bars. Exchange holidays (e.g., the HS Spring Festival and Golden Week) are not
+    trading days: rows on holidays are dropped, and a week without trading days has no bar. By default, the holidays
+    are those of the exchange of each ticker (see ta_stock_market_data.calendars).
+"""
+
+import pandas as pd
+
+from ta_stock_market_data.calendars import is_exchange_holiday
+from ta_stock_market_data.storage import get_storage
+
+PERIODS = {
+    "1wk": "W-SUN",
+    "1mo": "M",
+}
+
+AGGREGATIONS = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "adjclose": "last",
+    "volume": "sum",
+}
+
+
+def resample_price_df(df, interval, holidays="exchange", by="ticker"):
+    """
+        Resample a 1d price df to "1wk" or "1mo" bars. The df may hold many stocks (a long panel with a `by` column),
+        which are resampled in one groupby.
+
+    :param df:                      price df: date, open, high, low, close, adjclose, volume[, ticker]
+    :param interval:                "1wk" or "1mo"
+    :param holidays:                "exchange" for the holidays of the exchange of each ticker (by its suffix, in
+                                    the `by` column, a ValueError for years its calendar does not cover), dates on
+                                    which rows of all stocks are dropped, or None
+    :param by:                      column identifying stocks
+    :return:                        resampled price df with the same columns
+    """
+    if interval not in PERIODS:
+        raise ValueError("The interval must be one of {intervals}.".format(intervals=", ".join(PERIODS)))
+
+    df = df.copy()
+    df["date"] = pd.to_datetime(df["date"])
+
+    price_columns = [column for column in AGGREGATIONS if column in df.columns]
+
+    # Non-trading days: yahoo reports rows without prices, or the date is an exchange holiday.
+    is_trading_day = df[price_columns].notna().any(axis="columns")
+    if isinstance(holidays, str):
+        if holidays != "exchange":
+            raise ValueError("The holidays must be \"exchange\", dates or None.")
+        if by in df.columns:
+            is_trading_day &= ~is_exchange_holiday(df["date"], df[by])
+    elif holidays is not None:
+        is_trading_day &= ~df["date"].isin(pd.to_datetime(list(holidays)))
+    df = df[is_trading_day]
+
+    period = df["date"].dt.to_period(PERIODS[interval]).dt.start_time.rename("period")
+
+    keys = [period]
+    if by in df.columns:
+        keys = [df[by], period]
+
+    groups = df.groupby(keys, sort=True, observed=True)
+    resampled_df = groups.agg({column: AGGREGATIONS[column] for column in price_columns if column != "volume"})
+    if "volume" in price_columns:
+        # A period without volumes has a missing volume, not zero.
+        resampled_df["volume"] = groups["volume"].sum(min_count=1)
+
+    resampled_df = resampled_df.reset_index().rename(columns={"period": "date"})
+
+    columns = ["date"] + price_columns + ([by] if by in df.columns else [])
+
+    return resampled_df[columns]
+
+
+def derive_stock_market_data(stock_codes, stock_market_data_path, derived_stock_market_data_path, interval,
+                             holidays="exchange", backend="csv"):
+    """
+        Derive "1wk" or "1mo" price data of stock_codes from a 1d store, e.g., data/asx_1d -> data/asx_1wk, without
+        downloading. All stocks are resampled together.
+    """
+    storage = get_storage(backend, stock_market_data_path)
+    derived_storage = get_storage(backend, derived_stock_market_data_path)
+
+    dfs = list()
+    for stock_code in stock_codes:
+        df = storage.read(stock_code, "price")
+        if df is not None and not df.empty:
+            dfs.append(df.assign(stock_code=stock_code))
+
+    if not dfs:
+        return derived_stock_market_data_path
+
+    resampled_df = resample_price_df(pd.concat(dfs, ignore_index=True), interval, holidays=holidays, by="stock_code")
+
+    for stock_code, stock_df in resampled_df.groupby("stock_code", sort=False):
+        # yahoo tickers are upper case stock codes.
+        stock_df = stock_df.drop(columns=["stock_code"]).assign(ticker=stock_code.upper())
+        derived_storage.write(stock_code, "price", stock_df.reset_index(drop=True))
+
+    return derived_stock_market_data_path
@@ -0,0 +1,166 @@
+"""
+    Short interest time series store.
+
+    Daily ASX short sell csv files (data/asx_short_sell/csv/asx_short_sell_yyyymmdd.csv) are appended into one
+    append-only csv keyed by (asx_code, date), so that the short interest history of a stock is read without opening one
+    file per day. The store is indexed by (asx_code, date) and (date, asx_code) for history and cross-section lookups.
+"""
+
+import glob
+import os
+import re
+
+import pandas as pd
+
+STORE_COLUMNS = ["asx_code", "date", "company_name", "product_class", "reported_gross_short_sells", "issued_capital",
+                 "percentage"]
+
+# Numeric columns, the only ones a blank field is missing in; a blank company name or product class stays "".
+NUMERIC_COLUMNS = ["reported_gross_short_sells", "issued_capital", "percentage"]
+
+
+def read_short_sell_csv(csv_filename, columns):
+    """
+        Read a short sell csv file by the names of its columns, so that blank fields (e.g., of backfilled files) keep
+        their columns, and with strings such as an "NA" asx_code kept as is.
+    """
+    df = pd.read_csv(csv_filename,
+                     usecols=columns,
+                     dtype={column: str for column in columns if column not in NUMERIC_COLUMNS + ["date"]},
+                     keep_default_na=False,
+                     na_values={column: [""] for column in NUMERIC_COLUMNS})
+
+    return df[columns]
+
+
+def short_sell_csv_date(csv_filename):
+    """
+        The date of a daily short sell csv file, e.g., asx_short_sell_20210122.csv -> 2021-01-22.
+    """
+    return pd.Timestamp(re.search(r"asx_short_sell_(\d{8})\.csv$", csv_filename).group(1))
+
+
+class ShortInterestStore:
+    """
+        An append-only short interest store.
+    """
+
+    def __init__(self, path="data/asx_short_sell/asx_short_sell.csv"):
+        self.path = path
+
+        self._by_code = None
+        self._by_date = None
+
+        if os.path.exists(path):
+            df = read_short_sell_csv(path, STORE_COLUMNS)
+            df["date"] = pd.to_datetime(df["date"])
+        else:
+            df = pd.DataFrame(columns=STORE_COLUMNS).astype({"date": "datetime64[ns]"})
+
+        self._set_df(df)
+
+    def _set_df(self, df):
+        self.df = df
+        self.dates = set(df["date"])
+        self._by_code = None
+        self._by_date = None
+
+    @property
+    def by_code(self):
+        """
+            The store indexed by (asx_code, date).
+        """
+        if self._by_code is None:
+            self._by_code = self.df.set_index(["asx_code", "date"]).sort_index()
+
+        return self._by_code
+
+    @property
+    def by_date(self):
+        """
+            The store indexed by (date, asx_code).
+        """
+        if self._by_date is None:
+            self._by_date = self.df.set_index(["date", "asx_code"]).sort_index()
+
+        return self._by_date
+
+    def append(self, short_sell_date, df):
+        """
+            Append the short sell data of a day, unless the day is stored already. Returns whether it was appended.
+        """
+        short_sell_date = pd.Timestamp(short_sell_date)
+        if short_sell_date in self.dates:
+            return False
+
+        df = df.assign(date=short_sell_date)[STORE_COLUMNS]
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        df.to_csv(self.path, mode="a", header=not os.path.exists(self.path), index=False, date_format="%Y-%m-%d")
+
+        self._set_df(pd.concat([self.df, df], ignore_index=True) if len(self.df) else df.reset_index(drop=True))
+
+        return True
+
+    def ingest(self, csv_filename):
+        """
+            Append a daily short sell csv file, unless its day is stored already.
+        """
+        short_sell_date = short_sell_csv_date(csv_filename)
+        if short_sell_date in self.dates:
+            return False
+
+        columns = [column for column in STORE_COLUMNS if column != "date"]
+
+        return self.append(short_sell_date, read_short_sell_csv(csv_filename, columns))
+
+    def ingest_all(self, csv_path="data/asx_short_sell/csv"):
+        """
+            Append all daily short sell csv files of csv_path which are not stored yet, in date order.
+        """
+        csv_filenames = sorted(glob.glob(os.path.join(csv_path, "asx_short_sell_*.csv")))
+
+        return sum(self.ingest(csv_filename) for csv_filename in csv_filenames)
+
+    def history(self, asx_code, start_date=None, end_date=None):
+        """
+            The short interest history of a stock between start_date and end_date, indexed by date.
+        """
+        if asx_code not in self.by_code.index.get_level_values(0):
+            return self.by_code.iloc[:0].droplevel(0)
+
+        history = self.by_code.xs(asx_code, level="asx_code")
+
+        return history.loc[start_date:end_date]
+
+    def cross_section(self, short_sell_date):
+        """
+            The short interest of all stocks on a day, indexed by asx_code.
+        """
+        short_sell_date = pd.Timestamp(short_sell_date)
+        if short_sell_date not in self.dates:
+            return self.by_date.iloc[:0].droplevel(0)
+
+        return self.by_date.xs(short_sell_date, level="date")
+
+    def asof_join(self, price_df, columns=("percentage", "reported_gross_short_sells"), tolerance=None):
+        """
+            Attach the latest short interest on or before each bar to a price df (one stock or a long panel with a
+            ticker column, e.g., TLS.AX). tolerance limits how old the short interest may be, e.g., pd.Timedelta("7D").
+        """
+        df = price_df.copy()
+        df["_date"] = pd.to_datetime(df["date"]).astype("datetime64[ns]")
+        df["_asx_code"] = df["ticker"].astype(str).str.split(".").str[0].str.upper().astype(str)
+        df["_row"] = range(len(df))
+
+        short_interest = pd.DataFrame({"_asx_code": self.df["asx_code"].astype(str),
+                                       "_date": self.df["date"].astype("datetime64[ns]")})
+        short_interest[list(columns)] = self.df[list(columns)]
+        short_interest = short_interest.sort_values(by="_date")
+
+        joined = pd.merge_asof(df.sort_values(by="_date"), short_interest, on="_date", by="_asx_code",
+                               direction="backward", tolerance=tolerance)
+
+        return joined.sort_values(by="_row").drop(columns=["_date", "_asx_code", "_row"]).set_axis(price_df.index)
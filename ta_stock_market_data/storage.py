@@ -0,0 +1,222 @@
+"""
+    Storage backends for stock data, which share the Storage interface.
+
+    CsvStorage:         {path}/{market}_{code}_{data_type}.csv, the layout written by stock_data_dfs_to_csv.
+    ParquetStorage:     {path}/market={market}/data_type={data_type}/{code}.parquet, typed columns (datetime64 date,
+                        float32 prices by default, int64 volume) with column projection and date range predicate
+                        pushdown.
+"""
+
+import os
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+DATA_TYPES = ["price", "dividend", "splits"]
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "adjclose"]
+
+
+def split_stock_code(stock_code):
+    """
+        Split a stock_code into code and market, e.g, car.ax -> car, ax.
+    """
+    code, market = stock_code.split(".")
+
+    return code, market
+
+
+def stock_data_csv_filename(stock_code, data_type):
+    """
+        {market}_{code}_{data_type}.csv, e.g, car.ax -> ax_car_price.csv.
+    """
+    code, market = split_stock_code(stock_code)
+
+    return "{market}_{code}_{date_type}.csv".format(market=market, code=code, date_type=data_type)
+
+
+def cast_stock_data_df(df, volume_dtype="Int64", price_dtype="float32"):
+    """
+        Cast stock data to typed columns: datetime64 date, float32 (by default) prices and dividends, int64 volume
+        (nullable by default, as yahoo reports missing volumes on non-trading days).
+    """
+    df = df.copy()
+
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"])
+
+    for column in PRICE_COLUMNS + ["dividend"]:
+        if column in df.columns:
+            df[column] = df[column].astype(price_dtype)
+
+    if "volume" in df.columns:
+        df["volume"] = df["volume"].astype(volume_dtype)
+
+    return df
+
+
+def _filter_dates(df, start_date, end_date):
+    if start_date is not None:
+        df = df[pd.to_datetime(df["date"]) >= pd.Timestamp(start_date)]
+    if end_date is not None:
+        df = df[pd.to_datetime(df["date"]) <= pd.Timestamp(end_date)]
+
+    return df.reset_index(drop=True)
+
+
+def _with_date_column(columns, start_date, end_date):
+    if columns is not None and (start_date is not None or end_date is not None) and "date" not in columns:
+        return ["date"] + list(columns)
+
+    return columns
+
+
+class Storage(ABC):
+    """
+        A stock data store, one file per stock and data type. Backends implement stock_data_path, write and read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @abstractmethod
+    def stock_data_path(self, stock_code, data_type):
+        pass
+
+    def exists(self, stock_code, data_type):
+        return os.path.exists(self.stock_data_path(stock_code, data_type))
+
+    @abstractmethod
+    def write(self, stock_code, data_type, df):
+        pass
+
+    @abstractmethod
+    def read(self, stock_code, data_type, columns=None, start_date=None, end_date=None):
+        """
+            Read the stored df, or None if nothing is stored.
+        """
+
+    def read_stock_data_dfs(self, stock_code, data_types=None, columns=None, start_date=None, end_date=None):
+        """
+            Read stock_data_dfs: {data_type: df, ...} for the stored data types.
+        """
+        stock_data_dfs = dict()
+        for data_type in data_types or DATA_TYPES:
+            df = self.read(stock_code, data_type, columns=columns, start_date=start_date, end_date=end_date)
+            if df is not None:
+                stock_data_dfs[data_type] = df
+
+        return stock_data_dfs
+
+    def last_date(self, stock_code, data_type):
+        """
+            The last stored date, or None if nothing is stored.
+        """
+        df = self.read(stock_code, data_type, columns=["date"])
+        if df is None or df.empty:
+            return None
+
+        return pd.to_datetime(df["date"]).max().date()
+
+
+class CsvStorage(Storage):
+    """
+        Text CSV storage, one file per stock and data type.
+    """
+
+    def stock_data_path(self, stock_code, data_type):
+        return os.path.join(self.path, stock_data_csv_filename(stock_code, data_type))
+
+    def write(self, stock_code, data_type, df):
+        os.makedirs(self.path, exist_ok=True)
+        df.to_csv(self.stock_data_path(stock_code, data_type), index=False, header=True)
+
+    def read(self, stock_code, data_type, columns=None, start_date=None, end_date=None):
+        """
+            Read the stored df, or None if nothing is stored. CSV cannot skip rows, so the date range is applied after
+            parsing.
+        """
+        if not self.exists(stock_code, data_type):
+            return None
+
+        read_columns = _with_date_column(columns, start_date, end_date)
+        df = pd.read_csv(self.stock_data_path(stock_code, data_type), usecols=read_columns)
+        df = _filter_dates(df, start_date, end_date)
+
+        if columns is not None:
+            df = df[list(columns)]
+
+        return df
+
+
+class ParquetStorage(Storage):
+    """
+        Columnar Parquet storage partitioned by market and data type. Requires pyarrow. Prices are stored as float32 by
+        default, or as float64 for the same strategy signals as CSVs.
+    """
+
+    # Small row groups let the date range filter skip most of a long history.
+    row_group_size = 1024
+
+    def __init__(self, path, price_dtype="float32"):
+        super().__init__(path)
+        self.price_dtype = price_dtype
+
+    def stock_data_path(self, stock_code, data_type):
+        code, market = split_stock_code(stock_code)
+
+        return os.path.join(self.path,
+                            "market={market}".format(market=market),
+                            "data_type={data_type}".format(data_type=data_type),
+                            "{code}.parquet".format(code=code))
+
+    def write(self, stock_code, data_type, df):
+        stock_data_path = self.stock_data_path(stock_code, data_type)
+        os.makedirs(os.path.dirname(stock_data_path), exist_ok=True)
+
+        df = cast_stock_data_df(df, price_dtype=self.price_dtype)
+        if "date" in df.columns:
+            df = df.sort_values(by="date")
+
+        df.to_parquet(stock_data_path, index=False, row_group_size=self.row_group_size)
+
+    def read(self, stock_code, data_type, columns=None, start_date=None, end_date=None):
+        """
+            Read the stored df, or None if nothing is stored. Only the given columns are read and row groups outside
+            the date range are skipped.
+        """
+        if not self.exists(stock_code, data_type):
+            return None
+
+        filters = list()
+        if start_date is not None:
+            filters.append(("date", ">=", pd.Timestamp(start_date)))
+        if end_date is not None:
+            filters.append(("date", "<=", pd.Timestamp(end_date)))
+
+        read_columns = _with_date_column(columns, start_date, end_date)
+        df = pd.read_parquet(self.stock_data_path(stock_code, data_type),
+                             columns=read_columns,
+                             filters=filters or None)
+
+        if columns is not None:
+            df = df[list(columns)]
+
+        return df.reset_index(drop=True)
+
+
+STORAGE_BACKENDS = {
+    "csv": CsvStorage,
+    "parquet": ParquetStorage,
+}
+
+
+def get_storage(backend, path, **options):
+    """
+        Get a storage backend by name: "csv" or "parquet". options are passed on to the backend, e.g., price_dtype.
+    """
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError("Unknown storage backend {backend}, expected one of {backends}.".format(
+            backend=backend, backends=", ".join(STORAGE_BACKENDS)))
+
+    return STORAGE_BACKENDS[backend](path, **options)
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_stock_market_data.adjust import AdjustmentCache, adjust_price_df
+
+price_df = pd.DataFrame({"date": ["2021-01-04", "2021-01-05", "2021-01-06", "2021-01-07"],
+                         "open": [10.0, 10.0, 5.0, 4.5],
+                         "high": [10.0, 10.0, 5.0, 4.5],
+                         "low": [10.0, 10.0, 5.0, 4.5],
+                         "close": [10.0, 10.0, 5.0, 4.5],
+                         "volume": [100.0, 100.0, 200.0, 200.0],
+                         "ticker": "TLS.AX"})
+
+splits_df = pd.DataFrame({"date": ["2021-01-06"], "splitRatio": ["2:1"], "ticker": "TLS.AX"})
+
+dividend_df = pd.DataFrame({"date": ["2021-01-07"], "dividend": [0.5], "ticker": "TLS.AX"})
+
+
+class TestAdjust(unittest.TestCase):
+
+    def test_adjust_price_df(self):
+        df = adjust_price_df(price_df, dividend_df, splits_df)
+
+        # Split 2:1 before 2021-01-06, dividend of 10% of the last close before 2021-01-07.
+        np.testing.assert_allclose(df["close"], [4.5, 4.5, 4.5, 4.5])
+        np.testing.assert_allclose(df["volume"], [200.0, 200.0, 200.0, 200.0])
+        np.testing.assert_allclose(df["total_return"], [1.0, 1.0, 1.0, 1.0])
+
+    def test_adjust_panel(self):
+        panel_df = pd.concat([price_df, price_df.assign(ticker="CAR.AX")], ignore_index=True)
+
+        df = adjust_price_df(panel_df, dividend_df, splits_df)
+
+        np.testing.assert_allclose(df["close"], [4.5, 4.5, 4.5, 4.5, 10.0, 10.0, 5.0, 4.5])
+
+    def test_adjust_ticker_mismatch(self):
+        with self.assertRaises(ValueError):
+            adjust_price_df(price_df.drop(columns="ticker"), dividend_df, splits_df)
+        with self.assertRaises(ValueError):
+            adjust_price_df(price_df, splits_df=splits_df.drop(columns="ticker"))
+
+        # Frames without a ticker column are one stock.
+        df = adjust_price_df(price_df.drop(columns="ticker"), dividend_df.drop(columns="ticker"),
+                             splits_df.drop(columns="ticker"))
+        np.testing.assert_allclose(df["close"], [4.5, 4.5, 4.5, 4.5])
+
+    def test_adjustment_cache(self):
+        cache = AdjustmentCache()
+        cache.adjust("tls.ax", price_df.iloc[:3], splits_df=splits_df)
+
+        # A new bar without a new corporate action is appended.
+        df = cache.adjust("tls.ax", price_df, splits_df=splits_df)
+        np.testing.assert_allclose(df["close"], [5.0, 5.0, 5.0, 4.5])
+        np.testing.assert_allclose(df["total_return"], [1.0, 1.0, 1.0, 0.9])
+
+        # A new corporate action recomputes the factors.
+        df = cache.adjust("tls.ax", price_df, dividend_df, splits_df)
+        np.testing.assert_allclose(df["close"], [4.5, 4.5, 4.5, 4.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
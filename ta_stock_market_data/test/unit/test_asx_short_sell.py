@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from ta_stock_market_data.asx_short_sell import backfill_asx_short_sell, parse_asx_short_sell
+
+
+def make_row(asx_code, company_name, product_class, reported_gross_short_sells, issued_capital, percentage):
+    return "{left:<42}{mid:<11}{right}".format(
+        left="{asx_code} {company_name}".format(asx_code=asx_code, company_name=company_name),
+        mid=product_class,
+        right="{:>20,}{:>20,}{:>10.2f}".format(reported_gross_short_sells, issued_capital, percentage))
+
+
+content = "\r\n".join(["Short Sell Report for 22-Jan-2021"] + ["header"] * 7 + [
+    make_row("TLS", "TELSTRA CORPORATION.", "FPO", 1234567, 11893297855, 0.01),
+    make_row("CBA", "COMMONWEALTH BANK OF AUSTRALIA.", "FPO", 987, 1773146938, 0.0),
+    "",
+]).encode("utf-8")
+
+
+class TestAsxShortSell(unittest.TestCase):
+
+    def test_parse_asx_short_sell(self):
+        short_sell_date, df = parse_asx_short_sell(content)
+
+        self.assertEqual(short_sell_date, "20210122")
+        self.assertEqual(df.iloc[0].to_dict(), {"asx_code": "TLS",
+                                                "company_name": "TELSTRA CORPORATION.",
+                                                "product_class": "FPO",
+                                                "reported_gross_short_sells": 1234567,
+                                                "issued_capital": 11893297855,
+                                                "percentage": 0.01})
+        self.assertEqual(df["company_name"].to_list()[1], "COMMONWEALTH BANK OF AUSTRALIA.")
+        self.assertEqual(df["reported_gross_short_sells"].dtype, "int64")
+
+    def test_parse_asx_short_sell_non_ascii(self):
+        # Each "É" is two bytes, enough to shift byte offsets past the product class.
+        company_name = "SOCIÉTÉ GÉNÉRALE ÉNÉRGIÉ ÉLÉCTRIQUÉ"
+        non_ascii_row = make_row("TLS", company_name, "FPO", 1234567, 11893297855, 0.01).encode("utf-8")
+        non_ascii_content = content.replace(content.splitlines()[8], non_ascii_row)
+
+        _, df = parse_asx_short_sell(non_ascii_content)
+
+        self.assertEqual(df.iloc[0].to_dict(), {"asx_code": "TLS",
+                                                "company_name": company_name,
+                                                "product_class": "FPO",
+                                                "reported_gross_short_sells": 1234567,
+                                                "issued_capital": 11893297855,
+                                                "percentage": 0.01})
+        self.assertEqual(df["company_name"].to_list()[1], "COMMONWEALTH BANK OF AUSTRALIA.")
+
+    def test_backfill_asx_short_sell(self):
+        with tempfile.TemporaryDirectory() as path:
+            for short_sell_date in ["20210121", "20210122"]:
+                with open(os.path.join(path, "asx_short_sell_{date}.txt".format(date=short_sell_date)), "wb") as f:
+                    f.write(content.replace(b"22-Jan-2021", short_sell_date[-2:].encode("utf-8") + b"-Jan-2021"))
+
+            csv_filenames = backfill_asx_short_sell(txt_path=path, csv_path=path, max_workers=2)
+
+            self.assertEqual([os.path.basename(csv_filename) for csv_filename in csv_filenames],
+                             ["asx_short_sell_20210121.csv", "asx_short_sell_20210122.csv"])
+            self.assertEqual(len(pd.read_csv(csv_filenames[0])), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+import pandas as pd
+
+from ta_stock_market_data.calendars import exchange_holidays, is_exchange_holiday, ticker_markets
+
+
+class TestCalendars(unittest.TestCase):
+
+    def test_exchange_holidays(self):
+        holidays = exchange_holidays("asx", "2021-01-01", "2021-12-31")
+
+        # Christmas Day and Boxing Day 2021 fall on a weekend and are moved to Monday and Tuesday.
+        self.assertEqual([holiday for holiday in holidays.strftime("%Y-%m-%d") if pd.Timestamp(holiday).weekday() < 5],
+                         ["2021-01-01", "2021-01-26", "2021-04-02", "2021-04-05", "2021-06-14", "2021-12-27",
+                          "2021-12-28"])
+
+        holidays = exchange_holidays("hs", "2021-02-01", "2021-02-28")
+        self.assertEqual(holidays.strftime("%Y-%m-%d").to_list(),
+                         ["2021-02-11", "2021-02-12", "2021-02-15", "2021-02-16", "2021-02-17"])
+
+        with self.assertRaises(ValueError):
+            exchange_holidays("nyse", "2021-01-01", "2021-12-31")
+
+        # Years without listed HS holidays are not taken as years without holidays.
+        with self.assertRaisesRegex(ValueError, "2019"):
+            exchange_holidays("hs", "2019-12-01", "2020-01-31")
+        with self.assertRaisesRegex(ValueError, "2019"):
+            is_exchange_holiday(pd.Series(pd.to_datetime(["2019-10-01", "2021-10-01"])), ["600000.SS"] * 2)
+
+    def test_is_exchange_holiday(self):
+        self.assertEqual(ticker_markets(["TLS.AX", "600000.ss", "000001.SZ", "0005.HK"]).to_list()[:3],
+                         ["asx", "hs", "hs"])
+
+        dates = pd.Series(pd.to_datetime(["2021-01-26", "2021-01-26", "2021-02-11", "2021-02-11", "2021-01-26"]),
+                          index=[5, 6, 7, 8, 9])
+        is_holiday = is_exchange_holiday(dates, ["TLS.AX", "600000.SS", "600000.SS", "tls.ax", "0005.HK"])
+
+        self.assertEqual(is_holiday.to_list(), [True, False, True, False, False])
+        self.assertEqual(is_holiday.index.to_list(), [5, 6, 7, 8, 9])
+
+
+if __name__ == '__main__':
+    unittest.main()
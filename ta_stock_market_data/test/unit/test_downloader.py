@@ -0,0 +1,108 @@
+import threading
+import unittest
+
+import pandas as pd
+
+from ta_stock_market_data.downloader import RateLimiter, download_stock_market_data, retry_with_backoff
+
+
+class FakeProvider:
+    """
+        A local fake of the yahoo_fin functions: "bad.ax" has no data and every first request of a ticker fails with
+        a connection error.
+    """
+
+    def __init__(self):
+        self.calls = dict()
+        self.lock = threading.Lock()
+
+    def get_data(self, ticker, start_date=None, end_date=None, index_as_date=False, interval="1d"):
+        with self.lock:
+            self.calls[ticker] = self.calls.get(ticker, 0) + 1
+            first_call = self.calls[ticker] == 1
+
+        if ticker == "bad.ax":
+            raise AssertionError("No data found.")
+
+        if first_call:
+            raise ConnectionError("Connection reset by peer.")
+
+        return pd.DataFrame([{"date": "2021-01-04", "open": 1.0, "high": 1.1, "low": 0.9, "close": 1.05,
+                              "adjclose": 1.05, "volume": 100, "ticker": ticker.upper()}])
+
+
+class TestDownloader(unittest.TestCase):
+
+    def test_download_stock_market_data(self):
+        provider = FakeProvider()
+        stock_codes = ["tls.ax", "car.ax", "bad.ax"]
+
+        stock_market_data, errors = download_stock_market_data(stock_codes, ["price"],
+                                                               max_workers=3,
+                                                               rate=1000,
+                                                               backoff=0,
+                                                               stock_data_funcs={"price": provider.get_data})
+
+        self.assertEqual(set(stock_market_data), set(stock_codes))
+        self.assertIn("ax_tls_price.csv", stock_market_data["tls.ax"])
+        self.assertEqual(stock_market_data["bad.ax"], dict())
+        self.assertEqual(list(errors), ["bad.ax"])
+        self.assertEqual(provider.calls["tls.ax"], 2)
+
+    def test_download_stock_market_data_callback(self):
+        provider = FakeProvider()
+        completed = dict()
+
+        stock_market_data, _ = download_stock_market_data(["tls.ax", "car.ax"], ["price"],
+                                                          max_workers=2,
+                                                          rate=1000,
+                                                          backoff=0,
+                                                          stock_data_funcs={"price": provider.get_data},
+                                                          on_stock_data=completed.__setitem__)
+
+        # The dfs are handed to the callback only.
+        self.assertEqual(stock_market_data, dict())
+        self.assertEqual(set(completed), {"tls.ax", "car.ax"})
+        self.assertIn("ax_tls_price.csv", completed["tls.ax"])
+
+    def test_retry_with_backoff(self):
+        attempts = list()
+        sleeps = list()
+
+        def func():
+            attempts.append(1)
+            raise ConnectionError()
+
+        with self.assertRaises(ConnectionError):
+            retry_with_backoff(func, retries=3, backoff=1.0, sleep=sleeps.append)
+
+        self.assertEqual(len(attempts), 4)
+        self.assertEqual(sleeps, [1.0, 2.0, 4.0])
+
+        # Errors other than network errors are not retried.
+        def broken_func():
+            attempts.append(1)
+            raise ValueError()
+
+        with self.assertRaises(ValueError):
+            retry_with_backoff(broken_func, retries=3, sleep=sleeps.append)
+        self.assertEqual(len(attempts), 5)
+
+    def test_rate_limiter(self):
+        now = [0.0]
+        sleeps = list()
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        rate_limiter = RateLimiter(2, per=1.0, clock=lambda: now[0], sleep=sleep)
+        for _ in range(4):
+            rate_limiter.acquire()
+
+        # The burst of 2 requests is free, the next 2 requests wait 0.5 second each.
+        self.assertEqual(sleeps, [0.5, 0.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_stock_market_data.loader import LRUCache, StockDataLoader
+from ta_stock_market_data.storage import get_storage
+
+price_df = pd.DataFrame({"date": ["2021-01-04", "2021-01-05"], "open": [1.0, 1.1], "high": [1.2, 1.3],
+                         "low": [0.9, 1.0], "close": [1.1, 1.2], "adjclose": [1.1, 1.2], "volume": [100, np.nan],
+                         "ticker": "TLS.AX"})
+
+
+class TestLoader(unittest.TestCase):
+
+    def test_stock_data_loader(self):
+        with tempfile.TemporaryDirectory() as path:
+            storage = get_storage("csv", path)
+            storage.write("tls.ax", "price", price_df)
+
+            loader = StockDataLoader(path)
+            df = loader.read("tls.ax")["price"]
+
+            self.assertEqual(df["close"].dtype, np.float64)
+            self.assertEqual(df["ticker"].dtype, "category")
+            self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["date"]))
+            self.assertTrue(np.isnan(df.iloc[-1]["volume"]))
+
+            # The file is parsed only once.
+            self.assertIs(loader.read_df("tls.ax"), df)
+            self.assertEqual((loader.hits, loader.misses), (1, 1))
+
+            # A modified file is parsed again.
+            storage.write("tls.ax", "price", price_df.iloc[:1])
+            stat = os.stat(storage.stock_data_path("tls.ax", "price"))
+            os.utime(storage.stock_data_path("tls.ax", "price"), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            self.assertEqual(len(loader.read_df("tls.ax")), 1)
+
+            self.assertIsNone(loader.read_df("car.ax"))
+
+            self.assertEqual(StockDataLoader(path, price_dtype="float32").read_df("tls.ax")["close"].dtype, np.float32)
+
+    def test_lru_cache(self):
+        cache = LRUCache(max_bytes=10, sizeof=len)
+        cache.put("a", "aaaa")
+        cache.put("b", "bbbb")
+        cache.get("a")
+        cache.put("c", "cccc")
+
+        # "b" is the least recently used value.
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertEqual(cache.nbytes, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
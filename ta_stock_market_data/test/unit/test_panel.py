@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_stock_market_data.panel import PricePanel, build_price_panel
+from ta_stock_market_data.storage import get_storage
+
+
+def make_price_df(dates, close):
+    return pd.DataFrame({"date": dates, "open": close, "high": close, "low": close, "close": close,
+                         "adjclose": close, "volume": 100})
+
+
+class TestPricePanel(unittest.TestCase):
+
+    def test_build_price_panel(self):
+        with tempfile.TemporaryDirectory() as path:
+            storage = get_storage("csv", path)
+            storage.write("tls.ax", "price", make_price_df(["2021-01-04", "2021-01-05", "2021-01-06"], [1., 2., 3.]))
+            # car.ax has no bar on 2021-01-05.
+            storage.write("car.ax", "price", make_price_df(["2021-01-04", "2021-01-06", "2021-01-07"], [4., 5., 6.]))
+
+            build_price_panel(["tls.ax", "car.ax", "bhp.ax"], path, path + "/panel")
+            panel = PricePanel.open(path + "/panel")
+
+            self.assertEqual(panel.tickers, ["tls.ax", "car.ax"])
+            self.assertEqual(panel.data.shape, (2, 4, 6))
+            self.assertIsInstance(panel.data, np.memmap)
+            self.assertEqual(panel.date_index("2021-01-06"), 2)
+            self.assertIsNone(panel.date_index("2021-01-09"))
+
+            close = panel.field("close")
+            self.assertTrue(np.isnan(close[1, 1]))
+
+            # As of a non-trading date, the window ends at the last trading date before it.
+            window = panel.window("tls.ax", "2021-01-10", 2, field="close")
+            self.assertTrue(np.shares_memory(window, panel.data))
+            np.testing.assert_array_equal(window[:1], [3.])
+
+            window = panel.window("car.ax", "2021-01-06", 60)
+            self.assertEqual(window.shape, (3, 6))
+
+            self.assertEqual(panel.to_df("car.ax")["close"].to_list(), [4., 5., 6.])
+
+
+if __name__ == '__main__':
+    unittest.main()
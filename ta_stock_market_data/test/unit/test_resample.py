@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_stock_market_data.resample import derive_stock_market_data, resample_price_df
+from ta_stock_market_data.storage import get_storage
+
+# 2021-01-04 (Mon) to 2021-02-05 (Fri).
+dates = pd.bdate_range("2021-01-04", "2021-02-05")
+price_df = pd.DataFrame({"date": dates,
+                         "open": np.arange(len(dates)) + 1.0,
+                         "high": np.arange(len(dates)) + 2.0,
+                         "low": np.arange(len(dates)) + 0.5,
+                         "close": np.arange(len(dates)) + 1.5,
+                         "adjclose": np.arange(len(dates)) + 1.5,
+                         "volume": 100.0,
+                         "ticker": "TLS.AX"})
+
+
+class TestResample(unittest.TestCase):
+
+    def test_resample_weekly(self):
+        df = resample_price_df(price_df, "1wk")
+
+        self.assertEqual(len(df), 5)
+        self.assertEqual(df.iloc[0].to_dict(), {"date": pd.Timestamp("2021-01-04"), "open": 1.0, "high": 6.0,
+                                                "low": 0.5, "close": 5.5, "adjclose": 5.5, "volume": 500.0,
+                                                "ticker": "TLS.AX"})
+
+    def test_resample_weekly_with_holidays(self):
+        # 2021-01-26 (Australia Day) is a holiday reported with prices, 2021-01-27 a non-trading row.
+        df = price_df.copy()
+        df.loc[df["date"] == "2021-01-27", ["open", "high", "low", "close", "adjclose", "volume"]] = np.nan
+
+        week_df = resample_price_df(df, "1wk", holidays=["2021-01-26"])
+        week_df = week_df[week_df["date"] == "2021-01-25"]
+
+        self.assertEqual(week_df["open"].item(), 16.0)
+        self.assertEqual(week_df["volume"].item(), 300.0)
+
+    def test_resample_weekly_with_exchange_holidays(self):
+        # 2021-01-26 is Australia Day on the ASX, a trading day in Shanghai.
+        df = pd.concat([price_df, price_df.assign(ticker="600000.SS")])
+
+        week_df = resample_price_df(df, "1wk")
+        week_df = week_df[week_df["date"] == "2021-01-25"].set_index("ticker")
+
+        self.assertEqual(week_df["volume"].to_dict(), {"600000.SS": 500.0, "TLS.AX": 400.0})
+        self.assertEqual(resample_price_df(df, "1wk", holidays=None)["volume"].sum(), 5000.0)
+
+        with self.assertRaises(ValueError):
+            resample_price_df(df, "1wk", holidays="nyse")
+
+        # HS holidays are not listed for 2019.
+        with self.assertRaises(ValueError):
+            resample_price_df(df.assign(date=df["date"] - pd.DateOffset(years=2)), "1wk")
+
+    def test_resample_monthly_panel(self):
+        df = pd.concat([price_df, price_df.assign(ticker="CAR.AX", close=price_df["close"] * 2)])
+
+        month_df = resample_price_df(df, "1mo")
+
+        self.assertEqual(month_df["ticker"].to_list(), ["CAR.AX", "CAR.AX", "TLS.AX", "TLS.AX"])
+        self.assertEqual(month_df["date"].dt.day.to_list(), [1, 1, 1, 1])
+        self.assertEqual(month_df["close"].to_list(), [41.0, 51.0, 20.5, 25.5])
+
+    def test_derive_stock_market_data(self):
+        with tempfile.TemporaryDirectory() as path:
+            get_storage("csv", path + "/asx_1d").write("tls.ax", "price", price_df)
+
+            derive_stock_market_data(["tls.ax", "car.ax"], path + "/asx_1d", path + "/asx_1wk", "1wk")
+
+            df = get_storage("csv", path + "/asx_1wk").read("tls.ax", "price")
+            self.assertEqual(len(df), 5)
+            self.assertEqual(df["ticker"].unique().tolist(), ["TLS.AX"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_stock_market_data.short_interest import STORE_COLUMNS, ShortInterestStore
+
+
+def make_short_sell_df(percentages):
+    return pd.DataFrame({"asx_code": ["TLS", "CBA"],
+                         "company_name": ["TELSTRA CORPORATION.", "COMMONWEALTH BANK OF AUSTRALIA."],
+                         "product_class": ["FPO", "FPO"],
+                         "reported_gross_short_sells": [100, 200],
+                         "issued_capital": [10000, 20000],
+                         "percentage": percentages})
+
+
+class TestShortInterestStore(unittest.TestCase):
+
+    def test_short_interest_store(self):
+        with tempfile.TemporaryDirectory() as path:
+            csv_path = os.path.join(path, "csv")
+            os.makedirs(csv_path)
+            make_short_sell_df([0.1, 0.2]).to_csv(os.path.join(csv_path, "asx_short_sell_20210121.csv"), index=False)
+            make_short_sell_df([0.3, 0.4]).to_csv(os.path.join(csv_path, "asx_short_sell_20210122.csv"), index=False)
+
+            store = ShortInterestStore(os.path.join(path, "asx_short_sell.csv"))
+            self.assertEqual(store.ingest_all(csv_path), 2)
+            # Only new days are appended.
+            self.assertEqual(store.ingest_all(csv_path), 0)
+
+            store = ShortInterestStore(os.path.join(path, "asx_short_sell.csv"))
+            self.assertEqual(store.history("TLS")["percentage"].to_list(), [0.1, 0.3])
+            self.assertEqual(store.history("TLS", start_date="2021-01-22")["percentage"].to_list(), [0.3])
+            self.assertEqual(len(store.history("BHP")), 0)
+            self.assertEqual(store.cross_section("2021-01-22")["percentage"].to_dict(), {"CBA": 0.4, "TLS": 0.3})
+
+            price_df = pd.DataFrame({"date": ["2021-01-20", "2021-01-21", "2021-01-25", "2021-01-22"],
+                                     "close": 1.0,
+                                     "ticker": ["TLS.AX", "TLS.AX", "TLS.AX", "CBA.AX"]})
+            df = store.asof_join(price_df)
+
+            np.testing.assert_array_equal(df["percentage"], [np.nan, 0.1, 0.3, 0.4])
+            self.assertEqual(df["ticker"].to_list(), price_df["ticker"].to_list())
+
+    def test_blank_columns(self):
+        with tempfile.TemporaryDirectory() as path:
+            csv_path = os.path.join(path, "csv")
+            os.makedirs(csv_path)
+            make_short_sell_df([0.1, 0.2]).to_csv(os.path.join(csv_path, "asx_short_sell_20210121.csv"), index=False)
+            # A backfilled file with blank right-hand columns, columns in another order and an "NA" asx_code.
+            df = make_short_sell_df([np.nan, np.nan]).assign(asx_code=["TLS", "NA"], product_class="")
+            columns = [column for column in STORE_COLUMNS[::-1] if column != "date"]
+            df[columns].to_csv(os.path.join(csv_path, "asx_short_sell_20210122.csv"), index=False)
+
+            store = ShortInterestStore(os.path.join(path, "asx_short_sell.csv"))
+            store.ingest_all(csv_path)
+            store = ShortInterestStore(os.path.join(path, "asx_short_sell.csv"))
+
+            self.assertEqual(store.df.columns.to_list(), STORE_COLUMNS)
+            self.assertEqual(store.history("NA")["company_name"].to_list(), ["COMMONWEALTH BANK OF AUSTRALIA."])
+            self.assertEqual(store.history("TLS")["product_class"].to_list(), ["FPO", ""])
+            np.testing.assert_array_equal(store.history("TLS")["percentage"], [0.1, np.nan])
+            self.assertEqual(store.history("TLS")["issued_capital"].to_list(), [10000, 10000])
+
+
+if __name__ == '__main__':
+    unittest.main()
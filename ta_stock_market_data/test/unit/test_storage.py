@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_stock_market_data.storage import Storage, get_storage
+
+price_df = pd.DataFrame({"date": pd.bdate_range("2021-01-04", periods=10).strftime("%Y-%m-%d"),
+                         "open": np.linspace(1, 2, 10),
+                         "high": np.linspace(1.1, 2.1, 10),
+                         "low": np.linspace(0.9, 1.9, 10),
+                         "close": np.linspace(1, 2, 10),
+                         "adjclose": np.linspace(1, 2, 10),
+                         "volume": np.arange(10) * 100,
+                         "ticker": "TLS.AX"})
+
+
+class TestStorage(unittest.TestCase):
+
+    def test_parquet_storage(self):
+        with tempfile.TemporaryDirectory() as path:
+            storage = get_storage("parquet", path)
+            storage.write("tls.ax", "price", price_df)
+
+            self.assertTrue(os.path.exists(os.path.join(path, "market=ax", "data_type=price", "tls.parquet")))
+
+            df = storage.read("tls.ax", "price")
+            self.assertTrue(pd.api.types.is_datetime64_any_dtype(df["date"]))
+            self.assertEqual(df["close"].dtype, np.float32)
+            self.assertEqual(str(df["volume"].dtype), "Int64")
+
+            df = storage.read("tls.ax", "price", columns=["date", "low", "close"],
+                              start_date="2021-01-06", end_date="2021-01-08")
+            self.assertEqual(df.columns.to_list(), ["date", "low", "close"])
+            self.assertEqual(len(df), 3)
+
+            self.assertEqual(str(storage.last_date("tls.ax", "price")), "2021-01-15")
+            self.assertIsNone(storage.read("car.ax", "price"))
+
+            storage = get_storage("parquet", path, price_dtype="float64")
+            storage.write("tls.ax", "price", price_df)
+            np.testing.assert_array_equal(storage.read("tls.ax", "price")["close"], price_df["close"])
+
+    def test_csv_storage(self):
+        with tempfile.TemporaryDirectory() as path:
+            storage = get_storage("csv", path)
+            storage.write("tls.ax", "price", price_df)
+
+            self.assertTrue(os.path.exists(os.path.join(path, "ax_tls_price.csv")))
+
+            df = storage.read("tls.ax", "price", columns=["close"], start_date="2021-01-14")
+            self.assertEqual(df.columns.to_list(), ["close"])
+            self.assertEqual(len(df), 2)
+
+            self.assertEqual(list(storage.read_stock_data_dfs("tls.ax")), ["price"])
+
+    def test_storage_backends(self):
+        for backend in ["csv", "parquet"]:
+            with self.subTest(backend=backend), tempfile.TemporaryDirectory() as path:
+                storage = get_storage(backend, path, **({"price_dtype": "float64"} if backend == "parquet" else {}))
+                storage.write("tls.ax", "price", price_df)
+
+                df = storage.read("tls.ax", "price")
+                self.assertEqual(df.columns.to_list(), price_df.columns.to_list())
+                np.testing.assert_allclose(df[["open", "high", "low", "close", "adjclose"]],
+                                           price_df[["open", "high", "low", "close", "adjclose"]])
+                np.testing.assert_array_equal(df["volume"].astype(int), price_df["volume"])
+                self.assertEqual(pd.to_datetime(df["date"]).dt.strftime("%Y-%m-%d").to_list(),
+                                 price_df["date"].to_list())
+
+        with self.assertRaises(TypeError):
+            Storage("data")
+
+    def test_unknown_storage(self):
+        with self.assertRaises(ValueError):
+            get_storage("xlsx", "data")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_stock_market_data.panel import build_price_panel
+from ta_stock_market_data.storage import get_storage
+from ta_stock_market_data.validate import repair_price_df, validate_price_df, validate_price_panel, \
+    validate_stock_market_data
+
+price_df = pd.DataFrame({"date": ["2021-01-04", "2021-01-05", "2021-01-05", "2021-01-07", "2021-01-08"],
+                         "open": [1.0, 1.0, 1.0, 0.0, 1.0],
+                         "high": [1.2, 1.2, 1.2, 1.2, 0.8],
+                         "low": [0.9, 0.9, 0.9, 0.9, 0.9],
+                         "close": [1.1, 1.1, 1.1, 1.1, np.nan],
+                         "volume": 100})
+
+
+class TestValidate(unittest.TestCase):
+
+    def test_validate_price_df(self):
+        quality = validate_price_df(price_df, as_of_date="2021-01-07")
+
+        self.assertEqual(quality["missing_days"], 1)
+        self.assertEqual(quality["duplicate_dates"], 2)
+        self.assertEqual(quality["nan_ohlc"], 1)
+        self.assertEqual(quality["zero_ohlc"], 1)
+        self.assertEqual(quality["high_lt_low"], 1)
+        self.assertEqual(quality["last_valid_date"], pd.Timestamp("2021-01-05"))
+        self.assertEqual(quality["action"], "skip")
+
+        quality = validate_price_df(price_df, as_of_date="2021-01-05")
+        self.assertEqual(quality["action"], "repair")
+
+    def test_repair_price_df(self):
+        df = repair_price_df(price_df)
+
+        self.assertEqual(df["date"].to_list(), ["2021-01-04", "2021-01-05"])
+
+    def test_validate_stock_market_data(self):
+        with tempfile.TemporaryDirectory() as path:
+            storage = get_storage("csv", path)
+            storage.write("tls.ax", "price", price_df.iloc[:2])
+            storage.write("car.ax", "price", price_df)
+
+            quality_index = validate_stock_market_data(["tls.ax", "car.ax", "bhp.ax"], path,
+                                                       as_of_date="2021-01-05")
+            self.assertEqual(quality_index["action"].to_dict(), {"tls.ax": "ok", "car.ax": "repair", "bhp.ax": "skip"})
+
+            panel = build_price_panel(["tls.ax", "car.ax"], path, path + "/panel")
+            quality_index = validate_price_panel(panel, as_of_date="2021-01-05")
+            self.assertEqual(quality_index["action"].to_dict(), {"tls.ax": "ok", "car.ax": "repair"})
+            self.assertEqual(quality_index.loc["tls.ax", "last_date"], pd.Timestamp("2021-01-05"))
+
+
+if __name__ == '__main__':
+    unittest.main()
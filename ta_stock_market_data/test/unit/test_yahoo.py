@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from ta_stock_market_data.yahoo import last_stored_date, merge_stock_data_df, stock_data_dfs_read_csv, \
+    update_stock_market_data
+
+
+class FakeProvider:
+    """
+        A local fake of yahoo_fin get_data serving business days of a fixed history up to `today`.
+    """
+
+    def __init__(self, today):
+        self.today = today
+        self.requests = list()
+
+    def get_data(self, ticker, start_date=None, end_date=None, index_as_date=False, interval="1d"):
+        self.requests.append(start_date)
+
+        dates = pd.bdate_range("2021-01-04", self.today)
+        if start_date:
+            dates = dates[dates >= pd.Timestamp(start_date)]
+
+        return pd.DataFrame({"date": dates,
+                             "open": 1.0, "high": 1.1, "low": 0.9, "close": 1.0, "adjclose": 1.0, "volume": 100,
+                             "ticker": ticker.upper()})
+
+
+class TestYahoo(unittest.TestCase):
+
+    def test_merge_stock_data_df(self):
+        stored_df = pd.DataFrame({"date": ["2021-01-04", "2021-01-05"], "close": [1.0, 2.0]})
+        df = pd.DataFrame({"date": pd.to_datetime(["2021-01-05", "2021-01-06"]), "close": [2.5, 3.0]})
+
+        merged_df = merge_stock_data_df(stored_df, df)
+
+        self.assertEqual(merged_df["close"].to_list(), [1.0, 2.5, 3.0])
+
+    def test_update_stock_market_data(self):
+        with tempfile.TemporaryDirectory() as path:
+            watchlist = os.path.join(path, "asx_watchlist")
+            with open(watchlist, "w") as f:
+                f.write("tls.ax\n")
+
+            provider = FakeProvider("2021-01-08")
+            stock_market_data_path = update_stock_market_data(watchlist, path=path, errors=dict(),
+                                                              stock_data_funcs={"price": provider.get_data})
+            self.assertEqual(stock_market_data_path, os.path.join(path, "asx_1d"))
+            self.assertIsNone(provider.requests[-1])
+
+            provider.today = "2021-01-12"
+            update_stock_market_data(watchlist, path=path, max_workers=2, rate=1000, errors=dict(),
+                                     stock_data_funcs={"price": provider.get_data})
+
+            # Only the tail from the last stored date is downloaded.
+            self.assertEqual(str(provider.requests[-1]), "2021-01-08")
+            self.assertEqual(str(last_stored_date("tls.ax", "price", stock_market_data_path)), "2021-01-12")
+
+            df = stock_data_dfs_read_csv("tls.ax", stock_market_data_path)["price"]
+            self.assertEqual(len(df), 7)
+            self.assertFalse(df["date"].duplicated().any())
+
+    def test_update_stock_market_data_download_kwargs(self):
+        with tempfile.TemporaryDirectory() as path:
+            watchlist = os.path.join(path, "asx_watchlist")
+            with open(watchlist, "w") as f:
+                f.write("tls.ax\n")
+
+            provider = FakeProvider("2021-01-08")
+            attempts = list()
+
+            def flaky_get_data(**kwargs):
+                attempts.append(1)
+                if len(attempts) == 1:
+                    raise ConnectionError("Connection reset by peer.")
+                return provider.get_data(**kwargs)
+
+            # Without max_workers, retries are honoured too.
+            errors = dict()
+            stock_market_data_path = update_stock_market_data(watchlist, path=path, errors=errors, retries=1,
+                                                              backoff=0, stock_data_funcs={"price": flaky_get_data})
+            self.assertEqual(errors, dict())
+            self.assertEqual(len(attempts), 2)
+            self.assertEqual(str(last_stored_date("tls.ax", "price", stock_market_data_path)), "2021-01-08")
+
+            with self.assertRaises(TypeError):
+                update_stock_market_data(watchlist, path=path, rate_limit=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
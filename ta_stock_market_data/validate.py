@@ -0,0 +1,172 @@
+"""
+    Data quality validation of price data.
+
+    Each stock is validated in one vectorized pass and summarised as a row of a quality index:
+
+        bars                    number of bars
+        first_date, last_date   first and last dates
+        last_valid_date         last date with valid open, high, low and close
+        missing_days            trading days of the calendar between first_date and last_date without a bar
+        duplicate_dates         bars with a duplicated date
+        nan_ohlc                bars with a NaN open, high, low or close
+        zero_ohlc               bars with a zero or negative open, high, low or close
+        high_lt_low             bars with high < low
+        stale                   last_valid_date is before as_of_date
+        action                  "ok", "repair" (see repair_price_df) or "skip"
+"""
+
+import numpy as np
+import pandas as pd
+
+from ta_stock_market_data.storage import get_storage
+
+OHLC = ["open", "high", "low", "close"]
+
+
+def _action(stale, bars, invalid_bars):
+    if bars == 0 or stale:
+        return "skip"
+    if invalid_bars > 0:
+        return "repair"
+
+    return "ok"
+
+
+def validate_price_df(df, calendar=None, as_of_date=None):
+    """
+        Validate the price df of a stock.
+
+    :param df:                      price df: date, open, high, low, close
+    :param calendar:                trading dates, defaults to business days
+    :param as_of_date:              the date the data should be up to
+    :return:                        quality index row, dict
+    """
+    dates = pd.to_datetime(df["date"])
+    ohlc = df[OHLC].to_numpy(dtype=float)
+
+    is_nan = np.isnan(ohlc).any(axis=1)
+    is_zero = (ohlc <= 0).any(axis=1)
+    is_high_lt_low = ohlc[:, 1] < ohlc[:, 2]
+    is_duplicate = dates.duplicated(keep=False).to_numpy()
+    is_valid = ~(is_nan | is_zero | is_high_lt_low)
+
+    first_date = dates.min() if len(df) else pd.NaT
+    last_date = dates.max() if len(df) else pd.NaT
+    last_valid_date = dates[is_valid].max() if is_valid.any() else pd.NaT
+
+    missing_days = 0
+    if len(df):
+        if calendar is None:
+            calendar = pd.bdate_range(first_date, last_date)
+        calendar = pd.DatetimeIndex(pd.to_datetime(calendar))
+        calendar = calendar[(calendar >= first_date) & (calendar <= last_date)]
+        missing_days = int((~calendar.isin(dates)).sum())
+
+    stale = pd.isnull(last_valid_date) or (as_of_date is not None and last_valid_date < pd.Timestamp(as_of_date))
+
+    return {
+        "bars": len(df),
+        "first_date": first_date,
+        "last_date": last_date,
+        "last_valid_date": last_valid_date,
+        "missing_days": missing_days,
+        "duplicate_dates": int(is_duplicate.sum()),
+        "nan_ohlc": int(is_nan.sum()),
+        "zero_ohlc": int(is_zero.sum()),
+        "high_lt_low": int(is_high_lt_low.sum()),
+        "stale": bool(stale),
+        "action": _action(stale, len(df), int((~is_valid | is_duplicate).sum())),
+    }
+
+
+def repair_price_df(df):
+    """
+        Repair a price df: sort by date, keep the last bar of a duplicated date and drop bars with NaN, zero or
+        negative prices or high < low.
+    """
+    df = df.assign(_date=pd.to_datetime(df["date"])).sort_values(by="_date", kind="stable")
+    df = df.drop_duplicates(subset="_date", keep="last")
+
+    ohlc = df[OHLC].to_numpy(dtype=float)
+    is_valid = ~(np.isnan(ohlc).any(axis=1) | (ohlc <= 0).any(axis=1) | (ohlc[:, 1] < ohlc[:, 2]))
+
+    return df[is_valid].drop(columns=["_date"]).reset_index(drop=True)
+
+
+def validate_stock_market_data(stock_codes, stock_market_data_path, as_of_date=None, calendar=None, backend="csv",
+                               loader=None):
+    """
+        Build the quality index of stock_codes, streaming over stored price data one stock at a time.
+        Stocks without price data are skipped.
+
+    :return:                        quality index df, indexed by stock_code
+    """
+    storage = get_storage(backend, stock_market_data_path)
+
+    quality_index = dict()
+    for stock_code in stock_codes:
+        if loader is not None:
+            df = loader.read_df(stock_code, "price")
+        else:
+            df = storage.read(stock_code, "price", columns=["date"] + OHLC)
+
+        if df is None:
+            quality_index[stock_code] = validate_price_df(pd.DataFrame(columns=["date"] + OHLC))
+        else:
+            quality_index[stock_code] = validate_price_df(df, calendar=calendar, as_of_date=as_of_date)
+
+    return _quality_index_df(quality_index)
+
+
+def validate_price_panel(panel, as_of_date=None):
+    """
+        Build the quality index of a PricePanel in one vectorized pass over the whole panel. The panel calendar is the
+        trading calendar and cannot hold duplicated dates.
+    """
+    ohlc = np.stack([panel.field(field) for field in OHLC], axis=-1)
+
+    has_bar = ~np.isnan(ohlc).all(axis=-1)
+    is_nan = has_bar & np.isnan(ohlc).any(axis=-1)
+    is_zero = (ohlc <= 0).any(axis=-1)
+    is_high_lt_low = ohlc[..., 1] < ohlc[..., 2]
+    is_valid = has_bar & ~(is_nan | is_zero | is_high_lt_low)
+
+    n = len(panel.dates)
+    bars = has_bar.sum(axis=1)
+    first = np.where(bars > 0, has_bar.argmax(axis=1), -1)
+    last = np.where(bars > 0, n - 1 - has_bar[:, ::-1].argmax(axis=1), -1)
+    last_valid = np.where(is_valid.any(axis=1), n - 1 - is_valid[:, ::-1].argmax(axis=1), -1)
+
+    dates = pd.DatetimeIndex(panel.dates.astype("datetime64[ns]"))
+
+    def date_at(j):
+        return dates[j] if j >= 0 else pd.NaT
+
+    quality_index = dict()
+    for i, stock_code in enumerate(panel.tickers):
+        last_valid_date = date_at(last_valid[i])
+        stale = pd.isnull(last_valid_date) or (as_of_date is not None and last_valid_date < pd.Timestamp(as_of_date))
+        invalid_bars = int((has_bar[i] & ~is_valid[i]).sum())
+
+        quality_index[stock_code] = {
+            "bars": int(bars[i]),
+            "first_date": date_at(first[i]),
+            "last_date": date_at(last[i]),
+            "last_valid_date": last_valid_date,
+            "missing_days": int(last[i] - first[i] + 1 - bars[i]) if bars[i] else 0,
+            "duplicate_dates": 0,
+            "nan_ohlc": int(is_nan[i].sum()),
+            "zero_ohlc": int(is_zero[i].sum()),
+            "high_lt_low": int(is_high_lt_low[i].sum()),
+            "stale": bool(stale),
+            "action": _action(stale, int(bars[i]), invalid_bars),
+        }
+
+    return _quality_index_df(quality_index)
+
+
+def _quality_index_df(quality_index):
+    df = pd.DataFrame.from_dict(quality_index, orient="index")
+    df.index.name = "stock_code"
+
+    return df
@@ -9,6 +9,14 @@ import pandas as pd
 from dateutil.relativedelta import relativedelta
 from yahoo_fin.stock_info import get_data, get_dividends, get_splits
 
+from ta_stock_market_data.storage import cast_stock_data_df, get_storage, stock_data_csv_filename
+
+STOCK_DATA_FUNCS = {
+    "price": get_data,
+    "dividend": get_dividends,
+    "splits": get_splits
+}
+
 
 def stock_data_dfs_to_csv(stock_data_dfs, stock_market_data_path):
     """
@@ -22,30 +30,40 @@ def stock_data_dfs_to_csv(stock_data_dfs, stock_market_data_path):
         df.to_csv(stock_data_path, index=False, header=True)
 
 
-def stock_data_dfs_read_csv(stock_code, stock_market_data_path):
+def stock_data_dfs_read_csv(stock_code, stock_market_data_path, backend="csv"):
     """
-        Read stock_data_dfs from CSVs.
+        Read stock_data_dfs from CSVs, or from another storage backend (see ta_stock_market_data.storage). Prices and
+        volumes of other backends are read as float64, as in CSVs parsed by pandas.
     """
-    # Split a stock_code into code and market, e.g, car.ax -> car, ax.
-    code, market = stock_code.split(".")
+    stock_data_dfs = get_storage(backend, stock_market_data_path).read_stock_data_dfs(stock_code)
 
-    stock_data_dfs = dict()
-    for data_type in ["price", "dividend", "splits"]:
-        # short_csv_filename.
-        csv_filename = "{market}_{code}_{date_type}.csv".format(
-            market=market,
-            code=code,
-            date_type=data_type)
+    if backend != "csv":
+        stock_data_dfs = {data_type: cast_stock_data_df(df, volume_dtype="float64", price_dtype="float64")
+                          for data_type, df in stock_data_dfs.items()}
 
-        stock_data_path = os.path.join(stock_market_data_path, csv_filename)
+    return stock_data_dfs
 
-        if os.path.exists(stock_data_path):
-            stock_data_dfs[data_type] = pd.read_csv(stock_data_path)
 
-    return stock_data_dfs
+def last_stored_date(stock_code, data_type, stock_market_data_path, backend="csv"):
+    """
+        The last date stored for a stock and data type, or None if nothing is stored.
+    """
+    return get_storage(backend, stock_market_data_path).last_date(stock_code, data_type)
 
 
-def get_stock_data(stock_code, data_types, start_date=None, end_date=None, interval="1d"):
+def merge_stock_data_df(stored_df, df):
+    """
+        Merge newly downloaded rows into stored rows. Rows are deduplicated on date, the downloaded row wins, and the
+        result is sorted by date.
+    """
+    df = pd.concat([stored_df, df], ignore_index=True)
+    df["date"] = pd.to_datetime(df["date"])
+
+    return df.drop_duplicates(subset="date", keep="last").sort_values(by="date").reset_index(drop=True)
+
+
+def get_stock_data(stock_code, data_types, start_date=None, end_date=None, interval="1d", stock_data_funcs=None,
+                   errors=None):
     """
         Get historical price, dividend and splits data for a stock between start_date and end_date.
 
@@ -54,14 +72,13 @@ def get_stock_data(stock_code, data_types, start_date=None, end_date=None, inter
     :param start_date:              start date, datetime
     :param end_date:                end date, datetime
     :param interval:                "1d", "1wk" or "1mo"
+    :param stock_data_funcs:        {data_type: func}, defaults to STOCK_DATA_FUNCS
+    :param errors:                  a list collecting error messages; if not given, messages are printed
     :return:                        stock_data_dfs: {csv_filename: df, ...},
                                     csv_filename: {market}_{code}_{data_type}.csv
     """
-    stock_data_funcs = {
-        "price": get_data,
-        "dividend": get_dividends,
-        "splits": get_splits
-    }
+    if stock_data_funcs is None:
+        stock_data_funcs = STOCK_DATA_FUNCS
 
     stock_data_dfs = dict()
     for data_type in data_types:
@@ -83,31 +100,58 @@ def get_stock_data(stock_code, data_types, start_date=None, end_date=None, inter
             start_date = df["date"].min()
             end_date = df["date"].max()
 
-            # Split a stock_code into code and market, e.g, car.ax -> car, ax.
-            code, market = stock_code.split(".")
-            name = "{market}_{code}_{date_type}.csv".format(
-                market=market,
-                code=code,
-                date_type=data_type)
-
-            stock_data_dfs[name] = df
+            stock_data_dfs[stock_data_csv_filename(stock_code, data_type)] = df
 
-            print("Historical {data_type} data are downloaded for {stock_code} between {start_date} and {end_date}".
-                  format(stock_code=stock_code, data_type=data_type, start_date=start_date, end_date=end_date))
+            if errors is None:
+                print("Historical {data_type} data are downloaded for {stock_code} between {start_date} and "
+                      "{end_date}".format(stock_code=stock_code, data_type=data_type, start_date=start_date,
+                                          end_date=end_date))
 
         except KeyError:
-            print("Historical {data_type} data are not available for {stock_code} between the given dates".
-                  format(stock_code=stock_code, data_type=data_type))
+            _report_error(errors, "Historical {data_type} data are not available for {stock_code} between the given "
+                                  "dates".format(stock_code=stock_code, data_type=data_type))
 
         except AssertionError:
-            print("Historical {data_type} data are not available for {stock_code}.".
-                  format(stock_code=stock_code, data_type=data_type))
+            _report_error(errors, "Historical {data_type} data are not available for {stock_code}.".
+                          format(stock_code=stock_code, data_type=data_type))
 
     return stock_data_dfs
 
 
+def _report_error(errors, message):
+    if errors is None:
+        print(message)
+    else:
+        errors.append(message)
+
+
+def _collect_errors(errors, stock_market_errors):
+    """
+        Collect the per-ticker error messages of a download into the errors dict, or print them if it is not given.
+    """
+    for stock_code, messages in stock_market_errors.items():
+        if errors is None:
+            for message in messages:
+                print(message)
+        else:
+            errors[stock_code] = messages
+
+
+def watchlist_market(watchlist):
+    """
+        Stock market of a watchlist: 'asx' or 'hs'.
+    """
+    if "asx" in watchlist:
+        return "asx"
+    elif "hs" in watchlist:
+        return "hs"
+
+    return ""
+
+
 def get_stock_market_data(watchlist, relative_days=None,
-                          data_types=None, start_date=None, end_date=None, interval="1d", path="data"):
+                          data_types=None, start_date=None, end_date=None, interval="1d", path="data",
+                          max_workers=None, errors=None, **download_kwargs):
     """
         Get historical price data for stocks presented in the watchlist.
 
@@ -125,15 +169,14 @@ def get_stock_market_data(watchlist, relative_days=None,
                 otherwise start_date=earliest and end_date = today.
 
         The data are exported into {path}/{stock_market}_{start_date}_{end_date}_{interval}.
+
+        If max_workers is given, the watchlist is downloaded concurrently by
+        ta_stock_market_data.downloader.download_stock_market_data (download_kwargs are passed on, e.g., rate,
+        retries, stock_data_funcs) and per-ticker error messages are collected into the errors dict. download_kwargs
+        without max_workers are honoured by the downloader with one worker.
     """
 
-    # stock market: 'asx' or 'hs'.
-    if "asx" in watchlist:
-        market = "asx"
-    elif "hs" in watchlist:
-        market = "hs"
-    else:
-        market = ""
+    market = watchlist_market(watchlist)
 
     # start_date and end_date.
     today = date.today()
@@ -164,13 +207,114 @@ def get_stock_market_data(watchlist, relative_days=None,
         end_date=end_date_str,
         interval=interval))
 
+    if max_workers or download_kwargs:
+        # Imported here as downloader depends on this module.
+        from ta_stock_market_data.downloader import download_stock_market_data
+
+        _, stock_market_errors = download_stock_market_data(
+            stock_codes=stock_codes,
+            data_types=data_types,
+            start_date=start_date,
+            end_date=end_date,
+            interval=interval,
+            max_workers=max_workers or 1,
+            on_stock_data=lambda _, stock_data_dfs: stock_data_dfs_to_csv(stock_data_dfs, stock_market_data_path),
+            **download_kwargs)
+
+        _collect_errors(errors, stock_market_errors)
+
+        return stock_market_data_path
+
     for stock_code in stock_codes:
+        stock_errors = None if errors is None else list()
         day_dfs = get_stock_data(stock_code=stock_code,
                                  data_types=data_types,
                                  start_date=start_date,
                                  end_date=end_date,
-                                 interval=interval)
+                                 interval=interval,
+                                 errors=stock_errors)
+
+        if stock_errors:
+            errors[stock_code] = stock_errors
 
         stock_data_dfs_to_csv(day_dfs, stock_market_data_path=stock_market_data_path)
 
     return stock_market_data_path
+
+
+def update_stock_market_data(watchlist, data_types=None, interval="1d", path="data", start_date=None,
+                             max_workers=None, errors=None, backend="csv", **download_kwargs):
+    """
+        Incrementally refresh the persistent store {path}/{stock_market}_{interval} for stocks presented in the
+        watchlist.
+
+        For each stock and data type, only the tail from the last stored date (inclusive, so that a revised last bar
+        is replaced) to today is downloaded, then merged with the stored rows and deduplicated on date. Stocks and data
+        types without stored data are downloaded from start_date (default earliest).
+
+        backend selects the storage backend, "csv" or "parquet" (see ta_stock_market_data.storage). download_kwargs
+        (e.g., rate, retries, stock_data_funcs) are passed on to
+        ta_stock_market_data.downloader.download_stock_market_data, which downloads with one worker if max_workers is
+        not given.
+    """
+    if data_types is None:
+        data_types = ["price"]
+
+    market = watchlist_market(watchlist)
+
+    with open(watchlist) as f:
+        stock_codes = [line.strip() for line in f.readlines()]
+
+    stock_market_data_path = os.path.join(path, "{market}_{interval}".format(market=market, interval=interval))
+    storage = get_storage(backend, stock_market_data_path)
+
+    start_dates = dict()
+    for stock_code in stock_codes:
+        for data_type in data_types:
+            start_dates[stock_code, data_type] = storage.last_date(stock_code, data_type) or start_date
+
+    def merge_to_storage(stock_code, stock_data_dfs):
+        for data_type in data_types:
+            csv_filename = stock_data_csv_filename(stock_code, data_type)
+            if csv_filename in stock_data_dfs:
+                df = merge_stock_data_df(storage.read(stock_code, data_type), stock_data_dfs[csv_filename])
+                storage.write(stock_code, data_type, df)
+
+    end_date = date.today()
+
+    if max_workers or download_kwargs:
+        from ta_stock_market_data.downloader import download_stock_market_data
+
+        _, stock_market_errors = download_stock_market_data(
+            stock_codes=stock_codes,
+            data_types=data_types,
+            start_date=start_date,
+            end_date=end_date,
+            interval=interval,
+            max_workers=max_workers or 1,
+            start_dates=start_dates,
+            on_stock_data=merge_to_storage,
+            **download_kwargs)
+
+        _collect_errors(errors, stock_market_errors)
+
+        return stock_market_data_path
+
+    for stock_code in stock_codes:
+        stock_errors = None if errors is None else list()
+
+        stock_data_dfs = dict()
+        for data_type in data_types:
+            stock_data_dfs.update(get_stock_data(stock_code=stock_code,
+                                                 data_types=[data_type],
+                                                 start_date=start_dates[stock_code, data_type],
+                                                 end_date=end_date,
+                                                 interval=interval,
+                                                 errors=stock_errors))
+
+        if stock_errors:
+            errors[stock_code] = stock_errors
+
+        merge_to_storage(stock_code, stock_data_dfs)
+
+    return stock_market_data_path
@@ -0,0 +1,282 @@
+"""
+    Strategy DSL.
+
+    A strategy is a boolean expression of conditions on fields, indicators, trends and candlestick patterns, e.g.,
+
+        close = field("close")
+        bbl, _, _ = bbands(close, length=20, std=2)
+        s = has_bars(60) & trend(close, 60).between(0, 45) & ((field("low") <= bbl) | (windowed_rsi(close) <= 35))
+
+    Expressions are compiled into a plan: the unique sub-expressions (by structure) of all strategies in evaluation
+    order. Evaluating a plan computes each of them once for every bar of a frame, the fields of a price df or of a
+    (ticker x date) PricePanel, so strategies run together share their indicators, trends and patterns.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ta_candlestick.multi_pattern import MULTI_PATTERN_MASKS
+from ta_candlestick.scanner import PATTERN_MASKS, extract_candlesticks
+from ta_indicator import indicator
+from ta_indicator.trend import rolling_slope
+
+FIELDS = ["open", "high", "low", "close", "volume"]
+
+
+class Expr:
+    """
+        An expression node: an op, its constant args and its child expressions. Expressions with the same key are the
+        same expression.
+    """
+
+    def __init__(self, op, args=(), children=()):
+        self.op = op
+        self.args = tuple(args)
+        self.children = tuple(children)
+        self.key = (op, self.args, tuple(child.key for child in self.children))
+
+    def __repr__(self):
+        return "Expr{key}".format(key=self.key)
+
+    def __bool__(self):
+        # A chained comparison, e.g., 0 <= trend <= 45, is (0 <= trend) and (trend <= 45), which would silently keep
+        # only its last comparison.
+        raise TypeError("An expression has no truth value, use & and | instead of and and or, and "
+                        "expr.between(lower, upper) instead of chained comparisons.")
+
+    def _compare(self, op, other):
+        if isinstance(other, Expr):
+            return Expr(op, children=(self, other))
+
+        return Expr(op, args=(other,), children=(self,))
+
+    def __lt__(self, other):
+        return self._compare("lt", other)
+
+    def __le__(self, other):
+        return self._compare("le", other)
+
+    def __gt__(self, other):
+        return self._compare("gt", other)
+
+    def __ge__(self, other):
+        return self._compare("ge", other)
+
+    def __and__(self, other):
+        return Expr("and", children=(self, other))
+
+    def __or__(self, other):
+        return Expr("or", children=(self, other))
+
+    def __invert__(self):
+        return Expr("not", children=(self,))
+
+    def between(self, lower, upper):
+        return (self >= lower) & (self <= upper)
+
+    def upward(self):
+        """
+            A trend (degree) is upward, see ta_indicator.trend.is_upward_or_downward_trend.
+        """
+        return Expr("upward", children=(self,))
+
+    def downward(self):
+        """
+            A trend (degree) is downward, NaN trends are neither upward nor downward.
+        """
+        return Expr("downward", children=(self,))
+
+
+# Expression builders.
+def field(name):
+    return Expr("field", args=(name,))
+
+
+def has_bars(n):
+    """
+        There are at least n bars up to and including the bar (and it is a bar, for panels).
+    """
+    return Expr("has_bars", args=(n,))
+
+
+def trend(y, window):
+    """
+        Degree of the trend of the last window values, see ta_indicator.trend.rolling_trend.
+    """
+    return Expr("trend", args=(window,), children=(y,))
+
+
+def sma(y, length=10):
+    return Expr("sma", args=(length,), children=(y,))
+
+
+def ema(y, length=10):
+    return Expr("ema", args=(length,), children=(y,))
+
+
+def rsi(y, length=14):
+    return Expr("rsi", args=(length,), children=(y,))
+
+
+def windowed_rsi(y, length=14, window=60):
+    return Expr("windowed_rsi", args=(length, window), children=(y,))
+
+
+def bbands(y, length=5, std=2):
+    """
+        lower, mid, upper Bollinger bands, sharing one bbands node.
+    """
+    bands = Expr("bbands", args=(length, std), children=(y,))
+
+    return tuple(Expr("item", args=(i,), children=(bands,)) for i in range(3))
+
+
+def candlesticks():
+    return Expr("candlesticks", children=tuple(field(name) for name in ["open", "close", "high", "low"]))
+
+
+def pattern(name, **params):
+    """
+        A single or multi-candle pattern of ta_candlestick.scanner or ta_candlestick.multi_pattern.
+    """
+    if name not in PATTERN_MASKS and name not in MULTI_PATTERN_MASKS:
+        raise ValueError("Unknown pattern {name}.".format(name=name))
+
+    return Expr("pattern", args=(name, tuple(sorted(params.items()))), children=(candlesticks(),))
+
+
+def bullish():
+    """
+        close >= open, see ta_candlestick.pattern.is_bullish_or_bearish_candlestick.
+    """
+    return Expr("bullish", children=(candlesticks(),))
+
+
+def _has_bars(frame, n):
+    return frame["has_bar"] & (np.cumsum(frame["has_bar"], axis=-1) >= n)
+
+
+def _pattern(c, name, params):
+    masks = PATTERN_MASKS if name in PATTERN_MASKS else MULTI_PATTERN_MASKS
+
+    return masks[name](c, **dict(params))
+
+
+def _compare(func):
+    def compare(frame, args, x, y=None):
+        with np.errstate(invalid="ignore"):
+            return func(x, args[0] if y is None else y)
+
+    return compare
+
+
+# op: func(frame, args, *child values)
+OPS = {
+    "field": lambda frame, args: frame[args[0]],
+    "has_bars": lambda frame, args: _has_bars(frame, args[0]),
+    "trend": lambda frame, args, y: np.degrees(np.arctan(rolling_slope(y, args[0]))),
+    "sma": lambda frame, args, y: indicator.sma(y, args[0]),
+    "ema": lambda frame, args, y: indicator.ema(y, args[0]),
+    "rsi": lambda frame, args, y: indicator.rsi(y, args[0]),
+    "windowed_rsi": lambda frame, args, y: indicator.windowed_rsi(y, args[0], args[1]),
+    "bbands": lambda frame, args, y: indicator.bbands(y, args[0], args[1]),
+    "item": lambda frame, args, values: values[args[0]],
+    "candlesticks": lambda frame, args, open_, close, high, low: extract_candlesticks(open_, close, high, low),
+    "pattern": lambda frame, args, c: _pattern(c, *args),
+    "bullish": lambda frame, args, c: c.bullish,
+    "upward": lambda frame, args, degree: degree > 0,
+    "downward": lambda frame, args, degree: degree <= 0,
+    "lt": _compare(lambda x, y: x < y),
+    "le": _compare(lambda x, y: x <= y),
+    "gt": _compare(lambda x, y: x > y),
+    "ge": _compare(lambda x, y: x >= y),
+    "and": lambda frame, args, x, y: x & y,
+    "or": lambda frame, args, x, y: x | y,
+    "not": lambda frame, args, x: ~x,
+}
+
+
+class Plan:
+    """
+        The unique sub-expressions of strategies in evaluation order (children first).
+    """
+
+    def __init__(self, strategies):
+        self.strategies = dict(strategies)
+        self.nodes = dict()
+
+        for expr in self.strategies.values():
+            self._add(expr)
+
+    def _add(self, expr):
+        if expr.key in self.nodes:
+            return
+
+        for child in expr.children:
+            self._add(child)
+        self.nodes[expr.key] = expr
+
+    def evaluate(self, frame):
+        """
+            Evaluate the strategies on a frame, see frame_from_df and frame_from_panel.
+
+        :return:                    {strategy: boolean mask}
+        """
+        values = dict()
+        for key, expr in self.nodes.items():
+            values[key] = OPS[expr.op](frame, expr.args, *(values[child.key] for child in expr.children))
+
+        return {name: np.asarray(values[expr.key], dtype=bool) for name, expr in self.strategies.items()}
+
+
+def compile_strategies(strategies):
+    """
+        Compile {name: expression} into a Plan.
+    """
+    return Plan(strategies)
+
+
+def frame_from_df(df):
+    """
+        The fields of a price df sorted by date, every row being a bar.
+    """
+    frame = {name: df[name].to_numpy(dtype=float) for name in FIELDS if name in df.columns}
+    frame["has_bar"] = np.ones(len(df), dtype=bool)
+
+    return frame
+
+
+def frame_from_panel(panel):
+    """
+        The (ticker x date) fields of a PricePanel, dates a ticker has no open, high, low and close on are not bars.
+    """
+    frame = {name: np.asarray(panel.field(name), dtype=float) for name in FIELDS if name in panel.field_index}
+    frame["has_bar"] = ~np.isnan(np.stack([frame[name] for name in ["open", "high", "low", "close"]])).all(axis=0)
+
+    return frame
+
+
+def _compiled(strategies):
+    return strategies if hasattr(strategies, "evaluate") else compile_strategies(strategies)
+
+
+def run_strategies(strategies, df):
+    """
+        Run strategies ({name: expression}, or a Plan or ta_strategy.executor.Executor of them) over the whole history
+        of a price df.
+
+    :return:                        df of date and one signal column per strategy, aligned to df
+    """
+    signals = pd.DataFrame(_compiled(strategies).evaluate(frame_from_df(df)), index=df.index)
+    signals.insert(0, "date", df["date"])
+
+    return signals
+
+
+def run_strategies_panel(strategies, panel):
+    """
+        Run strategies (see run_strategies) over all tickers and dates of a PricePanel.
+
+    :return:                        {strategy: (ticker x date) mask}
+    """
+    return _compiled(strategies).evaluate(frame_from_panel(panel))
@@ -0,0 +1,259 @@
+"""
+    Cost-based strategy executor.
+
+    A strategy expression (see ta_strategy.dsl) is split into its conjuncts, e.g., S01 into has_bars(60), the two bounds
+    of its trend, its Bollinger band or RSI condition and its hammer condition. The conjuncts are evaluated from the
+    cheapest and most selective to the most expensive and least selective, each on the (ticker, date) points the
+    previous ones passed only:
+
+        - cheap nodes (fields, candlestick patterns, recursive indicators like rsi and ema) are computed for the whole
+          frame once and shared by all strategies;
+        - window nodes (trend, sma, bbands, windowed_rsi) are computed on the surviving points only, from the gathered
+          window of values ending at each of them, when few enough points survive for gathering to pay off (see
+          GATHER_COSTS), otherwise on the whole frame.
+
+    The pass rate of each conjunct is recorded, so that the ordering follows the selectivity observed in real runs. It
+    can be seeded with the pass rates of a previous run.
+"""
+
+import numpy as np
+
+from ta_strategy.dsl import OPS, Plan
+
+# op: lookback (number of values of a window ending at a point) from the args of window nodes.
+WINDOW_OPS = {
+    "trend": lambda args: args[0],
+    "sma": lambda args: args[0],
+    "bbands": lambda args: args[0],
+    "windowed_rsi": lambda args: args[1],
+}
+
+# op: cost per point of a window node computed from the gathered windows of points, relative to its cost per point
+# on the whole frame, from its lookback. Computing on the whole frame is O(1) per point for running sums (trend, sma,
+# bbands) and vectorized, while gathering is O(lookback) per point, so a window node is computed on points only when
+# they are fewer than the frame size / gather cost, e.g., 1/90 of the frame for a 60-bar trend, 1/5 for 20-bar bbands.
+GATHER_COSTS = {
+    "trend": lambda lookback: 1.5 * lookback,
+    "sma": lambda lookback: 0.5 * lookback,
+    "bbands": lambda lookback: 0.25 * lookback,
+    "windowed_rsi": lambda lookback: 0.5 * lookback,
+}
+
+# Ops computed from the values of their children at the same point.
+POINTWISE_OPS = {"lt", "le", "gt", "ge", "and", "or", "not", "item", "upward", "downward"}
+
+# op: relative cost per point from its args, 1 for other ops.
+COSTS = {
+    "field": lambda args: 0,
+    "item": lambda args: 0,
+    "candlesticks": lambda args: 4,
+    "trend": lambda args: 2 * args[0],
+    "sma": lambda args: args[0],
+    "bbands": lambda args: 2 * args[0],
+    "windowed_rsi": lambda args: 3 * args[1],
+    "rsi": lambda args: 50,
+    "ema": lambda args: 50,
+}
+
+# The pass rate of a conjunct that has not been evaluated nor seeded.
+DEFAULT_PASS_RATE = 0.5
+
+
+def conjuncts(expr):
+    """
+        The conjuncts of an expression, i.e., the operands of its top-level and chain.
+    """
+    if expr.op == "and":
+        return [conjunct for child in expr.children for conjunct in conjuncts(child)]
+
+    return [expr]
+
+
+def cost(expr):
+    """
+        The relative cost per point of an expression, the sum of the costs of its unique nodes.
+    """
+    nodes = Plan({"expr": expr}).nodes.values()
+
+    return sum(COSTS[node.op](node.args) if node.op in COSTS else 1 for node in nodes)
+
+
+def _window_points(points, lookback):
+    """
+        Index arrays gathering the window of lookback values ending at each point, clipped at the first date.
+    """
+    dates = points[-1][:, np.newaxis] + np.arange(1 - lookback, 1)
+
+    return tuple(index[:, np.newaxis] for index in points[:-1]) + (np.maximum(dates, 0),), dates >= 0
+
+
+def _scatter(store, points, value):
+    if isinstance(value, tuple):
+        for s, v in zip(store, value):
+            s[points] = v
+    else:
+        store[points] = value
+
+
+def _gather(store, points):
+    if isinstance(store, tuple):
+        return tuple(s[points] for s in store)
+
+    return store[points]
+
+
+class Executor:
+    """
+        Evaluates strategies conjunct by conjunct in cost-based order, pruning the points each conjunct fails, e.g.,
+
+            executor = Executor({"s01": S01, "s02": S02})
+            signals = executor.evaluate(frame_from_panel(panel))
+            executor.pass_rates()
+
+        The signals are the same as those of Plan.evaluate.
+    """
+
+    def __init__(self, strategies, pass_rates=None):
+        self.strategies = dict(strategies)
+        self.conjuncts = {name: conjuncts(expr) for name, expr in self.strategies.items()}
+        self.costs = {name: [cost(conjunct) for conjunct in c] for name, c in self.conjuncts.items()}
+
+        # The seeded pass rates and the number of points each conjunct was evaluated on and passed.
+        self.seed = {name: list(rates) for name, rates in (pass_rates or dict()).items()}
+        self.evaluated = {name: np.zeros(len(c), dtype=int) for name, c in self.conjuncts.items()}
+        self.passed = {name: np.zeros(len(c), dtype=int) for name, c in self.conjuncts.items()}
+
+        # The number of points window nodes were computed on, on points or on the whole frame.
+        self.window_points = dict()
+
+        self._sparse = dict()
+
+    def pass_rates(self):
+        """
+            The pass rate of each conjunct of each strategy, observed if it has been evaluated, otherwise seeded.
+
+        :return:                    {strategy: [pass rate of each conjunct]}
+        """
+        pass_rates = dict()
+        for name, c in self.conjuncts.items():
+            seed = self.seed.get(name, [DEFAULT_PASS_RATE] * len(c))
+            pass_rates[name] = [float(self.passed[name][i] / self.evaluated[name][i]) if self.evaluated[name][i] else
+                                seed[i] for i in range(len(c))]
+
+        return pass_rates
+
+    def order(self, name):
+        """
+            The conjuncts of a strategy in evaluation order: by cost per point pruned, cost / (1 - pass rate).
+        """
+        pass_rates = self.pass_rates()[name]
+
+        return sorted(range(len(self.conjuncts[name])),
+                      key=lambda i: self.costs[name][i] / max(1 - pass_rates[i], 1e-6))
+
+    def _is_sparse(self, expr):
+        """
+            Whether an expression has window nodes to compute on points rather than on the whole frame.
+        """
+        if expr.key not in self._sparse:
+            self._sparse[expr.key] = expr.op in WINDOW_OPS or \
+                (expr.op in POINTWISE_OPS and any(self._is_sparse(child) for child in expr.children))
+
+        return self._sparse[expr.key]
+
+    def _count(self, expr, n):
+        self.window_points[expr.key] = self.window_points.get(expr.key, 0) + n
+
+    def _full(self, expr, frame, values):
+        if expr.key not in values:
+            children = [self._full(child, frame, values) for child in expr.children]
+            values[expr.key] = OPS[expr.op](frame, expr.args, *children)
+            if expr.op in WINDOW_OPS:
+                self._count(expr, frame["has_bar"].size)
+
+        return values[expr.key]
+
+    def _window(self, expr, frame, values, points):
+        """
+            A window node on points, from the gathered windows of its child (computed on the whole frame).
+        """
+        lookback = WINDOW_OPS[expr.op](expr.args)
+        y = self._full(expr.children[0], frame, values)
+
+        self._count(expr, len(points[0]))
+
+        window_points, is_date = _window_points(points, lookback)
+        windows = np.where(is_date, y[window_points], np.nan)
+        value = OPS[expr.op](frame, expr.args, windows)
+
+        # Points without a full window have no value, as for the whole frame.
+        has_window = points[-1] >= lookback - 1
+        if isinstance(value, tuple):
+            return tuple(np.where(has_window, v[..., -1], np.nan) for v in value)
+
+        return np.where(has_window, value[..., -1], np.nan)
+
+    def _at(self, expr, frame, values, sparse_values, points):
+        """
+            The values of an expression on points. Window nodes are cached on the points they were computed on, or
+            computed on the whole frame when gathering their windows would cost more.
+        """
+        if not self._is_sparse(expr) or expr.key in values:
+            return _gather(self._full(expr, frame, values), points)
+
+        if expr.op in WINDOW_OPS:
+            gather_cost = GATHER_COSTS[expr.op](WINDOW_OPS[expr.op](expr.args))
+            if len(points[0]) * gather_cost >= frame["has_bar"].size:
+                return _gather(self._full(expr, frame, values), points)
+
+            if expr.key not in sparse_values:
+                sparse_values[expr.key] = (None, np.zeros(frame["has_bar"].shape, dtype=bool))
+            store, computed = sparse_values[expr.key]
+
+            missing = ~computed[points]
+            if missing.any():
+                missing_points = tuple(index[missing] for index in points)
+                value = self._window(expr, frame, values, missing_points)
+                if store is None:
+                    shape = frame["has_bar"].shape
+                    store = tuple(np.full(shape, np.nan) for _ in value) if isinstance(value, tuple) else \
+                        np.full(shape, np.nan)
+                    sparse_values[expr.key] = (store, computed)
+                _scatter(store, missing_points, value)
+                computed[missing_points] = True
+
+            return _gather(store, points)
+
+        children = [self._at(child, frame, values, sparse_values, points) for child in expr.children]
+
+        return OPS[expr.op](frame, expr.args, *children)
+
+    def evaluate(self, frame):
+        """
+            Evaluate the strategies on a frame (see dsl.frame_from_df and dsl.frame_from_panel), updating the pass
+            rates.
+
+        :return:                    {strategy: boolean mask}
+        """
+        values = dict()
+        sparse_values = dict()
+        shape = frame["has_bar"].shape
+
+        signals = dict()
+        for name in self.strategies:
+            alive = np.ones(shape, dtype=bool)
+            for i in self.order(name):
+                points = np.nonzero(alive)
+                if len(points[0]) == 0:
+                    break
+
+                passed = np.asarray(self._at(self.conjuncts[name][i], frame, values, sparse_values, points),
+                                    dtype=bool)
+                alive[points] = passed
+
+                self.evaluated[name][i] += len(passed)
+                self.passed[name][i] += passed.sum()
+
+            signals[name] = alive
+
+        return signals
@@ -7,32 +7,62 @@
     1 and (3 or 4) and 4
 """
 from datetime import date
+from functools import partial
 
 import numpy as np
 import pandas as pd
-# noinspection PyUnresolvedReferences
-import pandas_ta as ta
 from dateutil.relativedelta import relativedelta
 
 from ta_candlestick.pattern import is_hammer, is_inverted_hammer
+from ta_indicator.cache import data_version, get_indicator
 from ta_indicator.trend import is_upward_or_downward_trend
+from ta_strategy import dsl
+from ta_stock_market_data.validate import repair_price_df, validate_stock_market_data
 from ta_stock_market_data.yahoo import stock_data_dfs_read_csv
 
 relative_days = 366
 
+# S01 as a strategy DSL expression, see ta_strategy.dsl.
+S01 = dsl.has_bars(60) & dsl.trend(dsl.field("close"), 60).between(0, 45) & \
+    ((dsl.field("low") <= dsl.bbands(dsl.field("close"), length=20, std=2)[0]) |
+     (dsl.windowed_rsi(dsl.field("close"), length=14, window=60) <= 35)) & \
+    (dsl.pattern("hammer", t1=1, t3=2, small_body=0.1) | dsl.pattern("inverted_hammer", t1=2, t3=1, small_body=0.1))
 
-def exec_s01(df, exec_date):
+
+def exec_s01(df, exec_date, cache=None):
+    """
+        S01 on exec_date. If an IndicatorCache is given, the signal is read from signals_s01 of the whole df, with
+        cached indicators.
+    """
     df0 = df[df.date <= exec_date]
 
     # Validate whether df has sufficient data.
     # At least S01 requires 60 trading days' data.
-    if df0.iloc[-1]["date"] != exec_date:
+    if pd.Timestamp(df0.iloc[-1]["date"]) != pd.Timestamp(exec_date):
         print(df0.iloc[-1]["ticker"])
         raise ValueError("The stock data is inconsistent with the given exec_date.")
 
     if len(df0) < 60:
         return False
 
+    if cache is not None:
+        # The signals of a bar only depend on the bars up to it, so the row of exec_date of the whole df is the signal
+        # on df0. The whole df keeps one data version for every exec_date, so its indicators are cache hits.
+        return bool(signals_s01(df, cache).loc[df0.index[-1], "signal"])
+
+    # pandas_ta registers the DataFrame.ta accessor, imported here so that the vectorized S01 works without it.
+    # noinspection PyUnresolvedReferences
+    import pandas_ta  # noqa: F401
+
+    # condition 4: hammer/inverted_hammer candlestick
+    # The signal requires it, so check this single-bar test before fitting the trend and computing indicators.
+    today_candlestick = df0.iloc[-1]
+
+    if is_hammer(today_candlestick, 1, 2, 0.1) or is_inverted_hammer(today_candlestick, 2, 1, 0.1):
+        cond4 = True
+    else:
+        return False
+
     # condition 1: moderately bullish in past 12 weeks (12 * 5 = 60 trading days)
     df1 = df0.iloc[-60:]
 
@@ -65,14 +95,6 @@ def exec_s01(df, exec_date):
     else:
         cond3 = False
 
-    # condition 4: hammer/inverted_hammer candlestick
-    today_candlestick = df0.iloc[-1]
-
-    if is_hammer(today_candlestick, 1, 2, 0.1) or is_inverted_hammer(today_candlestick, 2, 1, 0.1):
-        cond4 = True
-    else:
-        cond4 = False
-
     # TODO test only
     # cond4 = True
     if cond1 and (cond2 or cond3) and cond4:
@@ -83,13 +105,80 @@ def exec_s01(df, exec_date):
     return False
 
 
-def exec_strategy(watchlist, stock_market_data_path):
+def signals_s01(df, cache=None):
+    """
+        S01 for every date of df (sorted by date) in one pass, the same as exec_s01(df, date) on each date. Indicators
+        are read from an IndicatorCache if one is given.
+
+    :return:                        df of date, cond1, cond2, cond3, cond4 and signal, aligned to df
+    """
+    # Hash the df once for all its indicators.
+    indicator = partial(get_indicator, df, cache=cache, version=data_version(df) if cache is not None else None)
+
+    low = df["low"].to_numpy(dtype=float)
+    # exec_s01 requires 60 trading days' data.
+    has_data = np.arange(len(df)) >= 59
+
+    # condition 1: moderately bullish in past 12 weeks (12 * 5 = 60 trading days)
+    degree1 = indicator("trend", window=60)["degree"].to_numpy()
+    cond1 = (0 <= degree1) & (degree1 <= 45)
+
+    # condition 2: break lower bollinger band (low price)
+    bbl = indicator("bbands", length=20, std=2)["lower"].to_numpy()
+    cond2 = low <= bbl
+
+    # condition 3: rsi <= 35, the rsi of the past 60 trading days
+    cond3 = indicator("windowed_rsi", length=14, window=60)["rsi"].to_numpy() <= 35
+
+    # condition 4: hammer/inverted_hammer candlestick
+    hammer = indicator("candlestick", pattern="hammer", t1=1, t3=2, small_body=0.1)["hammer"]
+    inverted_hammer = indicator("candlestick", pattern="inverted_hammer", t1=2, t3=1, small_body=0.1)["inverted_hammer"]
+    cond4 = hammer.to_numpy() | inverted_hammer.to_numpy()
+
+    signals = pd.DataFrame({"date": df["date"], "cond1": cond1 & has_data, "cond2": cond2 & has_data,
+                            "cond3": cond3 & has_data, "cond4": cond4 & has_data}, index=df.index)
+    signals["signal"] = signals["cond1"] & (signals["cond2"] | signals["cond3"]) & signals["cond4"]
+
+    return signals
+
+
+def exec_strategy(watchlist, stock_market_data_path, loader=None, validate=False, quality_index=None, cache=None,
+                  backend="csv"):
+    """
+        Execute S01 for stocks presented in the watchlist. A StockDataLoader (with float64 prices) can be given to share
+        parsed stock data between strategies, and an IndicatorCache to share their indicator series.
+
+        backend selects the storage backend stock data are read from, "csv" or "parquet" (see
+        ta_stock_market_data.storage); Parquet stores written with float64 prices give the same signals as CSVs.
+
+        If validate is True, a quality index (see ta_stock_market_data.validate) is built up front unless one is given.
+        Stocks whose data are stale or missing are skipped and stocks with invalid bars are repaired.
+    """
+    if loader is not None and loader.price_dtype != "float64":
+        raise ValueError("Strategies need float64 prices, the loader reads {dtype} prices.".format(
+            dtype=loader.price_dtype))
+
     with open(watchlist) as f:
         stock_codes = [line.strip() for line in f.readlines()]
 
+    today = str(date.today() - relativedelta(days=1))
+    if validate and quality_index is None:
+        quality_index = validate_stock_market_data(stock_codes, stock_market_data_path, as_of_date=today,
+                                                   backend=backend, loader=loader)
+
     results = list()
     for stock_code in stock_codes:
-        dfs = stock_data_dfs_read_csv(stock_code, stock_market_data_path)
+        action = "ok"
+        if quality_index is not None:
+            action = quality_index["action"].get(stock_code, "skip")
+            if action == "skip":
+                print("{stock} is skipped by data quality validation.".format(stock=stock_code))
+                continue
+
+        if loader is not None:
+            dfs = loader.read(stock_code, data_types=["price"])
+        else:
+            dfs = stock_data_dfs_read_csv(stock_code, stock_market_data_path, backend=backend)
 
         if "price" not in dfs:
             print("{stock} does not have price data.".format(stock=stock_code))
@@ -97,12 +186,13 @@ def exec_strategy(watchlist, stock_market_data_path):
         else:
             df = dfs["price"]
 
-        today = str(date.today() - relativedelta(days=1))
-        if exec_s01(df, today):
+        if action == "repair":
+            df = repair_price_df(df)
+
+        if exec_s01(df, today, cache=cache):
             print(stock_code)
-            today = df.iloc[-1]["date"]
             strategy_no = "s01"
-            results.append({"date": today, "strategy": strategy_no, "stock_code": stock_code})
+            results.append({"date": df.iloc[-1]["date"], "strategy": strategy_no, "stock_code": stock_code})
 
     return results
 
@@ -113,7 +203,8 @@ if __name__ == "__main__":
     #                                                    data_types=["price"])
     s01_stock_market_data_path = "data/asx_20200125_20210125_1d"
     s01_results = exec_strategy(watchlist="data/stock_codes/asx_200_stock_codes",
-                                stock_market_data_path=s01_stock_market_data_path)
+                                stock_market_data_path=s01_stock_market_data_path,
+                                validate=True)
 
     pd.DataFrame(s01_results).to_csv("data/results/strategy_{no}_{today}.csv".format(
         no="s01",
@@ -6,29 +6,48 @@
 """
 
 from datetime import date
+from functools import partial
 
 import numpy as np
 import pandas as pd
 from dateutil.relativedelta import relativedelta
 
 from ta_candlestick.pattern import is_bullish_or_bearish_candlestick, is_hammer, is_inverted_hammer
-from ta_indicator.trend import is_upward_or_downward_trend
+from ta_candlestick.scanner import extract_candlesticks, hammer_mask, inverted_hammer_mask
+from ta_indicator.cache import data_version, get_indicator
+from ta_indicator.trend import is_upward_or_downward_trend, rolling_trend
+from ta_strategy import dsl
+from ta_stock_market_data.validate import repair_price_df, validate_stock_market_data
 from ta_stock_market_data.yahoo import get_stock_market_data, stock_data_dfs_read_csv
 
 relative_days = 14
 
+# S02 as a strategy DSL expression, see ta_strategy.dsl.
+S02 = dsl.has_bars(7) & (dsl.trend(dsl.field("close"), 7) < 0) & \
+    (dsl.pattern("hammer", t1=1, t3=2, small_body=0.1) | dsl.pattern("inverted_hammer", t1=2, t3=1, small_body=0.1)) & \
+    dsl.bullish() & dsl.trend(dsl.field("volume"), 7).downward()
 
-def exec_s02(df, exec_date):
+
+def exec_s02(df, exec_date, cache=None):
+    """
+        S02 on exec_date. If an IndicatorCache is given, the signal is read from signals_s02 of the whole df, with
+        cached indicators.
+    """
     df0 = df[df.date <= exec_date]
 
     # Validate whether df has sufficient data.
     # At least S02 requires 7 trading days' data.
-    if df0.iloc[-1]["date"] != exec_date:
+    if pd.Timestamp(df0.iloc[-1]["date"]) != pd.Timestamp(exec_date):
         raise ValueError("The stock data is inconsistent with the given exec_date.")
 
     if len(df0) < 7:
         return False
 
+    if cache is not None:
+        # The signals of a bar only depend on the bars up to it, so the row of exec_date of the whole df is the signal
+        # on df0. The whole df keeps one data version for every exec_date, so its indicators are cache hits.
+        return bool(signals_s02(df, cache).loc[df0.index[-1], "signal"])
+
     # condition 1: bearish in past 1 week.
     if len(df0) > 7:
         df1 = df0.iloc[-7:]
@@ -74,13 +93,111 @@ def exec_s02(df, exec_date):
     return False
 
 
-def exec_strategy(watchlist, stock_market_data_path):
+def _signals_s02(degree, volume_upward_or_downward, hammer, bullish, has_data):
+    # condition 1: bearish in past 1 week.
+    cond1 = degree < 0
+
+    # condition 2: hammer/inverted_hammer candlestick
+    cond2 = hammer
+
+    # condition 3: close higher than open
+    cond3 = bullish
+
+    # condition 4: volume presented in a declining trend
+    cond4 = volume_upward_or_downward == "downward"
+
+    conds = {"cond1": cond1 & has_data, "cond2": cond2 & has_data, "cond3": cond3 & has_data,
+             "cond4": cond4 & has_data}
+    conds["signal"] = conds["cond1"] & conds["cond2"] & conds["cond3"] & conds["cond4"]
+
+    return conds
+
+
+def signals_s02(df, cache=None):
+    """
+        S02 for every date of df (sorted by date) in one pass, the same as exec_s02(df, date) on each date. Indicators
+        are read from an IndicatorCache if one is given.
+
+    :return:                        df of date, cond1, cond2, cond3, cond4 and signal, aligned to df
+    """
+    # Hash the df once for all its indicators.
+    indicator = partial(get_indicator, df, cache=cache, version=data_version(df) if cache is not None else None)
+
+    # exec_s02 requires 7 trading days' data.
+    has_data = np.arange(len(df)) >= 6
+
+    degree = indicator("trend", window=7)["degree"].to_numpy()
+    volume_upward_or_downward = indicator("trend", window=7, column="volume")["upward_or_downward"].to_numpy()
+    hammer = indicator("candlestick", pattern="hammer", t1=1, t3=2, small_body=0.1)["hammer"]
+    inverted_hammer = indicator("candlestick", pattern="inverted_hammer", t1=2, t3=1, small_body=0.1)["inverted_hammer"]
+    bullish = df["close"].to_numpy(dtype=float) >= df["open"].to_numpy(dtype=float)
+
+    conds = _signals_s02(degree, volume_upward_or_downward, hammer.to_numpy() | inverted_hammer.to_numpy(), bullish,
+                         has_data)
+
+    signals = pd.DataFrame(conds, index=df.index)
+    signals.insert(0, "date", df["date"])
+
+    return signals
+
+
+def signals_s02_panel(panel):
+    """
+        S02 for every ticker and date of a PricePanel in one pass. The 7 trading days of a ticker are the last 7 dates
+        of the panel calendar, and dates a ticker has no bar on are False.
+
+    :return:                        {cond1, cond2, cond3, cond4, signal: (ticker x date) mask}
+    """
+    open_, high, low, close, volume = (panel.field(field) for field in ["open", "high", "low", "close", "volume"])
+
+    has_bar = ~np.isnan(np.stack([open_, high, low, close])).all(axis=0)
+    has_data = has_bar & (np.cumsum(has_bar, axis=-1) >= 7)
+
+    _, degree = rolling_trend(close, 7)
+    volume_upward_or_downward, _ = rolling_trend(volume, 7)
+    candlesticks = extract_candlesticks(open_, close, high, low)
+    hammer = hammer_mask(candlesticks, 1, 2, 0.1) | inverted_hammer_mask(candlesticks, 2, 1, 0.1)
+
+    return _signals_s02(degree, volume_upward_or_downward, hammer, candlesticks.bullish, has_data)
+
+
+def exec_strategy(watchlist, stock_market_data_path, loader=None, validate=False, quality_index=None, cache=None,
+                  backend="csv"):
+    """
+        Execute S02 for stocks presented in the watchlist. A StockDataLoader (with float64 prices) can be given to share
+        parsed stock data between strategies, and an IndicatorCache to share their indicator series.
+
+        backend selects the storage backend stock data are read from, "csv" or "parquet" (see
+        ta_stock_market_data.storage); Parquet stores written with float64 prices give the same signals as CSVs.
+
+        If validate is True, a quality index (see ta_stock_market_data.validate) is built up front unless one is given.
+        Stocks whose data are stale or missing are skipped and stocks with invalid bars are repaired.
+    """
+    if loader is not None and loader.price_dtype != "float64":
+        raise ValueError("Strategies need float64 prices, the loader reads {dtype} prices.".format(
+            dtype=loader.price_dtype))
+
     with open(watchlist) as f:
         stock_codes = [line.strip() for line in f.readlines()]
 
+    today = str(date.today() - relativedelta(days=1))
+    if validate and quality_index is None:
+        quality_index = validate_stock_market_data(stock_codes, stock_market_data_path, as_of_date=today,
+                                                   backend=backend, loader=loader)
+
     results = list()
     for stock_code in stock_codes:
-        dfs = stock_data_dfs_read_csv(stock_code, stock_market_data_path)
+        action = "ok"
+        if quality_index is not None:
+            action = quality_index["action"].get(stock_code, "skip")
+            if action == "skip":
+                print("{stock} is skipped by data quality validation.".format(stock=stock_code))
+                continue
+
+        if loader is not None:
+            dfs = loader.read(stock_code, data_types=["price"])
+        else:
+            dfs = stock_data_dfs_read_csv(stock_code, stock_market_data_path, backend=backend)
 
         if "price" not in dfs:
             print("{stock} does not have price data.".format(stock=stock_code))
@@ -88,12 +205,13 @@ def exec_strategy(watchlist, stock_market_data_path):
         else:
             df = dfs["price"]
 
-        today = str(date.today() - relativedelta(days=1))
-        if exec_s02(df, today):
+        if action == "repair":
+            df = repair_price_df(df)
+
+        if exec_s02(df, today, cache=cache):
             print(stock_code)
-            today = df.iloc[-1]["date"]
             strategy_no = "s02"
-            results.append({"date": today, "strategy": strategy_no, "stock_code": stock_code})
+            results.append({"date": df.iloc[-1]["date"], "strategy": strategy_no, "stock_code": stock_code})
 
     return results
 
@@ -0,0 +1,223 @@
+"""
+    Incremental strategy state.
+
+    A strategy state keeps the incremental indicators (see ta_indicator.incremental) a strategy needs for one stock, so
+    that a new bar updates its conditions and signal in O(1) instead of recomputing them from the history. The states of
+    a watchlist are checkpointed into {path}/{strategy}_state.json and rebuilt from the history of a stock when missing.
+    NaN values of the indicators (e.g., missing closes) are checkpointed as null, as NaN is not valid JSON.
+"""
+
+import json
+import math
+import os
+
+import pandas as pd
+
+from ta_candlestick.pattern import is_bullish_or_bearish_candlestick, is_hammer, is_inverted_hammer
+from ta_indicator.incremental import RollingBbands, WindowedRSI
+from ta_indicator.trend import RollingTrend
+
+
+def nan_to_none(value):
+    """
+        Replace NaN floats of nested dicts and lists with None.
+    """
+    if isinstance(value, dict):
+        return {key: nan_to_none(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [nan_to_none(v) for v in value]
+    if isinstance(value, float) and math.isnan(value):
+        return None
+
+    return value
+
+
+def none_to_nan(value):
+    """
+        Replace None of nested dicts and lists with NaN, the inverse of nan_to_none for indicator states.
+    """
+    if isinstance(value, dict):
+        return {key: none_to_nan(v) for key, v in value.items()}
+    if isinstance(value, list):
+        return [none_to_nan(v) for v in value]
+    if value is None:
+        return math.nan
+
+    return value
+
+
+class S01State:
+    """
+        S01 state: 60-bar trend of close, 20-bar Bollinger bands of close and 60-bar RSI, see s01.signals_s01.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.last_date = None
+        self.trend = RollingTrend(60)
+        self.bbands = RollingBbands(length=20, std=2)
+        self.rsi = WindowedRSI(length=14, window=60)
+
+    def update(self, candlestick):
+        """
+            Update the state with the next bar (date, open, high, low, close) and return its conditions and signal.
+        """
+        self.n += 1
+        self.last_date = pd.Timestamp(candlestick["date"])
+
+        self.trend.push(candlestick["close"])
+        bbl, _, _ = self.bbands.update(candlestick["close"])
+        rsi = self.rsi.update(candlestick["close"])
+
+        # S01 requires 60 trading days' data.
+        has_data = self.n >= 60
+        _, degree1 = self.trend.trend()
+
+        conds = {
+            "cond1": has_data and 0 <= degree1 <= 45,
+            "cond2": has_data and candlestick["low"] <= bbl,
+            "cond3": has_data and rsi <= 35,
+            "cond4": has_data and (is_hammer(candlestick, 1, 2, 0.1) or is_inverted_hammer(candlestick, 2, 1, 0.1)),
+        }
+        conds["signal"] = conds["cond1"] and (conds["cond2"] or conds["cond3"]) and conds["cond4"]
+
+        return {name: bool(cond) for name, cond in conds.items()}
+
+    def to_dict(self):
+        return {"n": self.n, "last_date": self.last_date.strftime("%Y-%m-%d") if self.last_date is not None else None,
+                "trend": nan_to_none(self.trend.to_dict()), "bbands": nan_to_none(self.bbands.to_dict()),
+                "rsi": nan_to_none(self.rsi.to_dict())}
+
+    @classmethod
+    def from_dict(cls, state):
+        s01_state = cls()
+        s01_state.n = state["n"]
+        s01_state.last_date = pd.Timestamp(state["last_date"]) if state["last_date"] is not None else None
+        s01_state.trend = RollingTrend.from_dict(none_to_nan(state["trend"]))
+        s01_state.bbands = RollingBbands.from_dict(none_to_nan(state["bbands"]))
+        s01_state.rsi = WindowedRSI.from_dict(none_to_nan(state["rsi"]))
+
+        return s01_state
+
+
+class S02State:
+    """
+        S02 state: 7-bar trends of close and volume, see s02.signals_s02.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.last_date = None
+        self.trend = RollingTrend(7)
+        self.volume_trend = RollingTrend(7)
+
+    def update(self, candlestick):
+        """
+            Update the state with the next bar (date, open, high, low, close, volume) and return its conditions and
+            signal.
+        """
+        self.n += 1
+        self.last_date = pd.Timestamp(candlestick["date"])
+
+        self.trend.push(candlestick["close"])
+        self.volume_trend.push(candlestick["volume"])
+
+        # S02 requires 7 trading days' data.
+        has_data = self.n >= 7
+        _, degree = self.trend.trend()
+        is_upward_or_downward, _ = self.volume_trend.trend()
+
+        conds = {
+            "cond1": has_data and degree < 0,
+            "cond2": has_data and (is_hammer(candlestick, 1, 2, 0.1) or is_inverted_hammer(candlestick, 2, 1, 0.1)),
+            "cond3": has_data and is_bullish_or_bearish_candlestick(candlestick) == "bullish",
+            "cond4": has_data and is_upward_or_downward == "downward",
+        }
+        conds["signal"] = conds["cond1"] and conds["cond2"] and conds["cond3"] and conds["cond4"]
+
+        return {name: bool(cond) for name, cond in conds.items()}
+
+    def to_dict(self):
+        return {"n": self.n, "last_date": self.last_date.strftime("%Y-%m-%d") if self.last_date is not None else None,
+                "trend": nan_to_none(self.trend.to_dict()), "volume_trend": nan_to_none(self.volume_trend.to_dict())}
+
+    @classmethod
+    def from_dict(cls, state):
+        s02_state = cls()
+        s02_state.n = state["n"]
+        s02_state.last_date = pd.Timestamp(state["last_date"]) if state["last_date"] is not None else None
+        s02_state.trend = RollingTrend.from_dict(none_to_nan(state["trend"]))
+        s02_state.volume_trend = RollingTrend.from_dict(none_to_nan(state["volume_trend"]))
+
+        return s02_state
+
+
+STRATEGY_STATES = {
+    "s01": S01State,
+    "s02": S02State,
+}
+
+
+class StrategyStateStore:
+    """
+        The strategy states of stocks, checkpointed into {path}/{strategy}_state.json.
+    """
+
+    def __init__(self, path, strategy):
+        if strategy not in STRATEGY_STATES:
+            raise ValueError("Unknown strategy {strategy}.".format(strategy=strategy))
+
+        self.path = path
+        self.strategy = strategy
+        self.state_cls = STRATEGY_STATES[strategy]
+        self.state_path = os.path.join(path, "{strategy}_state.json".format(strategy=strategy))
+
+        self.states = dict()
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                states = json.load(f)
+            self.states = {stock_code: self.state_cls.from_dict(state) for stock_code, state in states.items()}
+
+    def rebuild(self, stock_code, df):
+        """
+            Rebuild the state of a stock from its history, a price df sorted by date.
+        """
+        self.states.pop(stock_code, None)
+
+        return self.update(stock_code, df)
+
+    def update(self, stock_code, df):
+        """
+            Update the state of a stock with the bars of a price df (sorted by date) after its last date, rebuilding it
+            from the whole df if the stock has no state. Returns the conditions and signal of the last bar, or None if
+            there are no new bars.
+        """
+        state = self.states.get(stock_code)
+        if state is None:
+            state = self.states[stock_code] = self.state_cls()
+
+        # The new bars are the tail after the last date, found from the end so that a daily update costs O(new bars)
+        # rather than a pass over the whole history.
+        start = 0
+        if state.last_date is not None:
+            dates = df["date"]
+            start = len(df)
+            while start > 0 and pd.Timestamp(dates.iloc[start - 1]) > state.last_date:
+                start -= 1
+
+        conds = None
+        for candlestick in df.iloc[start:].to_dict(orient="records"):
+            conds = state.update(candlestick)
+
+        return conds
+
+    def checkpoint(self):
+        """
+            Save the states, replacing the checkpoint file atomically.
+        """
+        os.makedirs(self.path, exist_ok=True)
+
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({stock_code: state.to_dict() for stock_code, state in self.states.items()}, f, allow_nan=False)
+        os.replace(tmp_path, self.state_path)
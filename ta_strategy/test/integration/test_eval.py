@@ -1,8 +1,8 @@
 import pandas as pd
 
-from ta_stock_market_data.yahoo import stock_data_dfs_read_csv
+from ta_stock_market_data.loader import StockDataLoader
 from ta_strategy.eval import eval_increase
-from ta_strategy.s01 import exec_s01
+from ta_strategy.s01 import signals_s01
 
 if __name__ == '__main__':
     watchlist = "data/test/asx_watchlist"
@@ -14,10 +14,13 @@ if __name__ == '__main__':
     with open(watchlist) as f:
         stock_codes = [line.strip() for line in f.readlines()]
 
+    # Experiments share parsed stock data.
+    loader = StockDataLoader(stock_market_data_path)
+
     results = list()
     for stock_code in stock_codes[4:5]:
         print(stock_code)
-        dfs = stock_data_dfs_read_csv(stock_code, stock_market_data_path)
+        dfs = loader.read(stock_code, data_types=["price"])
 
         if "price" not in dfs:
             print("{stock} does not have price data.".format(stock=stock_code))
@@ -29,10 +32,13 @@ if __name__ == '__main__':
         window_size = 10
         results = list()
 
+        # S01 of every date in one pass, the same as exec_s01(df, exec_date).
+        signals = signals_s01(df)["signal"].to_numpy()
+
         t = 0
         while t < n:
             exec_date = df.iloc[t]["date"]
-            if exec_s01(df, exec_date):
+            if signals[t]:
                 # print(exec_date, stock_code)
                 if t + window_size < n:
                     y = df.iloc[t:t + window_size + 1]["close"]
@@ -0,0 +1,46 @@
+"""
+    Test data shared by the unit tests.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ta_stock_market_data.panel import PricePanel
+
+
+def make_s01_price_df(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 5 + np.cumsum(rng.normal(0, 0.05, n))
+    open_ = close + rng.normal(0, 0.01, n)
+    high = np.maximum(open_, close) + rng.random(n) / 20
+    low = np.minimum(open_, close) - rng.random(n) / 5
+    close[rng.random(n) < 0.02] = np.nan
+
+    return pd.DataFrame({"date": pd.bdate_range("2020-01-01", periods=n), "open": open_, "high": high, "low": low,
+                         "close": close, "ticker": "TLS.AX"})
+
+
+def make_price_df(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 5 + np.cumsum(rng.normal(0, 0.05, n))
+    open_ = close - np.abs(rng.normal(0, 0.01, n))
+    high = np.maximum(open_, close) + rng.random(n) / 20
+    low = np.minimum(open_, close) - rng.random(n) / 5
+    volume = rng.integers(10 ** 5, 10 ** 6, n).astype(float)
+    close[rng.random(n) < 0.02] = np.nan
+    volume[rng.random(n) < 0.02] = np.nan
+
+    return pd.DataFrame({"date": pd.bdate_range("2020-01-01", periods=n), "open": open_, "high": high, "low": low,
+                         "close": close, "volume": volume, "ticker": "TLS.AX"})
+
+
+def make_panel(n_tickers=3):
+    """
+        A PricePanel of make_price_df tickers, the last one having no bars in the first 100 dates.
+    """
+    dfs = [make_price_df(seed=seed) for seed in range(n_tickers)]
+    fields = ["open", "high", "low", "close", "volume"]
+    data = np.stack([df[fields].to_numpy() for df in dfs])
+    data[-1, :100] = np.nan
+
+    return PricePanel(data, ["ticker{i}".format(i=i) for i in range(n_tickers)], dfs[0]["date"], fields)
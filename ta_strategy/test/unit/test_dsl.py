@@ -0,0 +1,70 @@
+import unittest
+
+import numpy as np
+
+from ta_indicator.indicator import rsi
+from ta_strategy import dsl
+from ta_strategy.s01 import S01, signals_s01
+from ta_strategy.s02 import S02, signals_s02, signals_s02_panel
+from ta_strategy.test.unit.fixtures import make_panel, make_price_df
+
+
+class TestDsl(unittest.TestCase):
+
+    def test_run_strategies(self):
+        for seed in range(3):
+            df = make_price_df(seed=seed)
+
+            signals = dsl.run_strategies({"s01": S01, "s02": S02}, df)
+
+            self.assertEqual(signals.columns.to_list(), ["date", "s01", "s02"])
+            self.assertEqual(signals["s01"].to_list(), signals_s01(df)["signal"].to_list())
+            self.assertEqual(signals["s02"].to_list(), signals_s02(df)["signal"].to_list())
+
+    def test_run_strategies_panel(self):
+        panel = make_panel()
+
+        signals = dsl.run_strategies_panel({"s02": S02}, panel)
+
+        np.testing.assert_array_equal(signals["s02"], signals_s02_panel(panel)["signal"])
+
+    def test_plan_deduplicates(self):
+        plan = dsl.compile_strategies({"s01": S01, "s02": S02})
+
+        ops = [expr.op for expr in plan.nodes.values()]
+        self.assertEqual(ops.count("candlesticks"), 1)
+        self.assertEqual(ops.count("pattern"), 2)
+        self.assertEqual(ops.count("field"), 5)
+        separate_nodes = [dsl.compile_strategies({name: expr}).nodes for name, expr in [("s01", S01), ("s02", S02)]]
+        self.assertLess(len(plan.nodes), sum(len(nodes) for nodes in separate_nodes))
+
+        close = dsl.field("close")
+        self.assertEqual((dsl.trend(close, 7) < 0).key, (dsl.trend(dsl.field("close"), 7) < 0).key)
+        self.assertNotEqual(dsl.trend(close, 7).key, dsl.trend(close, 60).key)
+
+    def test_expressions(self):
+        df = make_price_df()
+        close = df["close"].to_numpy()
+
+        signals = dsl.run_strategies({"rsi": dsl.rsi(dsl.field("close")) <= 35,
+                                      "not_rsi": ~(dsl.rsi(dsl.field("close")) <= 35),
+                                      "bear": ~dsl.bullish()}, df)
+
+        with np.errstate(invalid="ignore"):
+            self.assertEqual(signals["rsi"].to_list(), (rsi(close, 14) <= 35).tolist())
+        self.assertEqual(signals["not_rsi"].to_list(), (~signals["rsi"]).to_list())
+        self.assertTrue(signals["bear"].any())
+
+        with self.assertRaises(ValueError):
+            dsl.pattern("unknown")
+
+        # Chained comparisons and boolean operators need a truth value, which expressions do not have.
+        trend = dsl.trend(dsl.field("close"), 60)
+        with self.assertRaisesRegex(TypeError, "between"):
+            0 <= trend <= 45
+        with self.assertRaises(TypeError):
+            dsl.bullish() and trend.upward()
+
+
+if __name__ == "__main__":
+    unittest.main()
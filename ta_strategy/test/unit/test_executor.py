@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from ta_strategy import dsl
+from ta_strategy.executor import Executor, conjuncts, cost
+from ta_strategy.s01 import S01
+from ta_strategy.s02 import S02
+from ta_strategy.test.unit.fixtures import make_panel, make_price_df
+
+
+class TestExecutor(unittest.TestCase):
+
+    def test_evaluate(self):
+        strategies = {"s01": S01, "s02": S02, "sma": dsl.field("close") > dsl.sma(dsl.field("close"), 20)}
+
+        for seed in range(3):
+            df = make_price_df(seed=seed)
+            signals = dsl.run_strategies(Executor(strategies), df)
+            expected = dsl.run_strategies(strategies, df)
+
+            for name in strategies:
+                self.assertEqual(signals[name].to_list(), expected[name].to_list())
+
+        panel = make_panel()
+        signals = dsl.run_strategies_panel(Executor(strategies), panel)
+        expected = dsl.run_strategies_panel(strategies, panel)
+        for name in strategies:
+            np.testing.assert_array_equal(signals[name], expected[name])
+
+    def test_order(self):
+        executor = Executor({"s01": S01})
+        ops = [conjunct.op for conjunct in executor.conjuncts["s01"]]
+        self.assertEqual(ops, ["has_bars", "ge", "le", "or", "or"])
+
+        # The hammer condition is cheaper than the trend, Bollinger band and RSI conditions.
+        order = [ops[i] for i in executor.order("s01")]
+        self.assertEqual(order[:2], ["has_bars", "or"])
+        self.assertLess(cost(executor.conjuncts["s01"][4]), cost(executor.conjuncts["s01"][1]))
+
+        # A selective condition moves ahead of cheaper ones that pass most points.
+        executor = Executor({"s01": S01}, pass_rates={"s01": [0.9999, 0.01, 0.5, 0.5, 0.999]})
+        self.assertEqual(executor.order("s01")[0], 1)
+
+    def test_pass_rates(self):
+        df = make_price_df()
+        executor = Executor({"s01": S01})
+
+        self.assertEqual(executor.pass_rates()["s01"], [0.5] * 5)
+
+        dsl.run_strategies(executor, df)
+        pass_rates = executor.pass_rates()["s01"]
+
+        # has_bars(60) is evaluated first on all points.
+        self.assertEqual(executor.evaluated["s01"][0], len(df))
+        self.assertAlmostEqual(pass_rates[0], (len(df) - 59) / len(df))
+        # Later conjuncts are evaluated on the points the earlier ones passed only.
+        self.assertEqual(executor.evaluated["s01"][4], executor.passed["s01"][0])
+        self.assertLess(executor.evaluated["s01"][1], len(df))
+
+    def test_pruning(self):
+        panel = make_panel()
+        frame = dsl.frame_from_panel(panel)
+        hammer = dsl.pattern("hammer", t1=1, t3=2, small_body=0.1)
+        bbl = dsl.bbands(dsl.field("close"), length=20, std=2)[0]
+        strategies = {"hammer_bbands": hammer & (dsl.field("low") <= bbl),
+                      "bbands": dsl.has_bars(1) & (dsl.field("low") <= bbl)}
+
+        for name, expected_points in [("hammer_bbands", None), ("bbands", frame["has_bar"].size)]:
+            executor = Executor({name: strategies[name]})
+            signals = executor.evaluate(frame)
+            np.testing.assert_array_equal(signals[name], dsl.compile_strategies(strategies).evaluate(frame)[name])
+
+            points = executor.window_points[bbl.children[0].key]
+            if expected_points is None:
+                # The Bollinger bands are computed on the hammers only, rather than on the whole frame as by Plan.
+                self.assertEqual(points, executor.passed[name][executor.order(name)[0]])
+                self.assertLess(points, frame["has_bar"].size / 5)
+            else:
+                # Most points pass has_bars(1), so gathering their windows would cost more than the whole frame.
+                self.assertEqual(points, expected_points)
+
+    def test_conjuncts(self):
+        close = dsl.field("close")
+        expr = dsl.has_bars(7) & ((dsl.trend(close, 7) < 0) | dsl.bullish())
+
+        self.assertEqual([conjunct.op for conjunct in conjuncts(expr)], ["has_bars", "or"])
+        self.assertEqual([conjunct.key for conjunct in conjuncts(dsl.bullish())], [dsl.bullish().key])
+
+
+if __name__ == "__main__":
+    unittest.main()
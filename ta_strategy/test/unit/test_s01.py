@@ -0,0 +1,54 @@
+import importlib.util
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from ta_indicator.cache import IndicatorCache, data_version
+from ta_strategy.s01 import exec_s01, signals_s01
+from ta_strategy.test.unit.fixtures import make_s01_price_df
+
+
+class TestS01(unittest.TestCase):
+
+    @unittest.skipUnless(importlib.util.find_spec("pandas_ta"), "pandas_ta is not installed")
+    def test_signals_s01(self):
+        for seed in range(3):
+            df = make_s01_price_df(seed=seed)
+
+            signals = signals_s01(df)
+
+            expected = [exec_s01(df, date) for date in df["date"]]
+            self.assertEqual(signals["signal"].to_list(), expected)
+            self.assertTrue(signals["signal"].any())
+
+    def test_signals_s01_cache(self):
+        df = make_s01_price_df()
+
+        with tempfile.TemporaryDirectory() as path:
+            pd.testing.assert_frame_equal(signals_s01(df, cache=IndicatorCache(path)), signals_s01(df))
+            # Indicators are read from disk.
+            cache = IndicatorCache(path)
+            pd.testing.assert_frame_equal(signals_s01(df, cache=cache), signals_s01(df))
+            self.assertEqual(cache.misses, 0)
+
+    def test_exec_s01_cache(self):
+        df = make_s01_price_df()
+        cache = IndicatorCache()
+
+        # The df is hashed once for all its indicators.
+        with mock.patch("ta_strategy.s01.data_version", wraps=data_version) as version:
+            signals = signals_s01(df, cache=cache)
+        self.assertEqual(version.call_count, 1)
+
+        # Exec dates share the indicators computed for the whole df.
+        misses, hits = cache.misses, cache.hits
+        dates = df["date"].iloc[-20:]
+        self.assertEqual([exec_s01(df, date, cache=cache) for date in dates], signals["signal"].iloc[-20:].to_list())
+        self.assertEqual(cache.misses, misses)
+        self.assertEqual(cache.hits, hits + 20 * misses)
+
+
+if __name__ == "__main__":
+    unittest.main()
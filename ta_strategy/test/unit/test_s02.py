@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from ta_indicator.cache import IndicatorCache, data_version
+from ta_stock_market_data.loader import StockDataLoader
+from ta_stock_market_data.panel import PricePanel
+from ta_stock_market_data.storage import get_storage
+from ta_stock_market_data.yahoo import stock_data_dfs_read_csv
+from ta_strategy.s02 import exec_s02, exec_strategy, signals_s02, signals_s02_panel
+from ta_strategy.test.unit.fixtures import make_price_df
+
+
+class TestS02(unittest.TestCase):
+
+    def test_signals_s02(self):
+        for seed in range(3):
+            df = make_price_df(seed=seed)
+
+            signals = signals_s02(df)
+
+            expected = [exec_s02(df, date) for date in df["date"]]
+            self.assertEqual(signals["signal"].to_list(), expected)
+            self.assertTrue(signals["signal"].any())
+            self.assertEqual(signals.columns.to_list(), ["date", "cond1", "cond2", "cond3", "cond4", "signal"])
+
+    def test_signals_s02_panel(self):
+        dfs = [make_price_df(seed=seed) for seed in range(3)]
+        fields = ["open", "high", "low", "close", "volume"]
+        data = np.stack([df[fields].to_numpy() for df in dfs])
+        # The third ticker has no bars in the first 100 dates.
+        data[2, :100] = np.nan
+        panel = PricePanel(data, ["tls.ax", "car.ax", "bhp.ax"], dfs[0]["date"], fields)
+
+        signals = signals_s02_panel(panel)
+
+        for i in range(2):
+            for name, mask in signals.items():
+                self.assertEqual(mask[i].tolist(), signals_s02(dfs[i])[name].to_list())
+        self.assertEqual(signals["signal"][2].tolist(),
+                         [False] * 100 + signals_s02(dfs[2].iloc[100:])["signal"].to_list())
+
+    def test_loader_signals(self):
+        # Prices with cents as stored by yahoo, which float32 does not represent exactly.
+        df = make_price_df().round({"open": 3, "high": 3, "low": 3, "close": 3})
+
+        with tempfile.TemporaryDirectory() as path:
+            get_storage("csv", path).write("tls.ax", "price", df)
+
+            csv_df = stock_data_dfs_read_csv("tls.ax", path)["price"]
+            loader_df = StockDataLoader(path).read("tls.ax")["price"]
+
+            for column in ["open", "high", "low", "close"]:
+                np.testing.assert_array_equal(loader_df[column].to_numpy(), csv_df[column].to_numpy())
+            self.assertEqual([exec_s02(loader_df, date) for date in loader_df["date"]],
+                             [exec_s02(csv_df, date) for date in csv_df["date"]])
+            pd.testing.assert_series_equal(signals_s02(loader_df)["signal"], signals_s02(csv_df)["signal"])
+
+    def test_parquet_signals(self):
+        df = make_price_df().round({"open": 3, "high": 3, "low": 3, "close": 3})
+        # Daily dates up to yesterday, the exec date of exec_strategy.
+        df["date"] = pd.date_range(end=date.today() - timedelta(days=1), periods=len(df)).strftime("%Y-%m-%d")
+
+        with tempfile.TemporaryDirectory() as path:
+            csv_path, parquet_path = os.path.join(path, "csv"), os.path.join(path, "parquet")
+            get_storage("csv", csv_path).write("tls.ax", "price", df)
+            get_storage("parquet", parquet_path, price_dtype="float64").write("tls.ax", "price", df)
+
+            csv_df = stock_data_dfs_read_csv("tls.ax", csv_path)["price"]
+            parquet_df = stock_data_dfs_read_csv("tls.ax", parquet_path, backend="parquet")["price"]
+
+            for column in ["open", "high", "low", "close", "volume"]:
+                self.assertEqual(parquet_df[column].dtype, np.float64)
+                np.testing.assert_array_equal(parquet_df[column].to_numpy(), csv_df[column].to_numpy())
+            self.assertEqual([exec_s02(parquet_df, date) for date in csv_df["date"]],
+                             [exec_s02(csv_df, date) for date in csv_df["date"]])
+
+            watchlist = os.path.join(path, "watchlist")
+            with open(watchlist, "w") as f:
+                f.write("tls.ax\n")
+            self.assertEqual([result["stock_code"] for result in exec_strategy(watchlist, parquet_path,
+                                                                               backend="parquet")],
+                             [result["stock_code"] for result in exec_strategy(watchlist, csv_path)])
+
+    def test_signals_s02_cache(self):
+        df = make_price_df()
+
+        with tempfile.TemporaryDirectory() as path:
+            pd.testing.assert_frame_equal(signals_s02(df, cache=IndicatorCache(path)), signals_s02(df))
+            # Indicators are read from disk.
+            cache = IndicatorCache(path)
+            pd.testing.assert_frame_equal(signals_s02(df, cache=cache), signals_s02(df))
+            self.assertEqual(cache.misses, 0)
+
+    def test_exec_s02_cache(self):
+        df = make_price_df()
+        cache = IndicatorCache()
+
+        # The df is hashed once for all its indicators.
+        with mock.patch("ta_strategy.s02.data_version", wraps=data_version) as version:
+            signals = signals_s02(df, cache=cache)
+        self.assertEqual(version.call_count, 1)
+
+        # Exec dates share the indicators computed for the whole df.
+        misses, hits = cache.misses, cache.hits
+        dates = df["date"].iloc[-20:]
+        self.assertEqual([exec_s02(df, date, cache=cache) for date in dates], signals["signal"].iloc[-20:].to_list())
+        self.assertEqual(cache.misses, misses)
+        self.assertEqual(cache.hits, hits + 20 * misses)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from ta_strategy.s01 import signals_s01
+from ta_strategy.s02 import signals_s02
+from ta_strategy.state import StrategyStateStore
+from ta_strategy.test.unit.fixtures import make_price_df, make_s01_price_df
+
+
+class TestState(unittest.TestCase):
+
+    def assert_incremental(self, strategy, df, signals):
+        with tempfile.TemporaryDirectory() as path:
+            store = StrategyStateStore(path, strategy)
+            store.update("tls.ax", df.iloc[:200])
+            store.checkpoint()
+
+            # NaN is checkpointed as null, the file is valid JSON.
+            with open(store.state_path) as f:
+                json.load(f, parse_constant=self.fail)
+
+            # Bars arrive one a day after the checkpoint.
+            store = StrategyStateStore(path, strategy)
+            conds = [store.update("tls.ax", df.iloc[:t + 1]) for t in range(200, len(df))]
+            self.assertEqual(pd.DataFrame(conds).to_dict(orient="list"),
+                             signals.iloc[200:].drop(columns=["date"]).to_dict(orient="list"))
+            self.assertIsNone(store.update("tls.ax", df))
+
+            # A missing state is rebuilt from the history.
+            store.checkpoint()
+            os.remove(store.state_path)
+            self.assertEqual(StrategyStateStore(path, strategy).update("tls.ax", df),
+                             signals.iloc[-1].drop("date").to_dict())
+
+    def test_s01_state(self):
+        df = make_s01_price_df()
+        # A missing close in the windows checkpointed.
+        df.loc[195, "close"] = np.nan
+        signals = signals_s01(df)
+
+        self.assertTrue(signals["signal"].iloc[200:].any())
+        self.assert_incremental("s01", df, signals)
+
+    def test_s02_state(self):
+        df = make_price_df()
+        df.loc[197, ["close", "volume"]] = np.nan
+
+        self.assert_incremental("s02", df, signals_s02(df))
+
+    def test_string_dates(self):
+        df = make_price_df()
+        df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+
+        with tempfile.TemporaryDirectory() as path:
+            store = StrategyStateStore(path, "s02")
+            store.update("tls.ax", df.iloc[:-2])
+
+            self.assertEqual(store.update("tls.ax", df), signals_s02(df).iloc[-1].drop("date").to_dict())
+            self.assertEqual(store.states["tls.ax"].n, len(df))
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            StrategyStateStore("data", "s99")
+
+
+if __name__ == "__main__":
+    unittest.main()